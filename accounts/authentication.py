@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User, user_auth_state_cache_key
+
+
+class ClaimsUser(TokenUser):
+    """토큰 클레임(user_id, is_active)으로 만든 사용자. users 행을 읽지 않는다.
+
+    뷰는 request.user.id 만 쓰므로 FK 는 모두 `user_id=request.user.id` 로 넘긴다.
+    is_staff 는 발급 시점 클레임 대신 인증 시 확인한 (캐시된) 값을 쓴다. 클레임을 믿으면
+    권한을 회수해도 access 토큰이 만료될 때까지 관리자 API 에 접근할 수 있기 때문이다.
+    """
+    # 인증 시 채우는 (is_active, is_staff). 확인 전에는 권한이 없는 것으로 본다.
+    auth_state = (False, False)
+
+    @cached_property
+    def id(self):
+        # simplejwt 는 user_id 클레임을 문자열로 넣으므로 모델 pk 와 같은 int 로 맞춘다.
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @property
+    def is_staff(self):
+        return self.auth_state[1]
+
+
+# 삭제된 사용자는 비활성 + 권한 없음으로 캐시한다.
+MISSING_USER_STATE = (False, False)
+
+
+def get_user_auth_state(user_id):
+    """(is_active, is_staff) 를 JWT_USER_STATE_CACHE_TTL 초 동안 캐시해 사용자당 TTL 마다 최대 한 번만 조회한다."""
+    key = user_auth_state_cache_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values_list('is_active', 'is_staff').first() or MISSING_USER_STATE
+        cache.set(key, state, settings.JWT_USER_STATE_CACHE_TTL)
+    return tuple(state)
+
+
+async def aget_user_auth_state(user_id):
+    """get_user_auth_state 의 async 버전. (AsyncListMixin 경로 용)"""
+    key = user_auth_state_cache_key(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        state = await User.objects.filter(pk=user_id).values_list('is_active', 'is_staff').afirst() or MISSING_USER_STATE
+        await cache.aset(key, state, settings.JWT_USER_STATE_CACHE_TTL)
+    return tuple(state)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWTAuthentication 과 같은 토큰 검증을 하되, 요청마다 users 행을 SELECT 하지 않는다.
+
+    사용자 저장/삭제 시 캐시를 지우므로 비활성화/관리자 권한 회수는 바로 반영되고,
+    queryset.update() 처럼 시그널을 거치지 않는 변경은 캐시 TTL 이 지나면 반영된다.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        return self.check_auth_state(user, get_user_auth_state(user.id) if user.is_active else None)
+
+    async def aauthenticate(self, request):
+        """authenticate 의 async 버전. 토큰 검증은 CPU 작업이라 그대로 두고 활성 상태 조회만 await 한다."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        user = super().get_user(validated_token)
+        state = await aget_user_auth_state(user.id) if user.is_active else None
+        return self.check_auth_state(user, state), validated_token
+
+    def check_auth_state(self, user, state):
+        if state is None or not state[0]:
+            raise self.inactive_user_error()
+        user.auth_state = state
+        return user
+
+    def inactive_user_error(self):
+        return AuthenticationFailed('비활성화되었거나 존재하지 않는 사용자입니다.', code='user_inactive')
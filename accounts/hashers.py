@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """비용을 settings(ARGON2_*)에서 읽는 argon2id. 비용이 바뀌면 must_update 로 로그인 시 다시 해시된다."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """비용을 settings(SCRYPT_*)에서 읽는 scrypt. (stdlib hashlib 만 사용)"""
+
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.SCRYPT_PARALLELISM
+
+    # OpenSSL 기본 한도(32MiB)는 상한일 뿐이라, 이전 비용으로 저장된 해시도 검증할 수 있도록 넉넉히 둔다.
+    maxmem = 1024 ** 3
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """반복 횟수를 settings(PBKDF2_ITERATIONS)에서 읽는 pbkdf2_sha256. (기존 해시 검증용)"""
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
+
+
+class PasswordHashingBusy(Exception):
+    """실행 + 대기 중인 해시가 한도를 넘어 해시를 실행하지 않았다. (회원가입/로그인 view 에서 503 으로 바꾼다)"""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASHING_MAX_WORKERS
+                _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASHING_MAX_WAITING)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor
+
+
+def run_hashing(fn, *args):
+    """비밀번호 해시/검증을 워커별 전용 스레드 풀에서 실행한다.
+
+    워커 프로세스 안에서 동시에 도는 해시를 PASSWORD_HASHING_MAX_WORKERS 개로 제한하는 동시 실행 상한이다.
+    (CPU 를 따로 떼어 두는 것은 아니라서, 해시가 도는 동안에는 같은 워커의 다른 요청과 CPU 를 나눠 쓴다)
+    실행 + 대기 중인 해시가 PASSWORD_HASHING_MAX_WAITING 까지 더한 한도를 넘으면 요청 스레드를 붙잡아 두지 않고
+    PasswordHashingBusy 를 던진다.
+    """
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.token_blacklist import blacklist_filter
+
+
+class Command(BaseCommand):
+    help = "블랙리스트 refresh 토큰 bloom filter(Redis 비트맵)를 만료되지 않은 블랙리스트로 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 주기적으로 재구성')
+        parser.add_argument(
+            '--interval', type=float, default=settings.TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL / 2,
+            help='재구성 주기(초). ready 키가 만료되기 전에 다시 만들도록 TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL 보다 짧게',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.REDIS_URL:
+            # 프로세스 메모리 비트맵은 워커마다 백그라운드 스레드로 만든다.
+            self.stdout.write("REDIS_URL 이 없으면 워커마다 따로 재구성하므로 할 일이 없습니다.")
+            return
+        while True:
+            blacklist_filter.rebuild()
+            self.stdout.write("블랙리스트 bloom filter 재구성 완료")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
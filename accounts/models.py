@@ -1,6 +1,11 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.hashers import make_password, verify_password
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone
+from .hashers import run_hashing
 from .user_manager import UserManager
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -29,4 +34,30 @@ class User(AbstractBaseUser, PermissionsMixin):
         ]
 
     def __str__(self):
-        return self.email
\ No newline at end of file
+        return self.email
+
+    def set_password(self, raw_password):
+        # 해시 계산은 요청 스레드 대신 전용 스레드 풀에서 한다. (accounts.hashers.run_hashing)
+        self.password = run_hashing(make_password, raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = run_hashing(verify_password, raw_password, self.password)
+        if is_correct and must_update:
+            # PASSWORD_HASHER 나 비용 설정이 바뀌었으면 로그인에 성공한 김에 새 설정으로 다시 해시한다.
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+
+
+def user_auth_state_cache_key(user_id):
+    # 값은 (is_active, is_staff). 예전 bool 값과 섞이지 않도록 prefix 를 바꿨다.
+    return f'auth-user-state:{user_id}'
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_auth_state(sender, instance, **kwargs):
+    # 비활성화/삭제/관리자 권한 회수가 StatelessJWTAuthentication 의 캐시 TTL 을 기다리지 않고 바로 반영되도록 한다.
+    cache.delete(user_auth_state_cache_key(instance.pk))
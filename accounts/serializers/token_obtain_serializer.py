@@ -0,0 +1,15 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from accounts.tokens import BlacklistFilteredRefreshToken
+
+
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """StatelessJWTAuthentication 이 DB 조회 없이 사용자 객체를 만들 수 있도록 상태 클레임을 추가한다."""
+    token_class = BlacklistFilteredRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['is_active'] = user.is_active
+        token['is_staff'] = user.is_staff
+        return token
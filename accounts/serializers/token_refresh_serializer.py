@@ -0,0 +1,33 @@
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+from accounts.tokens import BlacklistFilteredRefreshToken
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """refresh 토큰을 검증하고 새 access/refresh 토큰을 발급한다. (사용한 refresh 토큰은 블랙리스트)
+
+    access 토큰의 is_active/is_staff 클레임을 최신 값으로 갱신하기 위해 사용자 행은 한 번 읽는다.
+    """
+    token_class = BlacklistFilteredRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        state = User.objects.filter(pk=user_id).values_list('is_active', 'is_staff').first()
+        if state is None or not state[0]:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        refresh['is_active'], refresh['is_staff'] = state
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
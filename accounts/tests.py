@@ -1,7 +1,20 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
-from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.test import TestCase, override_settings
+from django.contrib.auth.hashers import make_password
+from unittest.mock import patch
+import threading
+
+from accounts.models import user_auth_state_cache_key
+from accounts.token_blacklist import blacklist_filter
+from accounts.tokens import BlacklistFilteredRefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 
 User = get_user_model()
 
@@ -63,6 +76,236 @@ class SignUpAPITests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="jwt@example.com", password="Str0ngP@ss!", is_staff=True)
+        res = self.client.post("/login", {"email": "jwt@example.com", "password": "Str0ngP@ss!"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.access = res.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_access_token_has_state_claims(self):
+        """
+        로그인으로 받은 access 토큰에 is_active/is_staff 클레임이 포함된다
+        """
+        token = AccessToken(self.access)
+        self.assertEqual(token["user_id"], str(self.user.id))
+        self.assertTrue(token["is_active"])
+        self.assertTrue(token["is_staff"])
+
+    def test_authenticated_request_skips_user_select(self):
+        """
+        활성 상태가 캐시된 뒤에는 인증 요청이 users 테이블을 조회하지 않는다
+        """
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/me/payments")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if '"users"' in q["sql"]])
+
+    def test_deactivated_user_rejected_immediately(self):
+        """
+        사용자를 비활성화/삭제하면 캐시 TTL 을 기다리지 않고 바로 401
+        """
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.delete()
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_demoted_staff_loses_admin_access_immediately(self):
+        """
+        is_staff 를 회수하면 access 토큰의 is_staff 클레임과 무관하게 바로 관리자 API 가 403
+        """
+        self.assertEqual(self.client.get("/internal/db-pool").status_code, status.HTTP_200_OK)
+        self.user.is_staff = False
+        self.user.save(update_fields=["is_staff"])
+        self.assertTrue(AccessToken(self.access)["is_staff"])
+        self.assertEqual(self.client.get("/internal/db-pool").status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+
+    def test_bulk_update_applies_after_cache_expiry(self):
+        """
+        시그널을 거치지 않는 update() 비활성화는 캐시가 만료되면 반영된다
+        """
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+        cache.delete(user_auth_state_cache_key(self.user.pk))
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenRefreshTests(APITestCase):
+    url = "/token/refresh"
+
+    def setUp(self):
+        blacklist_filter.reset()
+        self.user = User.objects.create_user(email="refresh@example.com", password="Str0ngP@ss!")
+        res = self.client.post("/login", {"email": "refresh@example.com", "password": "Str0ngP@ss!"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.refresh = res.data["refresh"]
+
+    def test_refresh_rotates_and_blacklists_used_token(self):
+        """
+        재발급하면 새 access/refresh 를 돌려주고, 사용한 refresh 토큰은 다시 쓸 수 없다
+        """
+        res = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.assertNotEqual(res.data["refresh"], self.refresh)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        self.assertEqual(self.client.get("/me/payments").status_code, status.HTTP_200_OK)
+
+        reused = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(reused.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.post(self.url, {"refresh": res.data["refresh"]}, format="json").status_code, status.HTTP_200_OK)
+
+    def test_refresh_skips_blacklist_select_when_filter_negative(self):
+        """
+        bloom filter 에 없는 토큰은 블랙리스트를 SELECT 하지 않고, 재발급은 쿼리 3번(사용자/블랙리스트/발급 기록)으로 끝난다
+        """
+        blacklist_filter.rebuild()
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.assertEqual(len(ctx.captured_queries), 3, [q["sql"] for q in ctx.captured_queries])
+
+    def test_concurrent_reuse_rejected_by_blacklist_insert(self):
+        """
+        같은 refresh 토큰으로 동시에 재발급해 둘 다 블랙리스트 확인을 통과해도, 두 번째 블랙리스트 INSERT 에서 거절된다
+        """
+        first = BlacklistFilteredRefreshToken(self.refresh)
+        second = BlacklistFilteredRefreshToken(self.refresh)
+        first.blacklist()
+        with self.assertRaises(TokenError):
+            second.blacklist()
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti=first["jti"]).count(), 1)
+
+    def test_filter_rebuild_includes_existing_blacklist(self):
+        """
+        bloom filter 를 DB 에서 다시 만들면 기존 블랙리스트 jti 가 포함된다
+        """
+        token = BlacklistFilteredRefreshToken(self.refresh)
+        token.blacklist()
+        blacklist_filter.reset()
+        blacklist_filter.rebuild()
+        self.assertTrue(blacklist_filter.might_contain(token["jti"]))
+        self.assertFalse(blacklist_filter.might_contain("not-blacklisted"))
+
+    def test_filter_not_ready_falls_back_to_db_without_rebuilding_in_request(self):
+        """
+        비트맵이 아직 없으면 요청 스레드에서 다시 만들지 않고 True(DB 확인)를 돌려주며, 재구성은 백그라운드 하나만 돈다
+        """
+        blacklist_filter.reset()
+        with patch.object(blacklist_filter, "_rebuild_in_background") as background, self.assertNumQueries(0):
+            self.assertTrue(blacklist_filter.might_contain("not-blacklisted"))
+            self.assertTrue(blacklist_filter.might_contain("not-blacklisted"))
+        self.assertEqual(background.call_count, 2)
+
+        # 이미 재구성 중이면 스레드를 더 띄우지 않는다.
+        with blacklist_filter._rebuild_lock, patch("accounts.token_blacklist.threading.Thread") as thread:
+            blacklist_filter._rebuild_in_background()
+        thread.assert_not_called()
+
+    def test_filter_rebuild_db_error_keeps_db_fallback(self):
+        """
+        백그라운드 재구성 중 DB 오류는 요청에 전파되지 않고, 다음 요청이 다시 시도할 수 있다
+        """
+        if blacklist_filter._thread is not None:
+            blacklist_filter._thread.join()
+        blacklist_filter.reset()
+        with patch.object(blacklist_filter, "_load_bitmap", side_effect=DatabaseError("down")), \
+                self.assertLogs("accounts.token_blacklist", level="ERROR"):
+            self.assertTrue(blacklist_filter.might_contain("not-blacklisted"))
+            blacklist_filter._thread.join()
+        self.assertIsNone(blacklist_filter._bitmap)
+        self.assertTrue(blacklist_filter._rebuild_lock.acquire(blocking=False))
+        blacklist_filter._rebuild_lock.release()
+
+    def test_refresh_inactive_user_rejected(self):
+        """
+        비활성화된 사용자의 refresh 토큰은 재발급되지 않는다
+        """
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        res = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PasswordHashingTests(APITestCase):
+    password = "Str0ngP@ss!"
+
+    def _login(self, email):
+        return self.client.post("/login", {"email": email, "password": self.password}, format="json")
+
+    @override_settings(PASSWORD_HASHERS=["accounts.hashers.ScryptPasswordHasher", "accounts.hashers.PBKDF2PasswordHasher"])
+    def test_signup_uses_preferred_hasher(self):
+        """
+        회원가입 비밀번호는 PASSWORD_HASHERS 첫 번째 알고리즘과 설정된 비용으로 해시된다
+        """
+        res = self.client.post("/signup", {"email": "hash@example.com", "password": self.password}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(email="hash@example.com")
+        self.assertTrue(user.password.startswith("scrypt$16384$"))
+        self.assertTrue(user.check_password(self.password))
+
+    @override_settings(
+        PASSWORD_HASHERS=["accounts.hashers.ScryptPasswordHasher", "accounts.hashers.PBKDF2PasswordHasher"],
+        PBKDF2_ITERATIONS=1000,
+    )
+    def test_login_rehashes_legacy_hash(self):
+        """
+        기존 pbkdf2 해시 사용자는 로그인 성공 시 선호 알고리즘으로 다시 해시된다 (실패한 로그인은 그대로)
+        """
+        user = User.objects.create_user(email="legacy@example.com", password="unused")
+        User.objects.filter(pk=user.pk).update(password=make_password(self.password, hasher="pbkdf2_sha256"))
+
+        res = self.client.post("/login", {"email": "legacy@example.com", "password": "wrong"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+        self.assertEqual(self._login("legacy@example.com").status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+
+    @override_settings(PASSWORD_HASHERS=["accounts.hashers.ScryptPasswordHasher"])
+    def test_login_rehashes_when_cost_changes(self):
+        """
+        비용 설정이 바뀌면 다음 로그인에서 새 비용으로 다시 해시된다
+        """
+        User.objects.create_user(email="cost@example.com", password=self.password)
+        with override_settings(SCRYPT_WORK_FACTOR=2 ** 12, SCRYPT_PARALLELISM=1):
+            self.assertEqual(self._login("cost@example.com").status_code, status.HTTP_200_OK)
+        self.assertTrue(User.objects.get(email="cost@example.com").password.startswith("scrypt$4096$"))
+
+    def test_hashing_pool_full_returns_503(self):
+        """
+        해시 실행/대기 한도를 넘으면 요청 스레드를 붙잡지 않고 503 을 반환한다
+        """
+        from accounts import hashers
+        hashers._get_executor()
+        with patch.object(hashers, "_slots", threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            res = self.client.post("/signup", {"email": "busy@example.com", "password": self.password}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(email="busy@example.com").exists())
+
+    def test_hashing_pool_full_login_returns_503(self):
+        """
+        모델 계층은 PasswordHashingBusy 를 던지고, 로그인 view 가 503 으로 바꾼다
+        """
+        from accounts import hashers
+        user = User.objects.create_user(email="busy-login@example.com", password=self.password)
+        hashers._get_executor()
+        with patch.object(hashers, "_slots", threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            with self.assertRaises(hashers.PasswordHashingBusy):
+                user.check_password(self.password)
+            res = self._login("busy-login@example.com")
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 class UserManagerTests(TestCase):
     def setUp(self):
         self.User = get_user_model()
@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+
+class Bitmap:
+    """프로세스 메모리 비트맵. Redis SETBIT/GETBIT 와 같은 비트 순서(바이트 내 MSB 먼저)를 쓴다."""
+
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) // 8)
+
+    def get_all(self, positions):
+        return all(self.bits[p >> 3] & (0x80 >> (p & 7)) for p in positions)
+
+    def set_all(self, positions):
+        for p in positions:
+            self.bits[p >> 3] |= 0x80 >> (p & 7)
+
+
+class TokenBlacklistFilter:
+    """블랙리스트된 refresh 토큰 jti 의 bloom filter.
+
+    might_contain() 이 False 면 블랙리스트에 없으므로 DB 조회를 생략한다. (True 는 오탐일 수 있어 DB 로 확인)
+    REDIS_URL 이 있으면 Redis 비트맵을 워커끼리 공유하고, 없으면 프로세스 메모리 비트맵을 쓴다.
+    만료된 토큰이 쌓여 오탐률이 오르지 않도록 TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL 마다 DB 에서 다시 만든다.
+    재구성은 요청 스레드에서 하지 않는다. (rebuild_token_blacklist_filter 커맨드, 없거나 늦으면 워커당 백그라운드 스레드 하나)
+    비트맵이 아직 없으면 might_contain() 은 True 를 돌려 DB 로 확인한다.
+
+    다른 워커에서 방금 블랙리스트된 jti 를 놓치더라도, 재발급은 항상 블랙리스트 INSERT 의 unique 제약으로
+    재사용을 한 번 더 걸러내므로(BlacklistFilteredRefreshToken.blacklist) 회전된 토큰이 다시 쓰이지는 않는다.
+    """
+    redis_key = 'token-blacklist-bloom'
+    redis_ready_key = 'token-blacklist-bloom:ready'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 같은 프로세스에서 재구성이 동시에 하나만 돌게 한다. (백그라운드 스레드는 잡지 못하면 건너뛴다)
+        self._rebuild_lock = threading.Lock()
+        self._bitmap = None
+        self._built_at = 0.0
+        # 프로세스 메모리 비트맵을 재구성하는 동안 add() 된 jti. 새 비트맵으로 바꿀 때 다시 넣는다.
+        self._pending = None
+        self._thread = None
+        self._redis = None
+
+    @property
+    def size(self):
+        capacity = settings.TOKEN_BLACKLIST_BLOOM_CAPACITY
+        return math.ceil(-capacity * math.log(settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE) / math.log(2) ** 2)
+
+    @property
+    def hash_count(self):
+        return max(1, round(self.size / settings.TOKEN_BLACKLIST_BLOOM_CAPACITY * math.log(2)))
+
+    def positions(self, jti):
+        # double hashing (h1 + i*h2) 으로 digest 한 번에서 k 개 위치를 만든다.
+        digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def might_contain(self, jti):
+        positions = self.positions(jti)
+        if not settings.REDIS_URL:
+            bitmap = self._get_local_bitmap()
+            return bitmap is None or bitmap.get_all(positions)
+        try:
+            pipe = self._get_redis().pipeline(transaction=False)
+            pipe.exists(self.redis_ready_key)
+            for p in positions:
+                pipe.getbit(self.redis_key, p)
+            ready, *bits = pipe.execute()
+            if not ready:
+                # 커맨드가 돌지 않았거나 늦었다. 백그라운드에서 워커 하나만 다시 만들고, 그동안은 DB 로 확인한다.
+                self._rebuild_in_background()
+                return True
+            return all(bits)
+        except redis.RedisError:
+            return True
+
+    def add(self, jti):
+        positions = self.positions(jti)
+        if not settings.REDIS_URL:
+            with self._lock:
+                if self._bitmap is not None:
+                    self._bitmap.set_all(positions)
+                if self._pending is not None:
+                    self._pending.append(jti)
+            return
+        try:
+            pipe = self._get_redis().pipeline(transaction=False)
+            for p in positions:
+                pipe.setbit(self.redis_key, p, 1)
+            pipe.execute()
+        except redis.RedisError:
+            pass
+
+    def rebuild(self):
+        """만료되지 않은 블랙리스트 jti 로 비트맵을 새로 만든다. (커맨드/백그라운드 스레드에서 호출, DB 오류는 호출한 쪽으로)"""
+        with self._rebuild_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        started_at = timezone.now()
+        if not settings.REDIS_URL:
+            with self._lock:
+                self._pending = []
+            try:
+                bitmap = self._load_bitmap()
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for jti in self._pending:
+                    bitmap.set_all(self.positions(jti))
+                self._pending = None
+                self._bitmap, self._built_at = bitmap, time.monotonic()
+            return
+        bitmap = self._load_bitmap()
+        client = self._get_redis()
+        tmp_key = f'{self.redis_key}:building'
+        pipe = client.pipeline()
+        pipe.set(tmp_key, bytes(bitmap.bits))
+        pipe.rename(tmp_key, self.redis_key)
+        pipe.set(self.redis_ready_key, 1, ex=settings.TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL)
+        pipe.execute()
+        # 조회 이후 RENAME 전에 다른 워커가 추가한 jti 를 다시 넣는다.
+        for jti in self._blacklisted_jtis(blacklisted_at__gte=started_at):
+            self.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._bitmap = None
+        if settings.REDIS_URL:
+            self._get_redis().delete(self.redis_key, self.redis_ready_key)
+
+    def _get_local_bitmap(self):
+        """프로세스 메모리 비트맵. 없거나 오래됐으면 백그라운드 재구성을 시작하고, 그동안은 지금 것(없으면 None)을 쓴다."""
+        with self._lock:
+            bitmap, built_at = self._bitmap, self._built_at
+        if bitmap is None or time.monotonic() - built_at > settings.TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL:
+            self._rebuild_in_background()
+        return bitmap
+
+    def _rebuild_in_background(self):
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        try:
+            self._thread = threading.Thread(target=self._rebuild_worker, name='token-blacklist-bloom', daemon=True)
+            self._thread.start()
+        except BaseException:
+            self._rebuild_lock.release()
+            raise
+
+    def _rebuild_worker(self):
+        lock_key = None
+        try:
+            if settings.REDIS_URL:
+                # 워커 간에도 하나만 다시 만든다.
+                if not self._get_redis().set(f'{self.redis_key}:lock', 1, nx=True, ex=60):
+                    return
+                lock_key = f'{self.redis_key}:lock'
+            self._rebuild()
+        except (DatabaseError, redis.RedisError):
+            # 다음 요청이 다시 시도하고, 그동안은 이전 비트맵(없으면 DB 확인)을 쓴다.
+            logger.exception('블랙리스트 bloom filter 재구성 실패')
+        finally:
+            if lock_key is not None:
+                try:
+                    self._get_redis().delete(lock_key)
+                except redis.RedisError:
+                    pass  # ex=60 으로 만료된다.
+            self._rebuild_lock.release()
+            connection.close()  # 이 스레드가 연 DB 연결
+
+    def _load_bitmap(self):
+        bitmap = Bitmap(self.size)
+        for jti in self._blacklisted_jtis():
+            bitmap.set_all(self.positions(jti))
+        return bitmap
+
+    def _blacklisted_jtis(self, **filters):
+        return (
+            BlacklistedToken.objects
+            .filter(token__expires_at__gt=timezone.now(), **filters)
+            .values_list('token__jti', flat=True)
+            .iterator(chunk_size=10_000)
+        )
+
+    def _get_redis(self):
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL)
+        return self._redis
+
+
+blacklist_filter = TokenBlacklistFilter()
@@ -0,0 +1,55 @@
+from django.db import connection
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from accounts.token_blacklist import blacklist_filter
+
+
+class BlacklistFilteredRefreshToken(RefreshToken):
+    """블랙리스트 확인을 bloom filter 로 먼저 거르고, 블랙리스트/발급 기록을 쿼리 한 번씩으로 처리하는 refresh 토큰."""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if blacklist_filter.might_contain(jti) and BlacklistedToken.objects.filter(token__jti=jti).exists():
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """이 토큰을 블랙리스트에 넣는다. 동시에 같은 토큰으로 재발급한 요청이 이미 넣었다면 TokenError."""
+        jti = self.payload[api_settings.JTI_CLAIM]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH outstanding AS (
+                    SELECT id FROM {OutstandingToken._meta.db_table} WHERE jti = %s
+                ), inserted AS (
+                    INSERT INTO {BlacklistedToken._meta.db_table} (token_id, blacklisted_at)
+                    SELECT id, %s FROM outstanding
+                    ON CONFLICT (token_id) DO NOTHING
+                    RETURNING id
+                )
+                SELECT EXISTS (SELECT 1 FROM outstanding), EXISTS (SELECT 1 FROM inserted)
+                """,
+                [jti, timezone.now()],
+            )
+            found, inserted = cursor.fetchone()
+        if not found:
+            # 발급 기록이 없는 토큰(블랙리스트 앱 도입 전 발급)은 simplejwt 기본 방식으로 기록한다.
+            super().blacklist()
+        elif not inserted:
+            raise TokenError(_("Token is blacklisted"))
+        blacklist_filter.add(jti)
+
+    def outstand(self):
+        # 새로 만든 jti 이므로 get_or_create 대신 INSERT 한 번으로 기록한다.
+        return OutstandingToken.objects.create(
+            user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+            jti=self.payload[api_settings.JTI_CLAIM],
+            token=str(self),
+            created_at=self.current_time,
+            expires_at=datetime_from_epoch(self.payload['exp']),
+        )
@@ -1,6 +1,10 @@
 from rest_framework_simplejwt.views import TokenObtainPairView
 from drf_spectacular.utils import extend_schema, OpenApiExample
 
+from accounts.hashers import PasswordHashingBusy
+from accounts.serializers.token_obtain_serializer import CustomTokenObtainPairSerializer
+from assignment.common.api_errors import api_error
+
 @extend_schema(
     tags=['계정'],
     summary='로그인',
@@ -13,4 +17,10 @@ from drf_spectacular.utils import extend_schema, OpenApiExample
     ],
 )
 class CustomTokenObtainPairView(TokenObtainPairView):
-    pass
\ No newline at end of file
+    serializer_class = CustomTokenObtainPairSerializer
+
+    def post(self, request, *args, **kwargs):
+        try:
+            return super().post(request, *args, **kwargs)
+        except PasswordHashingBusy:
+            raise api_error(503, '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.')
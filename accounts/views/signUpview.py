@@ -2,7 +2,9 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.generics import CreateAPIView
 
+from accounts.hashers import PasswordHashingBusy
 from accounts.serializers.signUpSerializer import SignUpSerializer
+from assignment.common.api_errors import api_error
 from drf_spectacular.utils import extend_schema
 
 @extend_schema(tags=['계정'], summary='회원가입')
@@ -12,7 +14,10 @@ class SignUpView(CreateAPIView):
     serializer_class = SignUpSerializer
 
     def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
+        try:
+            response = super().create(request, *args, **kwargs)
+        except PasswordHashingBusy:
+            raise api_error(503, '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.')
         response.status_code = status.HTTP_201_CREATED
         return response
 
@@ -0,0 +1,9 @@
+from rest_framework_simplejwt.views import TokenRefreshView
+from drf_spectacular.utils import extend_schema
+
+from accounts.serializers.token_refresh_serializer import CustomTokenRefreshSerializer
+
+
+@extend_schema(tags=['계정'], summary='토큰 재발급')
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
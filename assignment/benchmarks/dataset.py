@@ -0,0 +1,37 @@
+import random
+
+from django.db import connection
+
+from courses.models import Course
+from scripts import seed_dummy_data
+
+# 벤치마크 기본 데이터 크기. 1 CPU 로컬에서도 몇 분 안에 seed 되는 크기로 잡았다.
+DEFAULT_SIZES = {
+    'users': 2_000,
+    'courses': 20_000,
+    'tests': 20_000,
+}
+
+
+def seed_dataset(users, courses, tests, seed):
+    """scripts/seed_dummy_data.py 의 함수로 같은 seed 면 같은 분포의 데이터를 만든다.
+
+    seed 함수들은 module random 을 쓰므로 시작 전에 seed 를 고정한다. 날짜는 실행 시각 기준 상대값이다.
+    """
+    random.seed(seed)
+    batch_size = 5_000
+    seed_dummy_data.seed_users(n=users, batch_size=batch_size)
+    seed_dummy_data.seed_courses(n=courses, batch_size=batch_size)
+    seed_dummy_data.seed_tests(n=tests, batch_size=batch_size)
+    seed_dummy_data.seed_course_registrations_and_payments(users_limit=users, registrations_per_user=1, batch_size=batch_size)
+    seed_dummy_data.seed_test_registrations_and_payments(users_limit=users, registrations_per_user=1, batch_size=batch_size)
+    seed_dummy_data.rebuild_course_registration_counts()
+    seed_dummy_data.rebuild_test_registration_counts()
+    # 방금 넣은 행 때문에 측정 중에 autovacuum 이 돌면 같은 CPU 를 나눠 써 결과가 흔들린다.
+    # 미리 VACUUM ANALYZE 로 통계와 visibility map 을 맞춰 둔다. (트랜잭션 안에서는 ANALYZE 만 가능)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE' if connection.in_atomic_block else 'VACUUM ANALYZE')
+
+
+def is_seeded(courses):
+    return Course.objects.count() >= courses
@@ -0,0 +1,54 @@
+import time
+
+from assignment.benchmarks.report import summarize
+from assignment.common.json_renderers import FastJSONRenderer
+from assignment.common.query_budget import sql_shape
+from courses.models import Course
+from courses.views.course_viewset import CourseViewSet
+
+PAGE_SIZE = 20
+
+
+def course_page_rows():
+    return list(
+        Course.objects.order_by('-created_at', '-id')
+        .values_list(*CourseViewSet.list_row_fields, named=True)[:PAGE_SIZE]
+    )
+
+
+def bench_row_encoder():
+    rows, encoder = course_page_rows(), CourseViewSet.get_row_encoder()
+    return lambda: encoder.encode_many(rows)
+
+
+def bench_json_render():
+    data = CourseViewSet.get_row_encoder().encode_many(course_page_rows())
+    renderer = FastJSONRenderer()
+    return lambda: renderer.render({'count': len(data), 'next': None, 'previous': None, 'results': data})
+
+
+def bench_sql_shape():
+    sql = 'SELECT "course_registrations"."course_id" FROM "course_registrations" WHERE ("course_registrations"."user_id" = %s AND "course_registrations"."course_id" IN (' + ', '.join(['%s'] * PAGE_SIZE) + '))'
+    return lambda: sql_shape(sql)
+
+
+# 이름 → 측정할 함수를 만드는 setup (DB 조회 등 준비 비용은 측정에서 뺀다)
+MICRO_BENCHMARKS = {
+    'micro_row_encoder_course_page': bench_row_encoder,
+    'micro_json_render_course_page': bench_json_render,
+    'micro_sql_shape': bench_sql_shape,
+}
+
+
+def run_micro(setup, rounds, number=100):
+    """pytest-benchmark 처럼 round 마다 number 번 호출한 평균을 한 샘플로 모은다. (단위 µs)"""
+    func = setup()
+    for _ in range(number):
+        func()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) * 1_000_000 / number)
+    return summarize(samples, 'us')
@@ -0,0 +1,54 @@
+import json
+import statistics
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, unit, **extra):
+    return {
+        'unit': unit,
+        'iterations': len(samples),
+        'p50': round(statistics.median(samples), 3),
+        'p95': round(percentile(samples, 95), 3),
+        'p99': round(percentile(samples, 99), 3),
+        'max': round(max(samples), 3),
+        **extra,
+    }
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_report(path, report):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline_results, tolerance, min_delta_ms):
+    """baseline 대비 회귀 목록.
+
+    쿼리 수는 결정적이라 하나라도 늘면 회귀다. 지연 시간은 반복 횟수가 적어도 흔들림이 작은 p50 이
+    tolerance 비율을 넘게 늘었을 때만 보고, 엔드포인트(ms)는 min_delta_ms 미만의 차이를 잡음으로 본다.
+    """
+    regressions = []
+    for name, base in sorted(baseline_results.items()):
+        current = results.get(name)
+        if current is None:
+            continue
+        if current.get('queries', 0) > base.get('queries', 0):
+            regressions.append(f"{name}: 쿼리 수 {base['queries']} → {current['queries']}")
+        noise_floor = min_delta_ms if current['unit'] == 'ms' else 0
+        delta = current['p50'] - base['p50']
+        if base['p50'] > 0 and delta > base['p50'] * tolerance and delta > noise_floor:
+            regressions.append(
+                f"{name}: p50 {base['p50']}{base['unit']} → {current['p50']}{current['unit']} "
+                f"(+{delta / base['p50']:.0%})"
+            )
+    return regressions
@@ -0,0 +1,151 @@
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.serializers.token_obtain_serializer import CustomTokenObtainPairSerializer
+from assignment.benchmarks.report import summarize
+from assignment.common.query_budget import QueryStats, wrap_connections
+from courses.models import Course, CourseRegistration
+from payments.models import Payment
+from tests.models import Test, TestRegistration
+
+LIST_RESOURCES = ('courses', 'tests')
+LIST_SORTS = ('created', 'popular')
+LIST_STATUSES = ('all', 'available')
+APPLY_BODY = {'amount': 10000, 'payment_method': 'card'}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Scenario:
+    """요청 하나짜리 벤치마크. prepare 로 만든 데이터와 요청 결과는 매 반복 롤백한다."""
+
+    def __init__(self, name, request, expected_status, prepare=None):
+        self.name = name
+        self.request = request
+        self.expected_status = expected_status
+        self.prepare = prepare
+
+    def run_once(self, index):
+        stats = QueryStats()
+        try:
+            with transaction.atomic():
+                args = self.prepare(index) if self.prepare else ()
+                started = time.perf_counter()
+                with wrap_connections(stats):
+                    response = self.request(index, *args)
+                elapsed = (time.perf_counter() - started) * 1000
+                raise Rollback
+        except Rollback:
+            pass
+        if response.status_code != self.expected_status:
+            raise AssertionError(
+                f'{self.name}: 응답 {response.status_code} (기대값 {self.expected_status}) {getattr(response, "data", "")}'
+            )
+        return elapsed, stats.count
+
+    def measure(self, iterations, warmup):
+        for index in range(warmup):
+            self.run_once(index)
+        samples, queries = [], Counter()
+        for index in range(warmup, warmup + iterations):
+            elapsed, count = self.run_once(index)
+            samples.append(elapsed)
+            queries[count] += 1
+        # 쿼리 수는 반복마다 같아야 하지만 캐시 miss 등으로 달라지면 가장 많은 값을 기록한다.
+        return summarize(samples, 'ms', queries=max(queries))
+
+
+def make_client(user):
+    client = APIClient(HTTP_HOST='localhost')
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def build_scenarios(limit, deep_offset):
+    """list(자원 × 정렬 × 상태 × 얕은/깊은 offset), 신청/응시, 완료, 결제 취소, 내 결제내역."""
+    User = get_user_model()
+    # 신청 이력이 없는 전용 사용자로 신청/완료/취소를 재현한다. (요청마다 롤백)
+    bench_user, _ = User.objects.get_or_create(email='bench@example.com')
+    client = make_client(bench_user)
+    # 내 결제내역은 seed 된 결제가 가장 많은 사용자 기준 (동률이면 id 가 작은 사용자)
+    payer_id = (
+        Payment.objects.values('user_id').order_by('user_id')
+        .annotate(n=Count('id')).order_by('-n', 'user_id').values_list('user_id', flat=True).first()
+    )
+    payer_client = make_client(User.objects.get(pk=payer_id)) if payer_id else client
+
+    now = timezone.now()
+    items = {
+        'courses': list(Course.objects.filter(is_active=True, period__contains=now).order_by('id').values_list('id', flat=True)[:500]),
+        'tests': list(Test.objects.filter(is_active=True, period__contains=now).order_by('id').values_list('id', flat=True)[:500]),
+    }
+
+    scenarios = []
+    for resource in LIST_RESOURCES:
+        for sort in LIST_SORTS:
+            for status in LIST_STATUSES:
+                for depth, offset in (('shallow', 0), ('deep', deep_offset)):
+                    params = {'sort': sort, 'limit': limit, 'offset': offset}
+                    if status != 'all':
+                        params['status'] = status
+                    scenarios.append(Scenario(
+                        f'{resource}_list_{sort}_{status}_{depth}',
+                        lambda index, resource=resource, params=params: client.get(f'/{resource}', params),
+                        200,
+                    ))
+
+    def item_id(resource, index):
+        return items[resource][index % len(items[resource])]
+
+    def register(registration_model, item_field, item_kind):
+        def prepare(index):
+            resource = 'courses' if item_kind == 'course' else 'tests'
+            registration = registration_model.objects.create(user=bench_user, **{f'{item_field}_id': item_id(resource, index)})
+            payment = Payment.objects.create(
+                **{f'{item_kind}_registration': registration}, user=bench_user, item_kind=item_kind,
+                amount=APPLY_BODY['amount'], payment_method=APPLY_BODY['payment_method'], status='paid',
+            )
+            return registration, payment
+        return prepare
+
+    scenarios += [
+        Scenario(
+            'courses_enroll',
+            lambda index: client.post(f"/courses/{item_id('courses', index)}/enroll", APPLY_BODY, format='json'),
+            201,
+        ),
+        Scenario(
+            'tests_apply',
+            lambda index: client.post(f"/tests/{item_id('tests', index)}/apply", APPLY_BODY, format='json'),
+            201,
+        ),
+        Scenario(
+            'courses_complete',
+            lambda index, registration, payment: client.post(f'/courses/{registration.course_id}/complete'),
+            200,
+            prepare=register(CourseRegistration, 'course', 'course'),
+        ),
+        Scenario(
+            'tests_complete',
+            lambda index, registration, payment: client.post(f'/tests/{registration.test_id}/complete'),
+            200,
+            prepare=register(TestRegistration, 'test', 'test'),
+        ),
+        Scenario(
+            'payments_cancel',
+            lambda index, registration, payment: client.post(f'/payments/{payment.id}/cancel'),
+            200,
+            prepare=register(CourseRegistration, 'course', 'course'),
+        ),
+        Scenario('me_payments_list', lambda index: payer_client.get('/me/payments'), 200),
+    ]
+    return scenarios
@@ -0,0 +1,89 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.renderers import BrowsableAPIRenderer
+
+
+class AsyncListMixin:
+    """list action 을 Django async view 로도 제공한다. (ASYNC_LIST_VIEWS, ASGI 배포용)
+
+    DRF 의 dispatch 는 동기라 ASGI 에서는 요청마다 스레드로 넘겨 실행된다. 이 경로는 인증/권한/
+    페이지네이션/직렬화 규칙은 viewset 의 것을 그대로 쓰고 DB·캐시 조회만 async ORM/캐시 API 로
+    await 하므로 응답 본문은 동기 list 와 같다.
+
+    하위 클래스는 list 와 같은 응답을 내는 `async def alist(self, request, *args, **kwargs)` 를 반드시 구현한다.
+    구현하지 않으면 as_async_list_view() 가 URL 을 만들 때 ImproperlyConfigured 를 던진다.
+    """
+
+    @classmethod
+    def as_async_list_view(cls, **initkwargs):
+        if not hasattr(cls, 'alist'):
+            raise ImproperlyConfigured(f'{cls.__name__} 은 AsyncListMixin 의 alist 를 구현해야 합니다.')
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.action_map = {'get': 'list', 'head': 'list'}
+            for method, action in self.action_map.items():
+                setattr(self, method, getattr(self, action))
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.__name__ = f'{cls.__name__}AsyncList'
+        view.__doc__ = cls.__doc__
+        return csrf_exempt(view)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch 와 같은 순서(초기화 → 인증/권한 → handler → 예외 처리)의 async 버전."""
+        self.args = args
+        self.kwargs = kwargs
+        # browsable API 는 렌더링 중에 동기 조회를 하므로 async 경로는 JSON 으로만 응답한다.
+        self.renderer_classes = [
+            renderer for renderer in self.renderer_classes if not issubclass(renderer, BrowsableAPIRenderer)
+        ]
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if self.action == 'list':
+                response = await self.alist(request, *args, **kwargs)
+            elif request.method.lower() == 'options':
+                response = self.options(request, *args, **kwargs)
+            else:
+                raise MethodNotAllowed(request.method)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Request._authenticate 와 같은 규칙으로 인증한다. aauthenticate 가 없는 인증 클래스는 스레드로 넘긴다."""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None)
+            try:
+                if authenticate is not None:
+                    user_auth_tuple = await authenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
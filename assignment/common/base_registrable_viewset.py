@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction, IntegrityError
+from django.db import connection, transaction, IntegrityError
+from django.db.models import Exists, OuterRef
 from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
@@ -8,25 +10,193 @@ from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
 
 from assignment.config.pagination_config import CustomPagination
 from assignment.common.api_errors import api_error
+from assignment.common.async_list_mixin import AsyncListMixin
+from assignment.common.metrics import count_registration_conflicts, observe_select_for_update
+from assignment.common.pagination_mode_mixin import PaginationModeMixin
+from assignment.common.query_budget import query_budget
+from assignment.common.list_cache import list_cache, invalidate_item_counts
+from assignment.common.row_encoder import RowEncoder
+from payments.models import Payment
 from payments.serializers.base_apply_serializer import BaseApplySerializer
 
 
-class BaseRegistrableViewSet(ListModelMixin, GenericViewSet):
+class BaseRegistrableViewSet(AsyncListMixin, PaginationModeMixin, ListModelMixin, GenericViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
     apply_serializer_class = BaseApplySerializer
+    registration_model = None
+    registration_item_field = None
+    registration_counter = None
+    # LIST_VALUES_MODE 에서 조회할 컬럼. 정렬(cursor) 컬럼도 포함해야 한다.
+    list_row_fields = ('id', 'title', 'registrations_count', 'start_at', 'end_at', 'created_at')
+
+    # cursor 모드에서도 같은 순서를 쓰도록 id 를 마지막 tie-breaker 로 둔다.
+    sort_orderings = {
+        'created': ('-created_at', '-id'),
+        'popular': ('-registrations_count', '-created_at', '-id'),
+    }
+    # 같은 결과를 내는 쿼리가 같은 캐시 키를 쓰도록 기본값을 채워 정규화한다.
+    list_cache_param_defaults = {
+        'sort': 'created',
+        'limit': str(CustomPagination.default_limit),
+        'offset': '0',
+        'pagination': 'offset',
+        'count': 'exact',
+    }
+
+    # COUNT + 페이지 + 신청 여부 overlay, count=estimate 가 정확한 COUNT 로 떨어지면 하나 더
+    @query_budget(4)
+    def list(self, request, *args, **kwargs):
+        # 1) 사용자와 무관한 카탈로그 페이지(캐시 공유) 2) 현재 사용자 신청 여부 overlay
+        data = self.get_catalog_page()
+        rows = data['results'] if isinstance(data, dict) else data
+        self.overlay_is_registered(rows)
+        return Response(data)
+
+    @query_budget(4)
+    async def alist(self, request, *args, **kwargs):
+        data = await self.aget_catalog_page()
+        rows = data['results'] if isinstance(data, dict) else data
+        registered_ids = set()
+        if self.needs_registration_lookup(rows):
+            registered_ids = await self.aget_registered_item_ids([row['id'] for row in rows])
+        self.overlay_is_registered(rows, registered_ids)
+        return Response(data)
+
+    def get_catalog_page(self):
+        cache_key = self.get_list_cache_key()
+        if cache_key is not None:
+            data = list_cache.get(cache_key)
+            if data is not None:
+                return data
+            guard = list_cache.snapshot(self.get_catalog_guard_keys())
+
+        queryset = self.get_catalog_queryset()
+        page = self.paginate_queryset(queryset)
+        data = self.encode_catalog_page(page if page is not None else queryset, page is not None)
+
+        if cache_key is not None:
+            list_cache.set(cache_key, data, self.get_catalog_version_keys(data), guard)
+        return data
+
+    async def aget_catalog_page(self):
+        cache_key = self.get_list_cache_key()
+        if cache_key is not None:
+            data = await list_cache.aget(cache_key)
+            if data is not None:
+                return data
+            guard = await list_cache.asnapshot(self.get_catalog_guard_keys())
+
+        queryset = self.get_catalog_queryset()
+        page = await self.apaginate_queryset(queryset)
+        items = page if page is not None else [row async for row in queryset]
+        data = self.encode_catalog_page(items, page is not None)
+
+        if cache_key is not None:
+            await list_cache.aset(cache_key, data, self.get_catalog_version_keys(data), guard)
+        return data
+
+    def get_catalog_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if settings.LIST_VALUES_MODE:
+            queryset = queryset.values_list(*self.list_row_fields, named=True)
+        return queryset
+
+    def encode_catalog_page(self, items, paginated):
+        if settings.LIST_VALUES_MODE:
+            results = self.get_row_encoder().encode_many(items)
+        else:
+            results = self.get_serializer(items, many=True).data
+        if paginated:
+            return self.get_paginated_response(results).data
+        return results
+
+    def get_catalog_guard_keys(self):
+        # 조회 전에 알 수 있는 토큰: 리소스 세대(모든 신청 수 변경)와 popular 순서 토큰
+        return [list_cache.generation_key(self.basename), list_cache.popular_version_key(self.basename)]
+
+    def get_catalog_version_keys(self, data):
+        rows = data['results'] if isinstance(data, dict) else data
+        version_keys = [list_cache.item_version_key(self.basename, row['id']) for row in rows]
+        if self.request.query_params.get('sort') == 'popular':
+            version_keys.append(list_cache.popular_version_key(self.basename))
+        return version_keys
+
+    @classmethod
+    def get_row_encoder(cls):
+        # serializer 필드 해석은 viewset 클래스마다 한 번만 한다.
+        encoder = cls.__dict__.get('_row_encoder')
+        if encoder is None:
+            encoder = RowEncoder(cls.serializer_class, cls.list_row_fields)
+            cls._row_encoder = encoder
+        return encoder
+
+    def overlay_is_registered(self, rows, registered_ids=None):
+        if registered_ids is None:
+            registered_ids = set()
+            if self.needs_registration_lookup(rows):
+                registered_ids = self.get_registered_item_ids([row['id'] for row in rows])
+        for row in rows:
+            row['is_registered'] = row['id'] in registered_ids
+
+    def needs_registration_lookup(self, rows):
+        # available 목록은 이미 신청한 항목을 제외하고 조회했으므로 조회가 필요 없다.
+        return bool(rows) and not self.is_available_listing()
+
+    def get_registered_item_ids(self, item_ids=None):
+        """현재 사용자의 취소되지 않은 신청 대상 id 집합. item_ids 가 주어지면 그 안에서만 찾는다."""
+        return set(self.get_registered_item_queryset(item_ids))
+
+    async def aget_registered_item_ids(self, item_ids=None):
+        return {item_id async for item_id in self.get_registered_item_queryset(item_ids)}
+
+    def get_registered_item_queryset(self, item_ids=None):
+        field = self.registration_item_field
+        queryset = self.registration_model.objects.filter(user_id=self.request.user.id).exclude(status='cancelled')
+        if item_ids is not None:
+            queryset = queryset.filter(**{f'{field}__in': item_ids})
+        return queryset.values_list(field, flat=True)
+
+    def get_list_cache_key(self):
+        # available 목록은 사용자의 신청 항목을 SQL 에서 제외하므로 사용자 간에 공유할 페이지가 없다.
+        if not settings.LIST_CACHE_ENABLED or self.is_available_listing():
+            return None
+        params = {k: v for k, v in self.request.query_params.items() if v != ''}
+        for name, default in self.list_cache_param_defaults.items():
+            params.setdefault(name, default)
+        # next/previous 링크가 절대 URL 이므로 host 도 키에 포함한다.
+        params['_base'] = self.request.build_absolute_uri('/')
+        return list_cache.build_key(self.basename, 'all', params)
+
+    def is_available_listing(self):
+        return self.request.query_params.get('status') == 'available'
 
     def apply_status_and_sort(self, queryset):
-        status_param = self.request.query_params.get('status')
-        if status_param == 'available':
-            now = timezone.now()
-            queryset = queryset.filter(is_active=True, is_registered=False, start_at__lte=now, end_at__gte=now)
+        if self.is_available_listing():
+            queryset = self.filter_available_period(queryset, timezone.now())
+            # 신청 항목을 Python 으로 가져와 NOT IN 으로 돌려보내지 않고 anti-join 으로 제외한다.
+            registered = self.registration_model.objects.filter(
+                user_id=self.request.user.id,
+                **{self.registration_item_field: OuterRef('pk')},
+            ).exclude(status='cancelled')
+            queryset = queryset.filter(~Exists(registered))
 
         sort = self.request.query_params.get('sort', 'created')
-        if sort == 'popular':
-            return queryset.order_by('-registrations_count', '-created_at')
-        return queryset.order_by('-created_at')
+        return queryset.order_by(*self.sort_orderings.get(sort, self.sort_orderings['created']))
+
+    def filter_available_period(self, queryset, now):
+        if settings.AVAILABLE_PERIOD_FILTER == 'gist':
+            return queryset.filter(is_active=True, period__contains=now)
+        return queryset.filter(is_active=True, start_at__lte=now, end_at__gte=now)
 
+    def get_count_cache_key(self):
+        if self.is_available_listing():
+            return f'list-count:{self.basename}:available:user:{self.request.user.id}'
+        status_param = self.request.query_params.get('status') or 'all'
+        return f'list-count:{self.basename}:{status_param}:all'
+
+    @count_registration_conflicts
+    @query_budget(5)
     def do_apply(self, request, pk, *,
                  serializer_class,
                  get_item_or_404,
@@ -52,6 +222,7 @@ class BaseRegistrableViewSet(ListModelMixin, GenericViewSet):
                 payment = create_payment(registration, serializer.validated_data)
             except IntegrityError:
                 raise api_error(409, payment_conflict_message)
+            invalidate_item_counts(self.basename, item.id)
 
         return Response(
             data={
@@ -62,6 +233,104 @@ class BaseRegistrableViewSet(ListModelMixin, GenericViewSet):
             status=HTTP_201_CREATED,
         )
 
+    @count_registration_conflicts
+    @query_budget(1)
+    def do_apply_fast(self, request, pk, *,
+                      serializer_class,
+                      not_found_message: str,
+                      not_applicable_message: str,
+                      registration_conflict_message: str,
+                      payment_conflict_message: str):
+        """do_apply 와 같은 응답을 내지만 검증/신청/카운터/결제를 단일 CTE 한 번으로 처리한다.
+
+        중복 신청은 사전 EXISTS 조회 대신 부분 unique 인덱스(ON CONFLICT DO NOTHING)로 판단한다.
+        """
+        serializer = serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            item_id = int(pk)
+        except (TypeError, ValueError):
+            raise api_error(404, not_found_message)
+
+        with transaction.atomic():
+            try:
+                found, applicable, registration_id, payment_id = self.insert_registration_and_payment(
+                    request.user.id, item_id, serializer.validated_data,
+                )
+            except IntegrityError:
+                raise api_error(409, payment_conflict_message)
+            if not found:
+                raise api_error(404, not_found_message)
+            if not applicable:
+                raise api_error(400, not_applicable_message)
+            if registration_id is None:
+                raise api_error(409, registration_conflict_message)
+            invalidate_item_counts(self.basename, item_id)
+
+        return Response(
+            data={
+                'registration_id': registration_id,
+                'payment_id': payment_id,
+                'status': 'paid',
+            },
+            status=HTTP_201_CREATED,
+        )
+
+    def insert_registration_and_payment(self, user_id, item_id, data):
+        """(항목 존재 여부, 신청 가능 여부, registration_id, payment_id) 를 한 번의 쿼리로 돌려준다."""
+        registration_meta = self.registration_model._meta
+        item_field = registration_meta.get_field(self.registration_item_field.removesuffix('_id'))
+        item_table = item_field.related_model._meta.db_table
+        item_column = item_field.column
+        payment_column = self.get_payment_registration_field().column
+        counter_sql, counter_params = self.registration_counter.increment_cte('reg')
+        sql = f"""
+            WITH item AS (
+                SELECT id, title, (is_active AND period @> %(now)s) AS applicable
+                FROM {item_table} WHERE id = %(item_id)s
+            ), reg AS (
+                INSERT INTO {registration_meta.db_table} (user_id, {item_column}, status, created_at)
+                SELECT %(user_id)s, id, 'registered', %(now)s FROM item WHERE applicable
+                ON CONFLICT (user_id, {item_column}) WHERE NOT (status = 'cancelled') DO NOTHING
+                RETURNING id, {item_column} AS item_id
+            ), counter AS (
+                {counter_sql}
+            ), pay AS (
+                INSERT INTO {Payment._meta.db_table}
+                    ({payment_column}, user_id, item_kind, item_title, registration_status,
+                     amount, payment_method, status, paid_at, created_at, updated_at)
+                SELECT reg.id, %(user_id)s, %(item_kind)s, item.title, 'registered',
+                       %(amount)s, %(payment_method)s, 'paid', %(now)s, %(now)s, %(now)s
+                FROM reg CROSS JOIN item
+                RETURNING id
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM item),
+                COALESCE((SELECT applicable FROM item), false),
+                (SELECT id FROM reg),
+                (SELECT id FROM pay)
+        """
+        params = {
+            'now': timezone.now(),
+            'item_id': item_id,
+            'user_id': user_id,
+            'item_kind': self.basename,
+            'amount': data['amount'],
+            'payment_method': data['payment_method'],
+            **counter_params,
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+
+    def get_payment_registration_field(self):
+        """Payment 에서 이 viewset 의 신청 모델을 가리키는 OneToOne 필드."""
+        return next(
+            field for field in Payment._meta.concrete_fields
+            if field.is_relation and field.related_model is self.registration_model
+        )
+
+    @query_budget(5)
     def do_complete(self, request, pk, *,
                     get_item_or_404,
                     validate_item_is_completable,
@@ -74,7 +343,8 @@ class BaseRegistrableViewSet(ListModelMixin, GenericViewSet):
             validate_item_is_completable(item)
             registration = get_registration_or_404(request.user, item)
             try:
-                registration = registration.__class__.objects.select_for_update().get(pk=registration.pk)
+                with observe_select_for_update(f'{self.basename}_complete'):
+                    registration = registration.__class__.objects.select_for_update().get(pk=registration.pk)
             except Exception:
                 pass
             validate_registration_can_complete(registration)
@@ -97,5 +367,10 @@ class BaseRegistrableViewSet(ListModelMixin, GenericViewSet):
         if getattr(registration, 'attempted_at', None) is None:
             registration.attempted_at = now
         registration.save(update_fields=['status', 'attempted_at'])
+        # 결제내역 목록이 JOIN 없이 읽는 스냅샷도 같은 트랜잭션에서 갱신한다.
+        Payment.objects.filter(**{self.get_payment_registration_field().name: registration.pk}).update(
+            registration_status=registration.status,
+            attempted_at=registration.attempted_at,
+        )
 
 
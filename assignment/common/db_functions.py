@@ -0,0 +1,8 @@
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db.models import Func
+
+
+class TsTzRange(Func):
+    """PostgreSQL tstzrange(lower, upper, bounds) 생성 함수."""
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
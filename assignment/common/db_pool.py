@@ -0,0 +1,31 @@
+import os
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# psycopg_pool 의 get_stats() 는 한 번도 증가하지 않은 카운터를 빼고 돌려주므로 항상 같은 키로 채운다.
+POOL_STAT_KEYS = (
+    'pool_min', 'pool_max', 'pool_size', 'pool_available',
+    'requests_waiting', 'requests_num', 'requests_queued', 'requests_wait_ms', 'requests_errors',
+    'usage_ms', 'returns_bad',
+    'connections_num', 'connections_ms', 'connections_errors', 'connections_lost',
+)
+
+
+def get_pool_stats(alias=DEFAULT_DB_ALIAS):
+    """이 워커 프로세스의 psycopg 연결 풀 통계. 풀을 쓰지 않으면 None.
+
+    requests_queued / requests_wait_ms 는 연결을 기다린 요청 수와 누적 대기 시간, requests_errors 는
+    POSTGRES_POOL_TIMEOUT 초과 등으로 연결을 받지 못한 요청 수다. (프로세스 시작 이후 누적)
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {key: stats.get(key, 0) for key in POOL_STAT_KEYS}
+
+
+def get_all_pool_stats():
+    return {
+        'pid': os.getpid(),
+        'pools': {alias: get_pool_stats(alias) for alias in connections},
+    }
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.response import Response
+
+from assignment.common.api_errors import api_error
+from payments.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_REPLAYED_HEADER = 'Idempotent-Replayed'
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description='재시도 시 같은 값을 보내면 처음 성공한 응답을 그대로 돌려줍니다. (최대 255자)',
+)
+
+
+class LocalLRU:
+    """워커 프로세스 안에서만 쓰는 TTL LRU. 스레드(gthread) 간에 공유되므로 lock 으로 감싼다."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.IDEMPOTENCY_LRU_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_responses = LocalLRU()
+
+
+def get_stored_response(user_id, key):
+    """(fingerprint, status_code, body) 또는 None. status_code 가 None 이면 처리 중(예약)인 키다.
+
+    LRU 에 없으면 테이블에서 찾고, 완료된 응답만 남은 보관 기간 동안 LRU 에 채운다.
+    """
+    stored = local_responses.get((user_id, key))
+    if stored is not None:
+        return stored
+    ttl = settings.IDEMPOTENCY_KEY_TTL
+    now = timezone.now()
+    row = (
+        IdempotencyKey.objects
+        .filter(user_id=user_id, key=key, created_at__gte=now - timedelta(seconds=ttl))
+        .values_list('fingerprint', 'status_code', 'response_body', 'created_at')
+        .first()
+    )
+    if row is None:
+        return None
+    fingerprint, status_code, body, created_at = row
+    if status_code is None and (now - created_at).total_seconds() > settings.IDEMPOTENCY_PENDING_TIMEOUT:
+        return None  # 끝나지 않은 오래된 예약은 reserve_key 가 덮어쓴다.
+    stored = (fingerprint, status_code, body)
+    if status_code is not None:
+        remaining = ttl - (now - created_at).total_seconds()
+        if remaining > 0:
+            local_responses.set((user_id, key), stored, remaining)
+    return stored
+
+
+def reserve_key(user_id, key, fingerprint):
+    """키를 처리 중으로 예약한다. 이미 유효한 키가 있으면 False.
+
+    보관 기간이 지난 키와 IDEMPOTENCY_PENDING_TIMEOUT 이 지나도록 끝나지 않은 예약(워커 종료 등)은 덮어쓴다.
+    autocommit 으로 바로 커밋되므로 동시에 들어온 같은 키의 요청은 이 예약을 보고 기다리지 않고 409 를 받는다.
+    """
+    now = timezone.now()
+    table = IdempotencyKey._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (user_id, key, fingerprint, status_code, response_body, created_at)
+            VALUES (%(user_id)s, %(key)s, %(fingerprint)s, NULL, NULL, %(now)s)
+            ON CONFLICT (user_id, key) DO UPDATE
+                SET fingerprint = EXCLUDED.fingerprint, status_code = NULL, response_body = NULL,
+                    created_at = EXCLUDED.created_at
+                WHERE {table}.created_at < %(expired_before)s
+                   OR ({table}.status_code IS NULL AND {table}.created_at < %(stale_before)s)
+            RETURNING id
+            """,
+            {
+                'user_id': user_id,
+                'key': key,
+                'fingerprint': fingerprint,
+                'now': now,
+                'expired_before': now - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                'stale_before': now - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT),
+            },
+        )
+        return cursor.fetchone() is not None
+
+
+def store_response(user_id, key, fingerprint, response):
+    IdempotencyKey.objects.filter(user_id=user_id, key=key, status_code__isnull=True).update(
+        status_code=response.status_code, response_body=response.data,
+    )
+    local_responses.set((user_id, key), (fingerprint, response.status_code, response.data), settings.IDEMPOTENCY_KEY_TTL)
+
+
+def release_key(user_id, key):
+    IdempotencyKey.objects.filter(user_id=user_id, key=key, status_code__isnull=True).delete()
+
+
+def request_fingerprint(request):
+    """"METHOD path sha256(본문)". 같은 키로 본문만 바꾼 요청(다른 장바구니 등)도 다른 요청으로 본다."""
+    body = json.dumps(request.data, sort_keys=True, separators=(',', ':'), default=str)
+    return f'{request.method} {request.path} {hashlib.sha256(body.encode()).hexdigest()}'
+
+
+def replay_or_reject(stored, fingerprint):
+    stored_fingerprint, status_code, body = stored
+    if stored_fingerprint != fingerprint:
+        raise api_error(422, '다른 요청에 사용된 Idempotency-Key 입니다.')
+    if status_code is None:
+        raise api_error(409, '같은 Idempotency-Key 의 요청을 처리 중입니다. 잠시 후 다시 시도하세요.')
+    return Response(body, status=status_code, headers={IDEMPOTENCY_REPLAYED_HEADER: 'true'})
+
+
+def idempotent(view_method):
+    """Idempotency-Key 헤더가 있으면 성공(2xx) 응답을 저장하고, 같은 키의 재요청에는 저장된 응답을 돌려준다.
+
+    처리 전에 키를 예약하므로 처리 중에 도착한 재시도는 신청/결제 행을 조회하거나 잠그지 않고 409 를 받는다.
+    실패 응답이나 예외면 예약을 지우므로 같은 키로 다시 시도할 수 있다.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            raise api_error(400, 'Idempotency-Key 는 255자 이하여야 합니다.')
+
+        user_id = request.user.id
+        fingerprint = request_fingerprint(request)
+        stored = get_stored_response(user_id, key)
+        if stored is not None:
+            return replay_or_reject(stored, fingerprint)
+        if not reserve_key(user_id, key, fingerprint):
+            # 조회와 예약 사이에 같은 키의 요청이 먼저 예약했다. (그 사이 실패해 예약이 지워졌어도 처리 중으로 본다)
+            return replay_or_reject(get_stored_response(user_id, key) or (fingerprint, None, None), fingerprint)
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except BaseException:
+            release_key(user_id, key)
+            raise
+        if 200 <= response.status_code < 300:
+            store_response(user_id, key, fingerprint, response)
+        else:
+            release_key(user_id, key)
+        return response
+
+    return wrapper
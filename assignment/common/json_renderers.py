@@ -0,0 +1,70 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없는 환경에서는 stdlib json 경로만 쓴다.
+    orjson = None
+
+# datetime/date/time 은 DRF JSONEncoder.default 로 넘겨 '+00:00' → 'Z' 등 기존 표현을 그대로 유지한다.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+_drf_default = JSONEncoder().default
+
+
+def use_orjson():
+    return orjson is not None and settings.JSON_BACKEND == 'orjson'
+
+
+def _escape_line_terminators(ret):
+    # DRF 와 같이 U+2028/U+2029 를 이스케이프해 JavaScript 에서도 유효한 JSON 으로 만든다.
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON_BACKEND=orjson 이면 orjson 으로, 아니면 DRF 기본(stdlib json)으로 렌더링한다.
+
+    compact 출력(COMPACT_JSON, UNICODE_JSON 기본값)에서는 두 backend 의 결과가 같다.
+    들여쓰기를 요청했거나 orjson 이 처리하지 못하는 값(64bit 를 넘는 정수 등)은 stdlib 로 렌더링한다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if use_orjson() and self.compact and not self.ensure_ascii \
+                and self.get_indent(accepted_media_type, renderer_context or {}) is None:
+            try:
+                return _escape_line_terminators(orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS))
+            except orjson.JSONEncodeError:
+                pass
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def dumps(data):
+    """API 응답과 같은 JSON 바이트. (스트리밍 응답처럼 renderer 를 거치지 않는 곳에서 쓴다)"""
+    return _renderer.render(data)
+
+
+_renderer = FastJSONRenderer()
+
+
+class FastJSONParser(JSONParser):
+    """JSON_BACKEND=orjson 이면 요청 본문을 orjson.loads 로 파싱한다. (UTF-8 이 아니면 stdlib)"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not use_orjson() or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
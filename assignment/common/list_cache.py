@@ -0,0 +1,124 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+class ListCache:
+    """사용자와 무관한 목록(카탈로그) 페이지 캐시.
+
+    엔트리는 저장 시점의 항목별 버전 토큰을 함께 들고 있고, 조회 시 현재 토큰과
+    하나라도 다르면 miss 로 처리한다. 무효화는 버전 토큰을 새 값으로 덮어쓰는 것만으로
+    끝나므로 어떤 페이지에 어떤 항목이 있었는지 역색인을 관리할 필요가 없다.
+
+    항목 토큰은 페이지를 조회한 뒤에야 알 수 있으므로, 조회 전에 guard 토큰(리소스 세대 등)을
+    snapshot() 으로 읽어 두고 저장 직전에 바뀌었으면 저장하지 않는다. 조회와 저장 사이에 커밋된
+    쓰기가 이전 데이터를 새 토큰으로 저장하게 만들지 못하도록 하기 위해서다.
+    backend 는 settings.CACHES 의 alias 로 고른다. (locmem / redis)
+    """
+
+    def __init__(self, alias='list'):
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def timeout(self):
+        return settings.LIST_CACHE_TIMEOUT
+
+    def build_key(self, resource, scope, params):
+        normalized = '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+        digest = hashlib.md5(normalized.encode()).hexdigest()
+        return f'page:{resource}:{scope}:{digest}'
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        return self._fresh_data(entry, self.backend.get_many(list(entry['versions'])))
+
+    def snapshot(self, guard_keys):
+        """페이지를 조회하기 전에 읽는 guard 토큰. set()/aset() 에 그대로 넘긴다.
+
+        아직 한 번도 무효화되지 않은 토큰은 None 으로 남겨 두어야 이후 처음 생긴 토큰도 변경으로 본다.
+        """
+        current = self.backend.get_many(guard_keys)
+        return {k: current.get(k) for k in guard_keys}
+
+    def set(self, key, data, version_keys, guard=None):
+        # 무효화는 guard 토큰을 먼저 쓰므로, 항목 토큰을 읽은 뒤 guard 를 읽어야 새 항목 토큰을 보고도 놓치지 않는다.
+        current = self.backend.get_many(version_keys)
+        if guard is not None and self._guard_changed(guard, self.backend.get_many(list(guard))):
+            return
+        self.backend.set(key, self._build_entry(data, version_keys, current), self.timeout)
+
+    async def aget(self, key):
+        # get/set 의 async 버전. (AsyncListMixin 경로 용)
+        entry = await self.backend.aget(key)
+        if entry is None:
+            return None
+        return self._fresh_data(entry, await self.backend.aget_many(list(entry['versions'])))
+
+    async def asnapshot(self, guard_keys):
+        current = await self.backend.aget_many(guard_keys)
+        return {k: current.get(k) for k in guard_keys}
+
+    async def aset(self, key, data, version_keys, guard=None):
+        current = await self.backend.aget_many(version_keys)
+        if guard is not None and self._guard_changed(guard, await self.backend.aget_many(list(guard))):
+            return
+        await self.backend.aset(key, self._build_entry(data, version_keys, current), self.timeout)
+
+    @staticmethod
+    def _guard_changed(guard, current):
+        return any(current.get(k) != v for k, v in guard.items())
+
+    @staticmethod
+    def _fresh_data(entry, current):
+        if any(current.get(k) != v for k, v in entry['versions'].items()):
+            return None
+        return entry['data']
+
+    @staticmethod
+    def _build_entry(data, version_keys, current):
+        return {'data': data, 'versions': {k: current.get(k) for k in version_keys}}
+
+    def invalidate(self, version_keys):
+        # 토큰이 만료/축출되어도 저장 당시 값과 달라지므로 항상 miss 쪽으로만 틀린다.
+        token = time.time_ns()
+        self.backend.set_many({k: token for k in version_keys}, self.timeout)
+
+    def item_version_key(self, resource, item_id):
+        return f'ver:{resource}:item:{item_id}'
+
+    def popular_version_key(self, resource):
+        # sort=popular 페이지는 신청 수가 바뀐 항목이 다른 페이지로 옮겨 갈 수 있어 항목 토큰만으로는 부족하다.
+        return f'ver:{resource}:popular'
+
+    def generation_key(self, resource):
+        # 리소스의 어떤 항목이든 신청 수가 바뀌면 갱신된다. 엔트리에는 넣지 않고 조회~저장 사이의 쓰기 감지에만 쓴다.
+        return f'ver:{resource}:gen'
+
+
+list_cache = ListCache()
+
+
+def invalidate_item_counts(resource, item_id):
+    """신청/취소로 항목의 registrations_count 가 바뀌었을 때 호출한다.
+
+    항목이 포함된 페이지와 함께, 순서가 바뀔 수 있는 sort=popular 페이지 전체를 무효화한다.
+    커밋 이후에 무효화해야 커밋 전 데이터로 캐시가 다시 채워지지 않는다.
+    """
+    guard_keys = [list_cache.generation_key(resource), list_cache.popular_version_key(resource)]
+    item_keys = [list_cache.item_version_key(resource, item_id)]
+
+    def invalidate():
+        # guard 토큰을 먼저 바꿔야 항목 토큰만 새 값인 상태를 본 set() 이 저장하지 않는다.
+        list_cache.invalidate(guard_keys)
+        list_cache.invalidate(item_keys)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,148 @@
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.exceptions import APIException
+
+from assignment.common.query_budget import wrap_connections
+
+# 지표 객체를 만들기 전에 워커 공용 디렉터리가 있어야 한다. (gunicorn.conf.py 가 마스터 시작 시 비운다)
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', '요청 처리 시간 (middleware 전체)',
+    ['route', 'method', 'status'],
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', '요청 하나에서 실행된 쿼리 시간 합',
+    ['route', 'method'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', '응답 본문 크기 (스트리밍 응답 제외)',
+    ['route', 'method'],
+    buckets=(128, 512, 2048, 8192, 32768, 131072, 524288, 2097152),
+)
+REGISTRATION_CONFLICTS = Counter(
+    'registration_conflicts_total', '수업 수강/시험 응시 신청 409 (중복 신청, 동시 신청 경합)',
+    ['kind'],
+)
+PAYMENT_CANCELS = Counter(
+    'payment_cancels_total', '결제 취소 결과',
+    ['outcome'],
+)
+SELECT_FOR_UPDATE = Histogram(
+    'select_for_update_seconds', 'select_for_update 조회 왕복 시간 (행 잠금 대기 + 쿼리 실행, 성공한 조회만)',
+    ['site'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+CANCEL_OUTCOMES = {200: 'cancelled', 400: 'invalid', 403: 'forbidden', 404: 'not_found', 409: 'conflict'}
+
+
+def get_route(request):
+    """URL 이름(router 는 `{basename}-{action}`)으로 라벨을 붙여 pk 가 다른 요청도 한 route 로 모은다."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+def render_metrics():
+    """PROMETHEUS_MULTIPROC_DIR 가 있으면 모든 워커의 지표를 합쳐서, 없으면 이 프로세스 지표만 내보낸다."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+@contextmanager
+def observe_select_for_update(site):
+    """with 블록(select_for_update 조회)이 끝나기까지 걸린 시간. 예외로 끝난 조회는 기록하지 않는다."""
+    started = time.perf_counter()
+    yield
+    SELECT_FOR_UPDATE.labels(site).observe(time.perf_counter() - started)
+
+
+def count_registration_conflicts(method):
+    """신청 view helper 에서 나가는 409 를 viewset basename(course|test) 별로 센다."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except APIException as exc:
+            if exc.status_code == 409:
+                REGISTRATION_CONFLICTS.labels(self.basename).inc()
+            raise
+    return wrapper
+
+
+def count_cancel_outcomes(method):
+    """결제 취소 응답/에러 상태 코드를 결과 라벨로 센다. (멱등키 재요청은 세지 않도록 @idempotent 안쪽에 둔다)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            response = method(self, *args, **kwargs)
+        except APIException as exc:
+            PAYMENT_CANCELS.labels(CANCEL_OUTCOMES.get(exc.status_code, 'error')).inc()
+            raise
+        PAYMENT_CANCELS.labels(CANCEL_OUTCOMES.get(response.status_code, 'error')).inc()
+        return response
+    return wrapper
+
+
+class DbTimer:
+    def __init__(self):
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """요청마다 route 별 처리 시간 / DB 시간 / 응답 크기 histogram 을 갱신한다."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer, started = DbTimer(), time.perf_counter()
+        with wrap_connections(timer):
+            response = self.get_response(request)
+        self.observe(request, response, timer, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        timer, started = DbTimer(), time.perf_counter()
+        with wrap_connections(timer):
+            response = await self.get_response(request)
+        self.observe(request, response, timer, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def observe(request, response, timer, elapsed):
+        route, method = get_route(request), request.method
+        REQUEST_LATENCY.labels(route, method, response.status_code).observe(elapsed)
+        REQUEST_DB_TIME.labels(route, method).observe(timer.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route, method).observe(len(response.content))
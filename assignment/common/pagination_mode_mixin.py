@@ -0,0 +1,28 @@
+from rest_framework.exceptions import ValidationError
+
+from assignment.config.pagination_config import KeysetPagination
+
+
+class PaginationModeMixin:
+    """`?pagination=cursor` (또는 `cursor` 파라미터)로 keyset 페이지네이션을 선택하게 한다.
+
+    파라미터가 없으면 기존 `pagination_class` 응답을 그대로 유지한다.
+    """
+    pagination_mode_query_param = 'pagination'
+    cursor_pagination_class = KeysetPagination
+
+    def is_cursor_pagination_requested(self):
+        params = self.request.query_params
+        mode = params.get(self.pagination_mode_query_param)
+        if mode not in (None, '', 'offset', 'cursor'):
+            raise ValidationError({self.pagination_mode_query_param: '허용값: cursor, offset'})
+        return mode == 'cursor' or bool(params.get(self.cursor_pagination_class.cursor_query_param))
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            if getattr(self, 'request', None) is not None and self.is_cursor_pagination_requested():
+                pagination_class = self.cursor_pagination_class
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
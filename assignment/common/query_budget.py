@@ -0,0 +1,205 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('assignment.query_budget')
+
+_current_stats = ContextVar('query_budget_stats', default=None)
+# 현재 요청(context)에 걸린 execute_wrapper 들. sync_to_async 가 context 를 복사하므로 ASGI 의 executor 스레드에서도 보인다.
+_active_wrappers = ContextVar('query_wrappers', default=())
+
+_WHITESPACE = re.compile(r'\s+')
+# 페이지마다 길이가 달라지는 IN (%s, %s, ...) 목록은 같은 모양으로 본다.
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_SAVEPOINT = re.compile(r'^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT) ')
+
+
+def _run_active_wrappers(execute, sql, params, many, context):
+    for wrapper in reversed(_active_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_hook(connection, **kwargs):
+    """connection 에 _run_active_wrappers 를 한 번만 건다. (connection_created 수신자)
+
+    DB 연결은 스레드마다 따로라서, 연결이 만들어지는 스레드에서 걸어야 ASGI 처럼 쿼리가 다른 스레드에서
+    실행돼도 빠지지 않는다. connection.execute_wrapper() 블록이 pop() 으로 자기 것을 빼므로 맨 앞에 넣는다.
+    """
+    if _run_active_wrappers not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _run_active_wrappers)
+
+
+connection_created.connect(install_query_hook)
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    """with 블록 안(현재 context)에서 실행되는 모든 DB alias 의 쿼리에 wrapper 를 건다.
+
+    어느 스레드의 연결이든 현재 context 를 보고 wrapper 를 부르므로 async view 가 sync_to_async 로 넘긴 쿼리도 잡힌다.
+    이 모듈을 import 하기 전에 이미 연결된 현재 스레드의 연결에도 hook 을 건다.
+    """
+    for connection in connections.all(initialized_only=False):
+        install_query_hook(connection)
+    token = _active_wrappers.set(_active_wrappers.get() + (wrapper,))
+    try:
+        yield
+    finally:
+        _active_wrappers.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """QUERY_BUDGET_STRICT 에서 요청이 쿼리 상한을 넘거나 N+1 패턴을 보이면 발생한다. (테스트 실패 용)"""
+
+
+def sql_shape(sql):
+    """파라미터 자리표시자만 남은 SQL 을 공백/IN 목록 길이와 무관한 모양으로 정규화한다."""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', sql).strip())
+
+
+class QueryStats:
+    """connection.execute_wrapper 로 요청 하나의 쿼리 수, DB 시간, SQL 모양별 실행 횟수를 모은다.
+
+    savepoint 문장은 세지 않는다. 테스트에서는 바깥 트랜잭션 때문에 atomic() 이 savepoint 로 바뀌어
+    운영과 쿼리 수가 달라지기 때문이다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.violations = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            if not _SAVEPOINT.match(sql):
+                self.count += 1
+                self.shapes[sql_shape(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """같은 모양이 두 번 이상 실행된 횟수의 합 (첫 실행 제외)."""
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def repeated_shapes(self, threshold):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def check_budget(self, owner, limit, used):
+        if used > limit:
+            self.violations.append(f'{owner} 쿼리 상한 {limit} 초과 ({used})')
+
+
+def query_budget(limit):
+    """view 또는 view 가 부르는 helper 안에서 실행되는 쿼리 수의 상한을 선언한다.
+
+    인증/멱등키처럼 함수 밖에서 실행된 쿼리는 세지 않는다. QueryBudgetMiddleware 가 켜져 있을 때만 검사한다.
+    """
+    def decorator(func):
+        owner = func.__qualname__
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                stats = _current_stats.get()
+                if stats is None:
+                    return await func(*args, **kwargs)
+                start = stats.count
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    stats.check_budget(owner, limit, stats.count - start)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = _current_stats.get()
+            if stats is None:
+                return func(*args, **kwargs)
+            start = stats.count
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.check_budget(owner, limit, stats.count - start)
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """요청마다 쿼리 수 / DB 시간 / 중복 SQL 모양을 집계해 Server-Timing 헤더와 로그로 남긴다.
+
+    @query_budget 으로 선언한 함수별 상한을 넘거나 같은 모양이 QUERY_N_PLUS_ONE_THRESHOLD 번 이상 실행되면
+    WARNING 으로 남기고, QUERY_BUDGET_STRICT(테스트 러너)면 QueryBudgetExceeded 를 발생시킨다.
+    스트리밍 응답 본문을 만들면서 실행되는 쿼리는 집계되지 않는다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            with wrap_connections(stats):
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            with wrap_connections(stats):
+                response = await self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        duration_ms = stats.duration * 1000
+        if settings.QUERY_BUDGET_SERVER_TIMING:
+            response.headers['Server-Timing'] = (
+                f'db;dur={duration_ms:.2f};desc="{stats.count} queries, {stats.duplicates} duplicates"'
+            )
+
+        repeated = stats.repeated_shapes(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+        problems = stats.violations + [f'같은 SQL {n}회 실행 (N+1 의심): {shape}' for shape, n in repeated]
+
+        level = logging.WARNING if problems else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                'method=%s path=%s status=%s queries=%d db_ms=%.2f duplicates=%d problems=%s',
+                request.method, request.path, response.status_code,
+                stats.count, duration_ms, stats.duplicates, '; '.join(problems) or '-',
+                extra={
+                    'queries': stats.count,
+                    'db_ms': round(duration_ms, 2),
+                    'duplicates': stats.duplicates,
+                    'problems': problems,
+                },
+            )
+        if problems and settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(f'{request.method} {request.path}: ' + '; '.join(problems))
+        return response
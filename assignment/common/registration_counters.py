@@ -0,0 +1,168 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from assignment.common.list_cache import invalidate_item_counts
+
+
+class RegistrationCounter:
+    """수업/시험의 registrations_count 증감을 모드에 따라 기록한다.
+
+    sync 모드는 부모 행을 바로 UPDATE 한다. sharded 모드는 (항목, 샤드) 행에 증감만
+    upsert 하므로 인기 항목에 신청이 몰려도 부모 행 락을 두고 경합하지 않고,
+    rollup() 이 샤드를 비우면서 부모 행에 한 번에 반영한다. (eventually consistent)
+    outbox 모드는 증감을 delta 행으로 INSERT 만 하고, drain() 이 배치 단위로 모아 반영한다.
+    """
+
+    def __init__(self, resource, item_model, shard_model, delta_model, item_field):
+        self.resource = resource
+        self.item_model = item_model
+        self.shard_model = shard_model
+        self.delta_model = delta_model
+        self.item_field = item_field
+
+    @property
+    def mode(self):
+        return settings.REGISTRATION_COUNTER_MODE
+
+    def add(self, item_id, delta):
+        if self.mode == 'outbox':
+            # 신청/취소와 같은 트랜잭션에 기록되므로 롤백되면 delta 도 함께 사라진다.
+            self.delta_model.objects.create(**{f'{self.item_field}_id': item_id, 'delta': delta})
+            return
+        if self.mode != 'sharded':
+            self.item_model.objects.filter(pk=item_id).update(registrations_count=F('registrations_count') + delta)
+            return
+        table = self.shard_model._meta.db_table
+        column = f'{self.item_field}_id'
+        shard = random.randrange(settings.REGISTRATION_COUNTER_SHARDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} ({column}, shard, delta)
+                VALUES (%s, %s, %s)
+                ON CONFLICT ({column}, shard) DO UPDATE SET delta = {table}.delta + EXCLUDED.delta
+                """,
+                [item_id, shard, delta],
+            )
+
+    def add_many(self, deltas):
+        """{item_id: delta} 를 모드와 관계없이 쿼리 한 번으로 기록한다. (일괄 신청 용)"""
+        changed = [(item_id, delta) for item_id, delta in deltas.items() if delta]
+        if not changed:
+            return
+        if self.mode == 'outbox':
+            self.delta_model.objects.bulk_create(
+                [self.delta_model(**{f'{self.item_field}_id': item_id, 'delta': delta}) for item_id, delta in changed]
+            )
+            return
+        with connection.cursor() as cursor:
+            if self.mode != 'sharded':
+                self._update_items(cursor, changed)
+                return
+            table = self.shard_model._meta.db_table
+            column = f'{self.item_field}_id'
+            shard = random.randrange(settings.REGISTRATION_COUNTER_SHARDS)
+            values = ', '.join(['(%s, %s, %s)'] * len(changed))
+            cursor.execute(
+                f"""
+                INSERT INTO {table} ({column}, shard, delta)
+                VALUES {values}
+                ON CONFLICT ({column}, shard) DO UPDATE SET delta = {table}.delta + EXCLUDED.delta
+                """,
+                [value for item_id, delta in changed for value in (item_id, shard, delta)],
+            )
+
+    def increment_cte(self, source):
+        """source CTE 의 item_id 마다 +1 하는 data-modifying CTE 본문과 파라미터. (신청 fast path 용)"""
+        column = f'{self.item_field}_id'
+        if self.mode == 'outbox':
+            table = self.delta_model._meta.db_table
+            return f"INSERT INTO {table} ({column}, delta, created_at) SELECT item_id, 1, now() FROM {source}", {}
+        if self.mode == 'sharded':
+            table = self.shard_model._meta.db_table
+            return (
+                f"INSERT INTO {table} ({column}, shard, delta) SELECT item_id, %(shard)s, 1 FROM {source} "
+                f"ON CONFLICT ({column}, shard) DO UPDATE SET delta = {table}.delta + EXCLUDED.delta",
+                {'shard': random.randrange(settings.REGISTRATION_COUNTER_SHARDS)},
+            )
+        table = self.item_model._meta.db_table
+        return (
+            f"UPDATE {table} AS i SET registrations_count = i.registrations_count + 1 "
+            f"FROM {source} WHERE i.id = {source}.item_id",
+            {},
+        )
+
+    def rollup(self, item_ids=None):
+        """샤드 행을 삭제하면서 합계를 부모 행에 더하고, 값이 바뀐 항목 id 목록을 돌려준다."""
+        table = self.shard_model._meta.db_table
+        item_table = self.item_model._meta.db_table
+        column = f'{self.item_field}_id'
+        where, params = '', []
+        if item_ids is not None:
+            where, params = f'WHERE {column} = ANY(%s)', [list(item_ids)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH drained AS (
+                    DELETE FROM {table} {where}
+                    RETURNING {column} AS item_id, delta
+                ), summed AS (
+                    SELECT item_id, SUM(delta) AS delta FROM drained GROUP BY item_id
+                )
+                UPDATE {item_table} AS i
+                SET registrations_count = i.registrations_count + summed.delta
+                FROM summed
+                WHERE i.id = summed.item_id AND summed.delta <> 0
+                RETURNING i.id
+                """,
+                params,
+            )
+            updated_ids = [row[0] for row in cursor.fetchall()]
+        for item_id in updated_ids:
+            invalidate_item_counts(self.resource, item_id)
+        return updated_ids
+
+    def drain(self, batch_size=1000):
+        """delta 행을 한 배치 꺼내 항목별 합계를 UPDATE ... FROM (VALUES ...) 한 번으로 반영한다.
+
+        (값이 바뀐 항목 id 목록, 처리한 delta 행 수)를 돌려준다. SKIP LOCKED 라 워커를 여러 개 띄워도 된다.
+        """
+        table = self.delta_model._meta.db_table
+        column = f'{self.item_field}_id'
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, {column}, delta FROM {table} ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED",
+                [batch_size],
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return [], 0
+
+            sums = defaultdict(int)
+            for _, item_id, delta in rows:
+                sums[item_id] += delta
+            changed = [(item_id, delta) for item_id, delta in sums.items() if delta]
+            if changed:
+                self._update_items(cursor, changed)
+            cursor.execute(f"DELETE FROM {table} WHERE id = ANY(%s)", [[row[0] for row in rows]])
+            for item_id, _ in changed:
+                invalidate_item_counts(self.resource, item_id)
+        return [item_id for item_id, _ in changed], len(rows)
+
+    def _update_items(self, cursor, changed):
+        # 워커/요청끼리 같은 순서로 행 락을 잡도록 id 순으로 정렬한다.
+        changed = sorted(changed)
+        values = ', '.join(['(%s, %s)'] * len(changed))
+        cursor.execute(
+            f"""
+            UPDATE {self.item_model._meta.db_table} AS i
+            SET registrations_count = i.registrations_count + v.delta
+            FROM (VALUES {values}) AS v(id, delta)
+            WHERE i.id = v.id
+            """,
+            [value for pair in changed for value in pair],
+        )
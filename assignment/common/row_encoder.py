@@ -0,0 +1,66 @@
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.fields import CharField, DateTimeField, IntegerField, SerializerMethodField
+from rest_framework.settings import api_settings
+
+
+class RowEncoder:
+    """serializer 필드 정의로부터 values_list(named=True) 행 → dict 변환기를 미리 만들어 둔다.
+
+    모델 인스턴스 생성과 필드별 get_attribute 를 건너뛰고, 값 변환은 각 필드의
+    to_representation 과 같은 규칙을 쓰므로 serializer 출력과 같은 JSON 을 만든다.
+    행에 없는 필드(is_registered 처럼 나중에 덧씌우는 값)는 serializer 의 SkipField 처럼 생략한다.
+    """
+
+    def __init__(self, serializer_class, row_fields):
+        serializer = serializer_class()
+        self.row_fields = tuple(row_fields)
+        self.columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, SerializerMethodField):
+                self.columns.append((name, None, getattr(serializer, field.method_name)))
+            elif field.source in self.row_fields:
+                self.columns.append((name, self.row_fields.index(field.source), self._compile(field)))
+
+    def _compile(self, field):
+        if isinstance(field, IntegerField):
+            return int
+        if isinstance(field, CharField):
+            return str
+        if isinstance(field, DateTimeField) and self._is_default_iso_datetime(field):
+            return self._encode_datetime
+        return field.to_representation
+
+    @staticmethod
+    def _is_default_iso_datetime(field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return (
+            output_format is not None
+            and output_format.lower() == ISO_8601
+            and not hasattr(field, 'timezone')
+        )
+
+    @staticmethod
+    def _encode_datetime(value):
+        # DateTimeField.to_representation 의 ISO 8601 분기와 같은 규칙 (현재 timezone 기준, +00:00 → Z)
+        if value.tzinfo is None:
+            return DateTimeField().to_representation(value)
+        value = value.astimezone(timezone.get_current_timezone()).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def encode(self, row):
+        data = {}
+        for name, index, convert in self.columns:
+            if index is None:
+                data[name] = convert(row)
+                continue
+            value = row[index]
+            data[name] = None if value is None else convert(value)
+        return data
+
+    def encode_many(self, rows):
+        return [self.encode(row) for row in rows]
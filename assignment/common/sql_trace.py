@@ -0,0 +1,127 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+
+from assignment.common.query_budget import wrap_connections
+
+
+class SqlTrace:
+    """샘플로 뽑힌 요청 하나의 SQL 과 쿼리별 소요 시간을 모은다. (파라미터는 개인정보가 섞일 수 있어 남기지 않는다)"""
+
+    def __init__(self, max_queries):
+        self.max_queries = max_queries
+        self.queries = []
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if len(self.queries) < self.max_queries:
+                self.queries.append({'sql': sql, 'ms': round(elapsed * 1000, 3)})
+
+    def to_dict(self, request, response, started_at, elapsed):
+        return {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'started_at': started_at.isoformat(),
+            'duration_ms': round(elapsed * 1000, 2),
+            'db_ms': round(self.duration * 1000, 2),
+            'query_count': self.count,
+            'truncated': self.count - len(self.queries),
+            'queries': self.queries,
+        }
+
+
+class SqlTraceBuffer:
+    """워커 프로세스의 최근 샘플 요청 trace 를 SQL_TRACE_BUFFER_SIZE 개까지 보관하는 ring buffer."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._traces = None
+
+    def _deque(self):
+        if self._traces is None:
+            self._traces = deque(maxlen=settings.SQL_TRACE_BUFFER_SIZE)
+        return self._traces
+
+    def append(self, trace):
+        with self._lock:
+            self._deque().append(trace)
+
+    def snapshot(self, limit=None):
+        """최근 것부터 limit 개."""
+        with self._lock:
+            traces = list(self._deque())
+        traces.reverse()
+        return traces[:limit] if limit else traces
+
+    def clear(self):
+        with self._lock:
+            self._deque().clear()
+
+
+trace_buffer = SqlTraceBuffer()
+
+
+def get_sql_traces(limit=None):
+    return {
+        'pid': os.getpid(),
+        'sample_rate': settings.SQL_TRACE_SAMPLE_RATE,
+        'traces': trace_buffer.snapshot(limit),
+    }
+
+
+class SqlTraceMiddleware:
+    """SQL_TRACE_SAMPLE_RATE 요청 중 1개만 wrap_connections 로 SQL 과 소요 시간을 trace_buffer 에 남긴다.
+
+    wrap_connections 는 요청 context 를 보고 기록하므로 ASGI 에서 executor 스레드가 실행한 쿼리도 남는다.
+
+    나머지 요청은 카운터 증가 한 번만 하므로 쿼리마다 로그를 쓰는 DEBUG SQL 로그 대신 운영에서 켜 둘 수 있다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._requests = itertools.count(1)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        rate = settings.SQL_TRACE_SAMPLE_RATE
+        return rate > 0 and next(self._requests) % rate == 0
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        trace = SqlTrace(settings.SQL_TRACE_MAX_QUERIES)
+        started_at, started = timezone.now(), time.perf_counter()
+        with wrap_connections(trace):
+            response = self.get_response(request)
+        trace_buffer.append(trace.to_dict(request, response, started_at, time.perf_counter() - started))
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        trace = SqlTrace(settings.SQL_TRACE_MAX_QUERIES)
+        started_at, started = timezone.now(), time.perf_counter()
+        with wrap_connections(trace):
+            response = await self.get_response(request)
+        trace_buffer.append(trace.to_dict(request, response, started_at, time.perf_counter() - started))
+        return response
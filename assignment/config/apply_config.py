@@ -0,0 +1,4 @@
+import os
+
+# 신청(enroll/apply)을 검증 + 신청 INSERT + 카운터 + 결제 INSERT 단일 CTE 한 번으로 처리
+REGISTRATION_APPLY_FAST_PATH = os.environ.get("REGISTRATION_APPLY_FAST_PATH", "false").lower() == "true"
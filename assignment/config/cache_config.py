@@ -0,0 +1,35 @@
+import os
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+LIST_CACHE_ENABLED = os.environ.get("LIST_CACHE_ENABLED", "true").lower() == "true"
+LIST_CACHE_TIMEOUT = int(os.environ.get("LIST_CACHE_TIMEOUT", "30"))
+
+if REDIS_URL:
+    # gunicorn 워커가 여러 개여도 캐시/무효화 버전을 공유하도록 Redis 를 사용한다.
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "default",
+        },
+        "list": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "list",
+            "TIMEOUT": LIST_CACHE_TIMEOUT,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "default",
+        },
+        "list": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "list",
+            "TIMEOUT": LIST_CACHE_TIMEOUT,
+            "OPTIONS": {"MAX_ENTRIES": 10_000},
+        },
+    }
@@ -0,0 +1,9 @@
+import os
+
+# sync   : 신청/취소 시 courses/tests 행의 registrations_count 를 바로 갱신
+# sharded: 샤드 테이블에 증감만 기록하고 rollup_registration_counts 커맨드가 주기적으로 합산
+# outbox : delta 행을 INSERT 만 하고 rollup_registration_counts 커맨드가 배치 단위로 합산
+REGISTRATION_COUNTER_MODE = os.environ.get("REGISTRATION_COUNTER_MODE", "sync").lower()
+REGISTRATION_COUNTER_SHARDS = int(os.environ.get("REGISTRATION_COUNTER_SHARDS", "16"))
+REGISTRATION_COUNTER_ROLLUP_INTERVAL = float(os.environ.get("REGISTRATION_COUNTER_ROLLUP_INTERVAL", "5"))
+REGISTRATION_COUNTER_DRAIN_BATCH_SIZE = int(os.environ.get("REGISTRATION_COUNTER_DRAIN_BATCH_SIZE", "1000"))
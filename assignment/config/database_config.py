@@ -1,5 +1,39 @@
+import importlib.util
 import os
 
+# 영구 연결 유지 시간(초). 연결 풀을 쓰지 않을 때만 적용된다.
+# ASGI 배포는 요청마다 다른 스레드에서 연결을 열기 때문에 풀 없이 쓸 때는 0 으로 둔다.
+CONN_MAX_AGE = int(os.environ.get("POSTGRES_CONN_MAX_AGE", "600"))
+
+# psycopg3 연결 풀 (워커 프로세스마다 하나). psycopg / psycopg_pool 이 없으면 CONN_MAX_AGE 영구 연결로 동작한다.
+POSTGRES_POOL = (
+    os.environ.get("POSTGRES_POOL", "true").lower() == "true"
+    and importlib.util.find_spec("psycopg") is not None
+    and importlib.util.find_spec("psycopg_pool") is not None
+)
+# 워커당 최소/최대 연결 수. 전체 backend 연결 수 상한은 워커 수 × POSTGRES_POOL_MAX_SIZE 이다.
+POSTGRES_POOL_MIN_SIZE = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "2"))
+POSTGRES_POOL_MAX_SIZE = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "4"))
+# 풀에서 연결을 기다리는 최대 시간(초)과 대기 요청 수 상한(0 이면 무제한). 넘으면 OperationalError.
+POSTGRES_POOL_TIMEOUT = float(os.environ.get("POSTGRES_POOL_TIMEOUT", "10"))
+POSTGRES_POOL_MAX_WAITING = int(os.environ.get("POSTGRES_POOL_MAX_WAITING", "0"))
+# 쓰지 않는 연결을 닫는 시간과 연결을 새로 맺는 주기(초)
+POSTGRES_POOL_MAX_IDLE = float(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300"))
+POSTGRES_POOL_MAX_LIFETIME = float(os.environ.get("POSTGRES_POOL_MAX_LIFETIME", "1800"))
+# 연결을 꺼낼 때(풀) 또는 요청 시작 시(영구 연결) 끊긴 연결인지 확인한다.
+CONN_HEALTH_CHECKS = os.environ.get("POSTGRES_CONN_HEALTH_CHECKS", "true").lower() == "true"
+
+OPTIONS = {}
+if POSTGRES_POOL:
+    OPTIONS["pool"] = {
+        "min_size": POSTGRES_POOL_MIN_SIZE,
+        "max_size": POSTGRES_POOL_MAX_SIZE,
+        "timeout": POSTGRES_POOL_TIMEOUT,
+        "max_waiting": POSTGRES_POOL_MAX_WAITING,
+        "max_idle": POSTGRES_POOL_MAX_IDLE,
+        "max_lifetime": POSTGRES_POOL_MAX_LIFETIME,
+    }
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -8,6 +42,9 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "1234"),
         "HOST": os.environ.get("POSTGRES_HOST", "db"),
         "PORT": int(os.environ.get("POSTGRES_PORT", "5432")),
-        "CONN_MAX_AGE": 600,
+        # 풀은 요청이 끝나면 연결을 풀에 돌려주므로 영구 연결을 함께 쓸 수 없다.
+        "CONN_MAX_AGE": 0 if POSTGRES_POOL else CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": CONN_HEALTH_CHECKS,
+        "OPTIONS": OPTIONS,
     }
-}
\ No newline at end of file
+}
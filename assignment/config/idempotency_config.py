@@ -0,0 +1,8 @@
+import os
+
+# Idempotency-Key 로 저장한 응답 보관 기간(초). 지난 키는 sweep_idempotency_keys 로 삭제
+IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+# 워커 프로세스별 최근 응답 LRU 크기
+IDEMPOTENCY_LRU_MAX_ENTRIES = int(os.environ.get("IDEMPOTENCY_LRU_MAX_ENTRIES", "10000"))
+# 처리 중(예약)인 키를 끝나지 않은 것으로 보고 다시 예약할 수 있게 되는 시간(초). 워커가 죽어 남은 예약 정리용
+IDEMPOTENCY_PENDING_TIMEOUT = int(os.environ.get("IDEMPOTENCY_PENDING_TIMEOUT", "60"))
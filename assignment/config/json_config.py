@@ -0,0 +1,4 @@
+import os
+
+# API 요청/응답 JSON 인코더: orjson(설치되어 있으면 사용) | stdlib
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson").lower()
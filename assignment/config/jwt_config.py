@@ -1,16 +1,41 @@
+import os
 from datetime import timedelta
 
+# true 면 토큰 클레임으로 사용자를 만들어 요청마다 users 조회를 생략 (false 면 simplejwt 기본 JWTAuthentication)
+JWT_STATELESS_AUTH = os.environ.get("JWT_STATELESS_AUTH", "true").lower() == "true"
+# StatelessJWTAuthentication 의 사용자 활성 상태 캐시 TTL(초)
+JWT_USER_STATE_CACHE_TTL = int(os.environ.get("JWT_USER_STATE_CACHE_TTL", "60"))
+# 블랙리스트 refresh 토큰 bloom filter 용량/오탐률과 재구성 주기(초)
+TOKEN_BLACKLIST_BLOOM_CAPACITY = int(os.environ.get("TOKEN_BLACKLIST_BLOOM_CAPACITY", "1000000"))
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = float(os.environ.get("TOKEN_BLACKLIST_BLOOM_ERROR_RATE", "0.001"))
+TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL = int(os.environ.get("TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL", "3600"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON_BACKEND(orjson | stdlib) 에 따라 인코더를 고르는 renderer/parser
+    "DEFAULT_RENDERER_CLASSES": [
+        "assignment.common.json_renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "assignment.common.json_renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_USER_CLASS": "accounts.authentication.ClaimsUser",
+    # POST /token/refresh 는 사용한 refresh 토큰을 블랙리스트에 넣고 새 refresh 토큰을 발급한다.
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
 }
\ No newline at end of file
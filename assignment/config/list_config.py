@@ -0,0 +1,9 @@
+import os
+
+# 목록 API 를 values_list 행 + 미리 만든 RowEncoder 로 직렬화 (false 면 serializer 인스턴스 경로)
+LIST_VALUES_MODE = os.environ.get("LIST_VALUES_MODE", "true").lower() == "true"
+# true 면 목록 GET 을 AsyncListMixin 의 async view(async ORM)로 라우팅 (ASGI/uvicorn 배포용, WSGI 에서는 false 권장)
+ASYNC_LIST_VIEWS = os.environ.get("ASYNC_LIST_VIEWS", "false").lower() == "true"
+# status=available 기간 조건: btree(start_at/end_at 비교, 기본) | gist(period @> now, 부분 GiST 인덱스)
+# 대부분의 행이 신청 가능한 분포에서는 gist 의 COUNT 가 seq scan 으로 더 느리다. 신청 가능한 행이 적을 때만 gist 권장.
+AVAILABLE_PERIOD_FILTER = os.environ.get("AVAILABLE_PERIOD_FILTER", "btree").lower()
@@ -0,0 +1,14 @@
+import os
+
+# Prometheus 지표 수집 middleware 와 GET /metrics 노출
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+# gunicorn 워커 여러 개의 지표를 합치려면 PROMETHEUS_MULTIPROC_DIR(워커 공용 디렉터리)을 지정한다.
+# prometheus_client 가 import 시점에 직접 읽으므로 여기서는 값만 노출한다.
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+# GET /metrics 를 허용할 클라이언트 대역(REMOTE_ADDR, 쉼표 구분 CIDR). 기본은 같은 호스트에서의 scrape 만 허용한다.
+# X-Forwarded-For 는 클라이언트가 바꿀 수 있으므로 보지 않는다.
+METRICS_ALLOWED_NETWORKS = [
+    network.strip()
+    for network in os.environ.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128").split(",")
+    if network.strip()
+]
@@ -1,15 +1,28 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import DateTimeField, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
-class CustomPagination(LimitOffsetPagination):
+class StrictLimitMixin:
+    limit_query_param = 'limit'
     default_limit = 20
     max_limit = 100
 
     def get_limit(self, request):
         raw = request.query_params.get(self.limit_query_param)
         if raw is None:
-            return super().get_limit(request)
+            return self.default_limit
         try:
             value = int(raw)
         except (TypeError, ValueError):
@@ -19,3 +32,260 @@ class CustomPagination(LimitOffsetPagination):
         if self.max_limit is not None and value > self.max_limit:
             raise ValidationError({self.limit_query_param: f'max_limit({self.max_limit}) 이하만 허용됩니다.'})
         return value
+
+
+class CustomPagination(StrictLimitMixin, LimitOffsetPagination):
+    """limit/offset 페이지네이션. `?count=` 로 COUNT(*) 계산 방식을 고를 수 있다.
+
+    - exact(기본): 매 요청 COUNT(*)
+    - none: count 를 생략하고 limit + 1 건 조회로 next 여부만 판단
+    - estimate: 필터 없는 목록은 pg_class.reltuples 추정치, 필터가 있으면 cached 와 동일
+    - cached: 필터별 COUNT(*) 결과를 count_cache_timeout 초 동안 캐시
+    """
+    count_query_param = 'count'
+    count_modes = ('exact', 'none', 'estimate', 'cached')
+    count_cache_timeout = 30
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode == 'exact':
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        self.count = None if self.count_mode == 'none' else self.get_approximate_count(queryset, view)
+        return rows[:self.limit]
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset 과 같은 페이지를 async ORM 으로 조회한다. (AsyncListMixin 경로 용)"""
+        self.count_mode = self.get_count_mode(request)
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        if self.count_mode == 'exact':
+            # LimitOffsetPagination.paginate_queryset 과 같은 순서로 COUNT 후 페이지를 읽는다.
+            self.count = await queryset.acount()
+            if self.count > self.limit and self.template is not None:
+                self.display_page_controls = True
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return [row async for row in queryset[self.offset:self.offset + self.limit]]
+
+        rows = [row async for row in queryset[self.offset:self.offset + self.limit + 1]]
+        self.has_next = len(rows) > self.limit
+        self.count = None if self.count_mode == 'none' else await self.aget_approximate_count(queryset, view)
+        return rows[:self.limit]
+
+    def get_paginated_response(self, data):
+        if self.count_mode == 'exact':
+            return super().get_paginated_response(data)
+        body = OrderedDict()
+        if self.count is not None:
+            body['count'] = self.count
+        body['next'] = self.get_next_link()
+        body['previous'] = self.get_previous_link()
+        body['results'] = data
+        return Response(body)
+
+    def get_next_link(self):
+        if self.count_mode == 'exact':
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param) or 'exact'
+        if mode not in self.count_modes:
+            raise ValidationError({self.count_query_param: f'허용값: {", ".join(self.count_modes)}'})
+        return mode
+
+    def get_approximate_count(self, queryset, view=None):
+        if self.count_mode == 'estimate' and not queryset.query.where:
+            estimate = self._estimate_table_rows(queryset)
+            if estimate is not None:
+                return estimate
+        return self._get_cached_count(queryset, view)
+
+    async def aget_approximate_count(self, queryset, view=None):
+        if self.count_mode == 'estimate' and not queryset.query.where:
+            estimate = await sync_to_async(self._estimate_table_rows)(queryset)
+            if estimate is not None:
+                return estimate
+        key = self._get_count_cache_key(queryset, view)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, self.count_cache_timeout)
+        return count
+
+    def _estimate_table_rows(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # ANALYZE 전의 테이블은 reltuples 가 -1(또는 0) 이므로 추정치로 쓰지 않는다.
+        if row is None or row[0] <= 0:
+            return None
+        return row[0]
+
+    def _get_cached_count(self, queryset, view=None):
+        key = self._get_count_cache_key(queryset, view)
+        count = cache.get(key)
+        if count is None:
+            count = self.get_count(queryset)
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def _get_count_cache_key(self, queryset, view=None):
+        key_source = getattr(view, 'get_count_cache_key', None)
+        if key_source is not None:
+            return key_source()
+        return 'list-count:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+
+
+class KeysetPagination(StrictLimitMixin, BasePagination):
+    """queryset 의 order_by 컬럼 값을 cursor 로 사용하는 keyset 페이지네이션.
+
+    OFFSET 없이 `WHERE (정렬 컬럼) < (cursor 값)` 으로 다음 페이지를 찾기 때문에
+    페이지 깊이와 무관하게 정렬 인덱스에서 limit 개만 읽는다.
+    """
+    cursor_query_param = 'cursor'
+    offset_query_param = 'offset'
+    invalid_cursor_message = '유효하지 않은 cursor 입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, reverse = self._prepare_page(queryset, request)
+        return self._finish_page(list(queryset[:self.limit + 1]), reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset 의 async ORM 버전. (AsyncListMixin 경로 용)"""
+        queryset, reverse = self._prepare_page(queryset, request)
+        return self._finish_page([row async for row in queryset[:self.limit + 1]], reverse)
+
+    def _prepare_page(self, queryset, request):
+        """cursor 를 해석해 (limit + 1 건을 읽을 queryset, 역방향 여부)를 돌려준다."""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.offset_query_param)
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset)
+
+        reverse, key = self.decode_cursor(request, queryset.model)
+        self.has_cursor = key is not None
+
+        ordering = self._reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if key is not None:
+            queryset = queryset.filter(self._build_keyset_filter(ordering, key))
+        return queryset, reverse
+
+    def _finish_page(self, rows, reverse):
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, queryset):
+        ordering = [str(field) for field in queryset.query.order_by]
+        if not ordering:
+            raise ValueError('KeysetPagination 은 order_by 가 지정된 queryset 이 필요합니다.')
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            # values() 로 조회한 dict 행도 지원한다.
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'r': int(reverse), 'v': values}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return False, None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values = payload['v']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            key = [self._parse_value(model, field, value) for field, value in zip(self.ordering, values)]
+            return bool(payload.get('r')), key
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def _parse_value(self, model, field, value):
+        name = field.lstrip('-')
+        model_field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        if isinstance(model_field, DateTimeField):
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+            if parsed is None:
+                raise ValueError
+            return parsed
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError
+        return value
+
+    def _reverse_ordering(self, ordering):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+    def _build_keyset_filter(self, ordering, key):
+        # (a, b, c) < (A, B, C) 를 a < A OR (a = A AND b < B) OR ... 로 풀어 쓴다.
+        # 선두 컬럼 범위 조건(a <= A)을 함께 걸어 인덱스 range scan 이 가능하게 한다.
+        names = [field.lstrip('-') for field in ordering]
+        ops = ['lt' if field.startswith('-') else 'gt' for field in ordering]
+
+        condition = Q()
+        for i, (name, op) in enumerate(zip(names, ops)):
+            branch = Q(**{names[j]: key[j] for j in range(i)}) & Q(**{f'{name}__{op}': key[i]})
+            condition |= branch
+        return Q(**{f'{names[0]}__{ops[0]}e': key[0]}) & condition
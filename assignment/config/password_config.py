@@ -0,0 +1,28 @@
+import importlib.util
+import os
+
+# 새 비밀번호 해시 알고리즘: argon2(기본, argon2-cffi 없으면 scrypt) | scrypt | pbkdf2
+# 다른 알고리즘의 기존 해시도 검증되며, 로그인 성공 시 선택한 알고리즘/비용으로 다시 해시한다.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "argon2").lower()
+if PASSWORD_HASHER == "argon2" and importlib.util.find_spec("argon2") is None:
+    PASSWORD_HASHER = "scrypt"
+
+_HASHERS = {
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "pbkdf2": "accounts.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [_HASHERS[PASSWORD_HASHER]] + [path for name, path in _HASHERS.items() if name != PASSWORD_HASHER]
+
+# 해시 비용. 기본값은 OWASP 권장 최소치 (argon2id m=19MiB t=2 p=1 / scrypt N=2^14 r=8 p=5)
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "19456"))  # KiB
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "1"))
+SCRYPT_WORK_FACTOR = int(os.environ.get("SCRYPT_WORK_FACTOR", str(2 ** 14)))
+SCRYPT_BLOCK_SIZE = int(os.environ.get("SCRYPT_BLOCK_SIZE", "8"))
+SCRYPT_PARALLELISM = int(os.environ.get("SCRYPT_PARALLELISM", "5"))
+PBKDF2_ITERATIONS = int(os.environ.get("PBKDF2_ITERATIONS", "870000"))
+
+# 워커 프로세스별 동시 해시 실행 상한(전용 스레드 수)과 대기 가능한 요청 수. 넘치면 회원가입/로그인은 503 으로 바로 거절한다.
+PASSWORD_HASHING_MAX_WORKERS = int(os.environ.get("PASSWORD_HASHING_MAX_WORKERS", "1"))
+PASSWORD_HASHING_MAX_WAITING = int(os.environ.get("PASSWORD_HASHING_MAX_WAITING", "4"))
@@ -0,0 +1,18 @@
+import os
+
+# 실행 프로필 (development | production). docker-compose 의 gunicorn 서버는 production 으로 뜬다.
+DJANGO_PROFILE = os.environ.get("DJANGO_PROFILE", "development").lower()
+PRODUCTION = DJANGO_PROFILE == "production"
+
+# DEBUG 면 모든 쿼리가 connection.queries 에 쌓이고 django.db.backends 로그로 포맷된다.
+DEBUG = os.environ.get("DJANGO_DEBUG", "false" if PRODUCTION else "true").lower() == "true"
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1,[::1],server,server-asgi").split(",")
+    if host.strip()
+]
+
+# 쿼리마다 SQL 을 콘솔에 찍는 django.db.backends DEBUG 로그 (개발용). production 에서는 SQL_TRACE 샘플링으로 대신한다.
+SQL_CONSOLE_LOG = os.environ.get("SQL_CONSOLE_LOG", "false" if PRODUCTION else "true").lower() == "true"
+# QueryBudgetMiddleware 요청별 집계 로그 레벨. production 은 상한 초과/N+1 의심(WARNING)만 남긴다.
+QUERY_BUDGET_LOG_LEVEL = os.environ.get("QUERY_BUDGET_LOG_LEVEL", "WARNING" if PRODUCTION else "INFO").upper()
@@ -0,0 +1,10 @@
+import os
+
+# 요청당 쿼리 수 / DB 시간 / 중복 SQL 집계 미들웨어 (QueryBudgetMiddleware)
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "true").lower() == "true"
+# 집계 결과를 Server-Timing 응답 헤더로 내보낼지 여부
+QUERY_BUDGET_SERVER_TIMING = os.environ.get("QUERY_BUDGET_SERVER_TIMING", "true").lower() == "true"
+# true 면 상한 초과/N+1 의심 요청에서 QueryBudgetExceeded 를 발생시킨다. (테스트 러너가 켠다)
+QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "false").lower() == "true"
+# 같은 모양의 SQL 이 이 횟수 이상 실행되면 N+1 로 본다.
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get("QUERY_N_PLUS_ONE_THRESHOLD", "3"))
@@ -0,0 +1,8 @@
+import os
+
+# N 요청 중 1개의 SQL/소요 시간을 워커 메모리 ring buffer 에 남긴다. (0 이면 끔)
+SQL_TRACE_SAMPLE_RATE = int(os.environ.get("SQL_TRACE_SAMPLE_RATE", "100"))
+# 워커마다 보관할 최근 샘플 요청 수
+SQL_TRACE_BUFFER_SIZE = int(os.environ.get("SQL_TRACE_BUFFER_SIZE", "200"))
+# 샘플 요청 하나에서 SQL 을 남길 최대 쿼리 수 (넘는 쿼리는 개수/시간만 합산)
+SQL_TRACE_MAX_QUERIES = int(os.environ.get("SQL_TRACE_MAX_QUERIES", "100"))
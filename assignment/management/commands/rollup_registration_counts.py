@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.models import course_registration_counter
+from tests.models import test_registration_counter
+
+
+class Command(BaseCommand):
+    help = "샤드/outbox 에 쌓인 신청 수 증감을 courses/tests 의 registrations_count 에 반영합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 주기적으로 반영')
+        parser.add_argument('--interval', type=float, default=settings.REGISTRATION_COUNTER_ROLLUP_INTERVAL)
+        parser.add_argument('--batch-size', type=int, default=settings.REGISTRATION_COUNTER_DRAIN_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        # 모드를 바꾼 직후에도 남은 증감이 유실되지 않도록 샤드와 outbox 를 모두 비운다.
+        while True:
+            for counter in (course_registration_counter, test_registration_counter):
+                with transaction.atomic():
+                    updated_ids = set(counter.rollup())
+                while True:
+                    drained_ids, drained_rows = counter.drain(options['batch_size'])
+                    updated_ids.update(drained_ids)
+                    if drained_rows < options['batch_size']:
+                        break
+                if updated_ids:
+                    self.stdout.write(f"{counter.resource}: {len(updated_ids)}건 반영")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,139 @@
+import logging
+import os
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from assignment.benchmarks.dataset import DEFAULT_SIZES, is_seeded, seed_dataset
+from assignment.benchmarks.micro import MICRO_BENCHMARKS, run_micro
+from assignment.benchmarks.report import compare, load_report, write_report
+from assignment.benchmarks.scenarios import build_scenarios
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / 'benchmarks' / 'baseline.json'
+# 결과에 함께 남겨 baseline 과 측정 조건이 같은지 확인할 설정
+RECORDED_SETTINGS = (
+    'REGISTRATION_APPLY_FAST_PATH', 'REGISTRATION_COUNTER_MODE', 'LIST_VALUES_MODE', 'JSON_BACKEND',
+    'METRICS_ENABLED', 'SQL_TRACE_SAMPLE_RATE',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "벤치마크 전용 DB 에 고정 seed 데이터를 만들고 주요 API 의 p50/p95/p99 와 요청당 쿼리 수를 측정해 "
+        "JSON 으로 남기고 baseline 과 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=DEFAULT_SIZES['users'])
+        parser.add_argument('--courses', type=int, default=DEFAULT_SIZES['courses'])
+        parser.add_argument('--tests', type=int, default=DEFAULT_SIZES['tests'])
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--micro-rounds', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=20, help='목록 페이지 크기')
+        parser.add_argument('--deep-offset', type=int, help='깊은 offset (기본: 수업/시험 수의 80%%)')
+        parser.add_argument('--only', nargs='+', default=[], help='이름에 이 문자열이 들어간 시나리오만')
+        parser.add_argument('--list-cache', action='store_true', help='목록 응답 캐시를 켠 채로 측정 (기본은 DB 경로 측정)')
+        parser.add_argument('--database-name', default='bench_assignment_db')
+        parser.add_argument('--keepdb', action='store_true', help='벤치마크 DB 를 지우지 않고 다음 실행에서 재사용')
+        parser.add_argument('--output', default='bench_results.json')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--update-baseline', action='store_true', help='이번 결과를 baseline 으로 저장')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='p50 회귀로 볼 증가 비율')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0, help='이보다 작은 p50 차이(ms)는 잡음으로 본다')
+        parser.add_argument('--fail-on-regression', action='store_true', help='회귀가 있으면 0 이 아닌 코드로 종료')
+
+    def handle(self, *args, **options):
+        # 요청마다 남는 쿼리 예산 INFO 로그는 결과 출력을 가리므로 상한 초과(WARNING)만 남긴다.
+        logging.getLogger('assignment.query_budget').setLevel(logging.WARNING)
+        # 운영/개발 DB 를 건드리지 않도록 테스트 러너와 같은 방식으로 별도 DB 를 만든다.
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = options['database_name']
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'], serialize=False)
+        try:
+            report = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        write_report(options['output'], report)
+        self.stdout.write(f"결과 저장: {options['output']}")
+        if options['update_baseline']:
+            write_report(options['baseline'], report)
+            self.stdout.write(f"baseline 갱신: {options['baseline']}")
+            return
+        self.compare_with_baseline(report, options)
+
+    def run(self, options):
+        if options['keepdb'] and is_seeded(options['courses']):
+            self.stdout.write('기존 벤치마크 DB 재사용 (seed 생략)')
+        else:
+            self.stdout.write(f"seed: users={options['users']} courses={options['courses']} tests={options['tests']}")
+            seed_dataset(options['users'], options['courses'], options['tests'], options['seed'])
+
+        limit = options['limit']
+        deep_offset = options['deep_offset']
+        if deep_offset is None:
+            deep_offset = int(min(options['courses'], options['tests']) * 0.8) // limit * limit
+
+        results = {}
+        # 테스트 러너처럼 DEBUG 를 꺼서 connection.queries 적재와 SQL 콘솔 로그를 측정에서 뺀다.
+        with override_settings(DEBUG=False, LIST_CACHE_ENABLED=options['list_cache']):
+            for name in caches:
+                caches[name].clear()
+            for scenario in build_scenarios(limit, deep_offset):
+                if self.selected(scenario.name, options):
+                    results[scenario.name] = self.report_line(scenario.name, scenario.measure(options['iterations'], options['warmup']))
+            for name, setup in MICRO_BENCHMARKS.items():
+                if self.selected(name, options):
+                    results[name] = self.report_line(name, run_micro(setup, options['micro_rounds']))
+
+        return {
+            'meta': {
+                'dataset': {key: options[key] for key in ('users', 'courses', 'tests', 'seed')},
+                'iterations': options['iterations'],
+                'limit': limit,
+                'deep_offset': deep_offset,
+                'list_cache': options['list_cache'],
+                'settings': {key: getattr(settings, key, None) for key in RECORDED_SETTINGS},
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'cpus': os.cpu_count(),
+            },
+            'results': results,
+        }
+
+    @staticmethod
+    def selected(name, options):
+        return not options['only'] or any(part in name for part in options['only'])
+
+    def report_line(self, name, result):
+        queries = f" queries={result['queries']:2d}" if 'queries' in result else ''
+        self.stdout.write(
+            f"  {name:<42} p50={result['p50']:9.3f}{result['unit']} p95={result['p95']:9.3f}{result['unit']} "
+            f"p99={result['p99']:9.3f}{result['unit']}{queries}"
+        )
+        return result
+
+    def compare_with_baseline(self, report, options):
+        if not os.path.exists(options['baseline']):
+            self.stdout.write('baseline 이 없어 비교를 건너뜁니다. (--update-baseline 으로 생성)')
+            return
+        baseline = load_report(options['baseline'])
+        for key in ('dataset', 'iterations', 'limit', 'list_cache', 'settings'):
+            if baseline['meta'].get(key) != report['meta'].get(key):
+                self.stdout.write(self.style.WARNING(f"baseline 과 측정 조건이 다릅니다: {key}"))
+        regressions = compare(report['results'], baseline['results'], options['tolerance'], options['min_delta_ms'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('baseline 대비 회귀 없음'))
+            return
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(f'회귀: {line}'))
+        if options['fail_on_regression']:
+            raise CommandError(f'baseline 대비 회귀 {len(regressions)}건')
@@ -14,6 +14,17 @@ from pathlib import Path
 import os
 from assignment.config import database_config
 from assignment.config import jwt_config
+from assignment.config import cache_config
+from assignment.config import counter_config
+from assignment.config import apply_config
+from assignment.config import idempotency_config
+from assignment.config import list_config
+from assignment.config import json_config
+from assignment.config import password_config
+from assignment.config import query_budget_config
+from assignment.config import profile_config
+from assignment.config import sql_trace_config
+from assignment.config import metrics_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,9 +37,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-=8(roaxif%pqqbgpdszdx9sxm$x5mt(s^0^slhnduht^0sup$s'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# 실행 프로필(DJANGO_PROFILE=development|production)에 따라 DEBUG / SQL 콘솔 로그가 정해진다.
+DEBUG = profile_config.DEBUG
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = profile_config.ALLOWED_HOSTS
 
 
 # Application definition
@@ -41,14 +53,17 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # third party
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "django_filters",
     "drf_spectacular",
 
     # my apps
+    "assignment",
     "accounts",
     "courses",
     "payments",
@@ -65,6 +80,15 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+if query_budget_config.QUERY_BUDGET_ENABLED:
+    # 요청당 쿼리 수 / DB 시간 / 중복 SQL 집계 (Server-Timing 헤더, assignment.query_budget 로그)
+    MIDDLEWARE.insert(0, 'assignment.common.query_budget.QueryBudgetMiddleware')
+if sql_trace_config.SQL_TRACE_SAMPLE_RATE > 0:
+    # N 요청 중 1개의 SQL / 소요 시간을 워커 메모리에 보관 (GET /internal/sql-trace)
+    MIDDLEWARE.insert(0, 'assignment.common.sql_trace.SqlTraceMiddleware')
+if metrics_config.METRICS_ENABLED:
+    # route 별 처리 시간 / DB 시간 / 응답 크기 Prometheus histogram (GET /metrics, 가장 바깥에서 측정)
+    MIDDLEWARE.insert(0, 'assignment.common.metrics.MetricsMiddleware')
 
 ROOT_URLCONF = 'assignment.urls'
 
@@ -91,6 +115,67 @@ WSGI_APPLICATION = 'assignment.wsgi.application'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 DATABASES = database_config.DATABASES
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+CACHES = cache_config.CACHES
+REDIS_URL = cache_config.REDIS_URL
+
+# GET /courses, GET /tests 목록 응답 캐시
+LIST_CACHE_ENABLED = cache_config.LIST_CACHE_ENABLED
+LIST_CACHE_TIMEOUT = cache_config.LIST_CACHE_TIMEOUT
+
+# 수업/시험 registrations_count 갱신 방식 (sync | sharded | outbox)
+REGISTRATION_COUNTER_MODE = counter_config.REGISTRATION_COUNTER_MODE
+REGISTRATION_COUNTER_SHARDS = counter_config.REGISTRATION_COUNTER_SHARDS
+REGISTRATION_COUNTER_ROLLUP_INTERVAL = counter_config.REGISTRATION_COUNTER_ROLLUP_INTERVAL
+REGISTRATION_COUNTER_DRAIN_BATCH_SIZE = counter_config.REGISTRATION_COUNTER_DRAIN_BATCH_SIZE
+
+# 수업/시험 신청 단일 쿼리 fast path
+REGISTRATION_APPLY_FAST_PATH = apply_config.REGISTRATION_APPLY_FAST_PATH
+
+# 신청/취소 Idempotency-Key 재요청 응답 저장
+IDEMPOTENCY_KEY_TTL = idempotency_config.IDEMPOTENCY_KEY_TTL
+IDEMPOTENCY_LRU_MAX_ENTRIES = idempotency_config.IDEMPOTENCY_LRU_MAX_ENTRIES
+IDEMPOTENCY_PENDING_TIMEOUT = idempotency_config.IDEMPOTENCY_PENDING_TIMEOUT
+
+# 목록 API values_list + RowEncoder 직렬화
+LIST_VALUES_MODE = list_config.LIST_VALUES_MODE
+# 목록 GET 을 async view 로 라우팅 (ASGI 배포용)
+ASYNC_LIST_VIEWS = list_config.ASYNC_LIST_VIEWS
+# status=available 기간 조건 방식 (btree | gist)
+AVAILABLE_PERIOD_FILTER = list_config.AVAILABLE_PERIOD_FILTER
+
+# 요청당 쿼리 상한 / N+1 감지 (테스트는 QueryBudgetTestRunner 가 strict 모드로 실행)
+QUERY_BUDGET_SERVER_TIMING = query_budget_config.QUERY_BUDGET_SERVER_TIMING
+QUERY_BUDGET_STRICT = query_budget_config.QUERY_BUDGET_STRICT
+QUERY_N_PLUS_ONE_THRESHOLD = query_budget_config.QUERY_N_PLUS_ONE_THRESHOLD
+TEST_RUNNER = 'assignment.test_runner.QueryBudgetTestRunner'
+
+# 샘플링 SQL trace (DEBUG SQL 콘솔 로그 대신 운영에서 사용)
+SQL_TRACE_SAMPLE_RATE = sql_trace_config.SQL_TRACE_SAMPLE_RATE
+SQL_TRACE_BUFFER_SIZE = sql_trace_config.SQL_TRACE_BUFFER_SIZE
+SQL_TRACE_MAX_QUERIES = sql_trace_config.SQL_TRACE_MAX_QUERIES
+
+# Prometheus 지표 (PROMETHEUS_MULTIPROC_DIR 가 있으면 gunicorn 워커 지표를 합쳐서 노출)
+METRICS_ENABLED = metrics_config.METRICS_ENABLED
+PROMETHEUS_MULTIPROC_DIR = metrics_config.PROMETHEUS_MULTIPROC_DIR
+METRICS_ALLOWED_NETWORKS = metrics_config.METRICS_ALLOWED_NETWORKS
+
+# API JSON renderer/parser backend (orjson | stdlib)
+JSON_BACKEND = json_config.JSON_BACKEND
+
+# 비밀번호 해시 알고리즘/비용과 해시 전용 스레드 풀
+PASSWORD_HASHERS = password_config.PASSWORD_HASHERS
+ARGON2_TIME_COST = password_config.ARGON2_TIME_COST
+ARGON2_MEMORY_COST = password_config.ARGON2_MEMORY_COST
+ARGON2_PARALLELISM = password_config.ARGON2_PARALLELISM
+SCRYPT_WORK_FACTOR = password_config.SCRYPT_WORK_FACTOR
+SCRYPT_BLOCK_SIZE = password_config.SCRYPT_BLOCK_SIZE
+SCRYPT_PARALLELISM = password_config.SCRYPT_PARALLELISM
+PBKDF2_ITERATIONS = password_config.PBKDF2_ITERATIONS
+PASSWORD_HASHING_MAX_WORKERS = password_config.PASSWORD_HASHING_MAX_WORKERS
+PASSWORD_HASHING_MAX_WAITING = password_config.PASSWORD_HASHING_MAX_WAITING
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -139,6 +224,12 @@ AUTH_USER_MODEL = 'accounts.User'
 REST_FRAMEWORK = jwt_config.REST_FRAMEWORK
 
 SIMPLE_JWT = jwt_config.SIMPLE_JWT
+# StatelessJWTAuthentication 사용자 활성 상태 캐시 TTL
+JWT_USER_STATE_CACHE_TTL = jwt_config.JWT_USER_STATE_CACHE_TTL
+# 블랙리스트 refresh 토큰 bloom filter
+TOKEN_BLACKLIST_BLOOM_CAPACITY = jwt_config.TOKEN_BLACKLIST_BLOOM_CAPACITY
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = jwt_config.TOKEN_BLACKLIST_BLOOM_ERROR_RATE
+TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL = jwt_config.TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL
 
 # drf-spectacular 설정
 SPECTACULAR_SETTINGS = {
@@ -176,9 +267,15 @@ LOGGING = {
         "console": {"class": "logging.StreamHandler"},
     },
     "loggers": {
-        "django.db.backends": { 
+        "assignment.query_budget": {
             "handlers": ["console"],
-            "level": "DEBUG",
+            "level": profile_config.QUERY_BUDGET_LOG_LEVEL,
         },
     },
-}
\ No newline at end of file
+}
+if profile_config.SQL_CONSOLE_LOG:
+    # 모든 쿼리를 콘솔에 동기로 찍는다. (개발용, DEBUG 일 때만 출력됨)
+    LOGGING["loggers"]["django.db.backends"] = {
+        "handlers": ["console"],
+        "level": "DEBUG",
+    }
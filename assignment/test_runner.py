@@ -0,0 +1,17 @@
+import logging
+import os
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """QUERY_BUDGET_STRICT 를 켜고 테스트를 돌려 쿼리 상한 초과/N+1 의심 요청이 있는 테스트를 실패시킨다.
+
+    환경 변수 QUERY_BUDGET_STRICT=false 로 끌 수 있다. 요청마다 남는 INFO 집계 로그는 테스트 출력에서 뺀다.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "true").lower() == "true"
+        logging.getLogger("assignment.query_budget").setLevel(logging.WARNING)
@@ -0,0 +1,392 @@
+import contextvars
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.viewsets import GenericViewSet
+
+from assignment.benchmarks.dataset import seed_dataset
+from assignment.benchmarks.micro import MICRO_BENCHMARKS, run_micro
+from assignment.benchmarks.report import compare, summarize
+from assignment.benchmarks.scenarios import build_scenarios
+from assignment.common.async_list_mixin import AsyncListMixin
+from assignment.common.db_pool import POOL_STAT_KEYS, get_pool_stats
+from assignment.common.metrics import REGISTRY, render_metrics
+from assignment.common.query_budget import (
+    QueryBudgetExceeded, QueryBudgetMiddleware, QueryStats, query_budget, sql_shape, wrap_connections,
+)
+from assignment.common.sql_trace import SqlTraceMiddleware, trace_buffer
+
+User = get_user_model()
+
+
+class StaffLoginMixin:
+    def _login(self, email, is_staff=False):
+        User.objects.create_user(email=email, password="Str0ngP@ss!", is_staff=is_staff)
+        res = self.client.post("/login", {"email": email, "password": "Str0ngP@ss!"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+
+class DBPoolTests(StaffLoginMixin, APITestCase):
+    url = "/internal/db-pool"
+
+    def _query_in_thread(self):
+        def run():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            # 요청이 끝날 때처럼 close() 하면 연결이 풀로 돌아간다.
+            connection.close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+    def test_pool_configured_from_env_settings(self):
+        """
+        psycopg3 풀을 쓰면 영구 연결(CONN_MAX_AGE)은 끄고 min/max/timeout 설정이 풀에 반영된다.
+        """
+        options = settings.DATABASES["default"]["OPTIONS"].get("pool")
+        if not options:
+            self.skipTest("psycopg_pool 미설치")
+        self.assertEqual(settings.DATABASES["default"]["CONN_MAX_AGE"], 0)
+        self.assertTrue(settings.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+        stats = get_pool_stats()
+        self.assertEqual(set(stats), set(POOL_STAT_KEYS))
+        self.assertEqual(stats["pool_min"], options["min_size"])
+        self.assertEqual(stats["pool_max"], options["max_size"])
+        self.assertEqual(connection.pool.timeout, options["timeout"])
+
+    def test_pool_reuses_connections_across_requests(self):
+        """
+        요청(스레드)마다 연결을 새로 맺지 않고 풀의 연결을 돌려 쓴다.
+        """
+        if get_pool_stats() is None:
+            self.skipTest("psycopg_pool 미설치")
+        self._query_in_thread()
+        before = get_pool_stats()
+        for _ in range(3):
+            self._query_in_thread()
+        after = get_pool_stats()
+        self.assertEqual(after["requests_num"] - before["requests_num"], 3)
+        self.assertEqual(after["connections_num"], before["connections_num"])
+
+    def test_pool_stats_endpoint_staff_only(self):
+        """
+        /internal/db-pool 은 staff 만 조회할 수 있고, 워커 pid 와 alias 별 풀 통계를 반환한다.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self._login("member@example.com")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self._login("staff@example.com", is_staff=True)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("pid", res.data)
+        self.assertEqual(res.data["pools"]["default"], get_pool_stats())
+
+
+@query_budget(2)
+def _select_n(n):
+    for i in range(n):
+        User.objects.filter(pk=i).exists()
+
+
+class QueryBudgetTests(APITestCase):
+    def _run(self, view):
+        middleware = QueryBudgetMiddleware(lambda request: view() or HttpResponse())
+        return middleware(RequestFactory().get("/courses"))
+
+    def test_sql_shape_ignores_whitespace_and_in_list_length(self):
+        """
+        공백과 IN 목록 길이가 달라도 같은 SQL 모양으로 본다.
+        """
+        self.assertEqual(
+            sql_shape('SELECT "id"\n  FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            sql_shape('SELECT "id" FROM "t" WHERE "id" IN (%s)'),
+        )
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_server_timing_header_reports_query_count(self):
+        """
+        응답에 요청 동안 실행된 쿼리 수와 중복 수가 Server-Timing 헤더로 붙는다.
+        """
+        res = self._run(lambda: _select_n(2))
+        self.assertRegex(res["Server-Timing"], r'^db;dur=[0-9.]+;desc="2 queries, 1 duplicates"$')
+
+    @override_settings(QUERY_BUDGET_STRICT=False, QUERY_BUDGET_SERVER_TIMING=True)
+    async def test_server_timing_counts_queries_under_asgi(self):
+        """
+        ASGI 에서 view 의 쿼리가 이벤트 루프가 아닌 executor 스레드에서 실행돼도 요청의 쿼리로 집계된다.
+        """
+        await User.objects.acreate(email="asgi@example.com", password=make_password("Str0ngP@ss!"))
+        res = await self.async_client.post(
+            "/login", {"email": "asgi@example.com", "password": "Str0ngP@ss!"}, content_type="application/json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        queries = int(re.search(r'desc="(\d+) queries', res["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+    def test_queries_on_other_thread_connection_counted(self):
+        """
+        요청 context 를 이어받은 다른 스레드가 자기 DB 연결로 실행한 쿼리도 그 요청의 쿼리로 센다.
+        """
+        def query():
+            try:
+                User.objects.filter(pk=1).exists()
+            finally:
+                connections.close_all()
+
+        stats = QueryStats()
+        with wrap_connections(stats):
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+            thread.start()
+            thread.join()
+        User.objects.filter(pk=1).exists()  # with 블록 밖의 쿼리는 세지 않는다.
+        self.assertEqual(stats.count, 1)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_budget_exceeded_fails_in_strict_mode(self):
+        """
+        @query_budget 상한을 넘으면 strict 모드(테스트 러너)에서 QueryBudgetExceeded 가 발생한다.
+        """
+        self._run(lambda: _select_n(2))
+        with self.assertRaisesRegex(QueryBudgetExceeded, r"_select_n 쿼리 상한 2 초과 \(3\)"):
+            self._run(lambda: _select_n(3))
+
+    @override_settings(QUERY_BUDGET_STRICT=False, QUERY_N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_query_shape_logged_as_n_plus_one(self):
+        """
+        같은 모양의 SQL 이 임계값 이상 반복되면 N+1 의심으로 WARNING 을 남긴다. (strict 가 아니면 응답은 그대로)
+        """
+        def view():
+            for i in range(3):
+                User.objects.filter(pk=i).exists()
+
+        with self.assertLogs("assignment.query_budget", level="WARNING") as logs:
+            res = self._run(view)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("N+1", logs.output[0])
+        self.assertIn("queries=3", logs.output[0])
+
+
+class SqlTraceTests(StaffLoginMixin, APITestCase):
+    url = "/internal/sql-trace"
+
+    def setUp(self):
+        trace_buffer.clear()
+
+    def _run(self, middleware, path, queries=1):
+        def view(request):
+            for i in range(queries):
+                User.objects.filter(email=f"secret-{i}@example.com").exists()
+            return HttpResponse()
+
+        middleware.get_response = view
+        return middleware(RequestFactory().get(path))
+
+    @override_settings(SQL_TRACE_SAMPLE_RATE=2)
+    def test_samples_one_in_n_requests_without_params(self):
+        """
+        N 요청 중 1개만 SQL 과 소요 시간을 남기고, 쿼리 파라미터는 남기지 않는다.
+        """
+        middleware = SqlTraceMiddleware(lambda request: HttpResponse())
+        for i in range(4):
+            self._run(middleware, f"/courses?page={i}", queries=2)
+
+        traces = trace_buffer.snapshot()
+        self.assertEqual([t["path"] for t in traces], ["/courses?page=3", "/courses?page=1"])
+        self.assertEqual(traces[0]["query_count"], 2)
+        self.assertEqual(traces[0]["status"], 200)
+        self.assertIn('FROM "users"', traces[0]["queries"][0]["sql"])
+        self.assertGreaterEqual(traces[0]["queries"][0]["ms"], 0)
+        self.assertNotIn("secret-", str(traces))
+
+    @override_settings(SQL_TRACE_SAMPLE_RATE=1, SQL_TRACE_MAX_QUERIES=2)
+    def test_queries_beyond_limit_only_counted(self):
+        """
+        SQL_TRACE_MAX_QUERIES 를 넘는 쿼리는 SQL 없이 개수만 센다.
+        """
+        self._run(SqlTraceMiddleware(lambda request: HttpResponse()), "/courses", queries=3)
+        trace = trace_buffer.snapshot()[0]
+        self.assertEqual(trace["query_count"], 3)
+        self.assertEqual(len(trace["queries"]), 2)
+        self.assertEqual(trace["truncated"], 1)
+
+    @override_settings(SQL_TRACE_SAMPLE_RATE=1)
+    async def test_async_request_traced(self):
+        """
+        ASGI 요청도 executor 스레드에서 실행된 쿼리가 trace 에 남는다.
+        """
+        await User.objects.acreate(email="asgi-trace@example.com", password=make_password("Str0ngP@ss!"))
+        res = await self.async_client.post(
+            "/login", {"email": "asgi-trace@example.com", "password": "Str0ngP@ss!"}, content_type="application/json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        trace = trace_buffer.snapshot()[0]
+        self.assertEqual(trace["path"], "/login")
+        self.assertGreater(trace["query_count"], 0)
+        self.assertIn('FROM "users"', trace["queries"][0]["sql"])
+
+    @override_settings(SQL_TRACE_SAMPLE_RATE=1)
+    def test_trace_endpoint_staff_only(self):
+        """
+        /internal/sql-trace 는 staff 만 조회/비우기 할 수 있고 limit 으로 최근 trace 개수를 자른다.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self._login("member@example.com")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self._login("staff@example.com", is_staff=True)
+        self.assertEqual(self.client.get(self.url, {"limit": "0"}).status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.get(self.url, {"limit": "1"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["sample_rate"], 1)
+        self.assertEqual(len(res.data["traces"]), 1)
+        self.assertEqual(res.data["traces"][0]["path"], f"{self.url}?limit=0")
+
+        self.assertEqual(self.client.delete(self.url).status_code, status.HTTP_204_NO_CONTENT)
+        # 비운 뒤에는 DELETE 요청 자신의 trace 만 남는다.
+        self.assertEqual([t["method"] for t in trace_buffer.snapshot()], ["DELETE"])
+
+
+class MetricsTests(StaffLoginMixin, APITestCase):
+    def test_request_metrics_labelled_by_route(self):
+        """
+        pk 가 달라도 DRF action 이름(route)으로 묶어 처리 시간 / DB 시간 / 응답 크기를 기록하고 /metrics 로 노출한다.
+        """
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        self._login("member@example.com")
+        labels = {"route": "course-list", "method": "GET"}
+        before = sample("http_request_duration_seconds_count", status="200", **labels)
+        db_before = sample("http_request_db_seconds_count", **labels)
+        size_before = sample("http_response_size_bytes_sum", **labels)
+
+        res = self.client.get("/courses")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sample("http_request_duration_seconds_count", status="200", **labels) - before, 1)
+        self.assertEqual(sample("http_request_db_seconds_count", **labels) - db_before, 1)
+        self.assertEqual(sample("http_response_size_bytes_sum", **labels) - size_before, len(res.content))
+
+        self.client.credentials()
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="course-list",status="200"}', res.content.decode())
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_metrics_endpoint_allowlisted_networks_only(self):
+        """
+        /metrics 는 METRICS_ALLOWED_NETWORKS 대역의 REMOTE_ADDR 에만 응답한다.
+        """
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.1.2.3").status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get("/metrics", REMOTE_ADDR="203.0.113.5", HTTP_X_FORWARDED_FOR="10.1.2.3").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    async def test_db_time_recorded_under_asgi(self):
+        """
+        ASGI 요청도 executor 스레드에서 실행된 쿼리 시간이 http_request_db_seconds 에 더해진다.
+        """
+        labels = {"route": "login", "method": "POST"}
+        before = REGISTRY.get_sample_value("http_request_db_seconds_sum", labels) or 0
+        await User.objects.acreate(email="asgi-metrics@example.com", password=make_password("Str0ngP@ss!"))
+        res = await self.async_client.post(
+            "/login", {"email": "asgi-metrics@example.com", "password": "Str0ngP@ss!"}, content_type="application/json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(REGISTRY.get_sample_value("http_request_db_seconds_sum", labels) - before, 0)
+
+    def test_multiprocess_metrics_aggregated(self):
+        """
+        PROMETHEUS_MULTIPROC_DIR 를 공유하는 워커 프로세스들의 지표를 합쳐서 내보낸다.
+        """
+        worker = (
+            "from prometheus_client import Counter\n"
+            "Counter('registration_conflicts_total', '', ['kind']).labels('course').inc()\n"
+        )
+        with tempfile.TemporaryDirectory() as multiproc_dir:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": multiproc_dir}
+            for _ in range(2):
+                subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+            with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": multiproc_dir}):
+                body, _ = render_metrics()
+        self.assertIn(b'registration_conflicts_total{kind="course"} 2.0', body)
+
+
+class BenchmarkTests(APITestCase):
+    def test_compare_reports_query_and_latency_regressions(self):
+        """
+        쿼리 수는 하나만 늘어도, 지연 시간은 p50 이 허용 비율과 잡음 하한을 모두 넘을 때만 회귀로 본다.
+        """
+        baseline = {
+            "list": summarize([10.0] * 5, "ms", queries=3),
+            "enroll": summarize([5.0] * 5, "ms", queries=5),
+            "cancel": summarize([2.0] * 5, "ms", queries=9),
+            "micro": summarize([8.0] * 5, "us"),
+        }
+        results = {
+            "list": summarize([14.0] * 5, "ms", queries=3),    # +40%, +4ms → 회귀
+            "enroll": summarize([5.1] * 5, "ms", queries=6),   # 쿼리 수 증가 → 회귀
+            "cancel": summarize([2.8] * 5, "ms", queries=9),   # +40% 지만 1ms 미만 → 잡음
+            "micro": summarize([12.0] * 5, "us"),              # µs 단위는 비율만 본다 → 회귀
+            "new": summarize([1.0] * 5, "ms", queries=1),      # baseline 에 없는 시나리오는 비교하지 않는다
+        }
+        regressions = compare(results, baseline, tolerance=0.25, min_delta_ms=1.0)
+        self.assertEqual([line.split(":")[0] for line in regressions], ["enroll", "list", "micro"])
+        self.assertIn("쿼리 수 5 → 6", regressions[0])
+
+    def test_scenarios_run_on_seeded_dataset(self):
+        """
+        seed 데이터 위에서 모든 시나리오가 기대 상태 코드로 응답하고, 요청당 쿼리 수가 쿼리 예산 안에 든다.
+        """
+        with redirect_stdout(StringIO()):
+            seed_dataset(users=5, courses=30, tests=30, seed=1)
+
+        scenarios = build_scenarios(limit=5, deep_offset=20)
+        names = {scenario.name for scenario in scenarios}
+        self.assertIn("courses_list_popular_available_deep", names)
+        self.assertTrue({"courses_enroll", "tests_apply", "courses_complete", "tests_complete",
+                         "payments_cancel", "me_payments_list"} <= names)
+        for scenario in scenarios:
+            result = scenario.measure(iterations=2, warmup=0)
+            self.assertEqual(result["iterations"], 2)
+            self.assertGreater(result["queries"], 0, scenario.name)
+        # 롤백하므로 반복해도 신청/결제 데이터가 남지 않는다.
+        self.assertFalse(User.objects.get(email="bench@example.com").payments.exists())
+
+        for name, setup in MICRO_BENCHMARKS.items():
+            self.assertEqual(run_micro(setup, rounds=2, number=1)["unit"], "us", name)
+
+
+class AsyncListMixinTests(APITestCase):
+    def test_view_without_alist_rejected_at_url_setup(self):
+        """
+        alist 를 구현하지 않은 viewset 은 요청 시점이 아니라 as_async_list_view() 에서 ImproperlyConfigured
+        """
+        class NoAsyncListViewSet(AsyncListMixin, GenericViewSet):
+            pass
+
+        with self.assertRaises(ImproperlyConfigured):
+            NoAsyncListViewSet.as_async_list_view(basename="none", detail=False)
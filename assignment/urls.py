@@ -14,10 +14,15 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from accounts.views.signUpview import SignUpView
 from accounts.views.login_view import CustomTokenObtainPairView
+from accounts.views.token_refresh_view import CustomTokenRefreshView
+from assignment.views.db_pool_view import DBPoolStatsView
+from assignment.views.metrics_view import metrics_view
+from assignment.views.sql_trace_view import SqlTraceView
 from rest_framework.routers import DefaultRouter
 from tests.views.test_viewset import TestViewSet
 from courses.views.course_viewset import CourseViewSet
@@ -32,12 +37,24 @@ router.register(r'courses', CourseViewSet, basename='course')
 router.register(r'payments', PaymentViewSet, basename='payment')
 router.register(r'me/payments', MePaymentsViewSet, basename='me_payment')
 
-
+# ASGI 배포(ASYNC_LIST_VIEWS)에서는 목록 GET 을 router 보다 먼저 async view 로 보낸다. 나머지 action 은 router 가 처리한다.
+async_list_urls = [
+    path(prefix, viewset.as_async_list_view(basename=basename, detail=False), name=f'{basename}-list')
+    for prefix, viewset, basename in router.registry
+    if settings.ASYNC_LIST_VIEWS and hasattr(viewset, 'as_async_list_view')
+]
+# Prometheus 가 긁어가는 지표 (METRICS_ENABLED)
+metrics_urls = [path('metrics', metrics_view, name='metrics')] if settings.METRICS_ENABLED else []
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('signup', SignUpView.as_view()),
-    path('login', CustomTokenObtainPairView.as_view()),
+    path('signup', SignUpView.as_view(), name='signup'),
+    path('login', CustomTokenObtainPairView.as_view(), name='login'),
+    path('token/refresh', CustomTokenRefreshView.as_view(), name='token-refresh'),
+    path('internal/db-pool', DBPoolStatsView.as_view(), name='internal-db-pool'),
+    path('internal/sql-trace', SqlTraceView.as_view(), name='internal-sql-trace'),
+    *metrics_urls,
+    *async_list_urls,
     path('', include(router.urls)),
     
     # OpenAPI 스키마 및 문서
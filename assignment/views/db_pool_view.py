@@ -0,0 +1,15 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from assignment.common.db_pool import get_all_pool_stats
+
+
+@extend_schema(tags=['운영'], summary='DB 연결 풀 통계', responses={200: dict})
+class DBPoolStatsView(APIView):
+    """요청을 처리한 워커 프로세스의 연결 풀 크기/대기 통계. (staff 전용)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_all_pool_stats())
@@ -0,0 +1,25 @@
+from ipaddress import ip_address, ip_network
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from assignment.common.metrics import render_metrics
+
+
+def is_allowed_scraper(request):
+    """REMOTE_ADDR 가 METRICS_ALLOWED_NETWORKS 대역 안인지."""
+    try:
+        address = ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_NETWORKS)
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus text exposition. scrape 는 토큰 없이 하므로 METRICS_ALLOWED_NETWORKS 대역에서만 응답한다."""
+    if not is_allowed_scraper(request):
+        return HttpResponseForbidden()
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
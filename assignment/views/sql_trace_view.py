@@ -0,0 +1,29 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.views import APIView
+
+from assignment.common.api_errors import api_error
+from assignment.common.sql_trace import get_sql_traces, trace_buffer
+
+
+class SqlTraceView(APIView):
+    """요청을 처리한 워커 프로세스가 샘플링해 둔 최근 요청의 SQL / 소요 시간. (staff 전용)"""
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=['운영'], summary='샘플링된 요청 SQL trace', responses={200: dict},
+        parameters=[OpenApiParameter('limit', OpenApiTypes.INT, description='최근 것부터 최대 개수')],
+    )
+    def get(self, request):
+        limit = request.query_params.get('limit')
+        if limit is not None and not (limit.isdigit() and int(limit) > 0):
+            raise api_error(400, 'limit 은 양의 정수여야 합니다.')
+        return Response(get_sql_traces(int(limit) if limit else None))
+
+    @extend_schema(tags=['운영'], summary='샘플링된 요청 SQL trace 비우기', request=None, responses={204: None})
+    def delete(self, request):
+        trace_buffer.clear()
+        return Response(status=HTTP_204_NO_CONTENT)
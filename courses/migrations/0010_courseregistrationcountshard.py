@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_course_period_course_courses_active_period_gist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRegistrationCountShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('delta', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_count_shards', to='courses.course')),
+            ],
+            options={
+                'db_table': 'course_registration_count_shards',
+                'constraints': [models.UniqueConstraint(fields=('course', 'shard'), name='uniq_course_registration_count_shard')],
+            },
+        ),
+    ]
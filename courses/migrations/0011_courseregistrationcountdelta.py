@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_courseregistrationcountshard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRegistrationCountDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.SmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_count_deltas', to='courses.course')),
+            ],
+            options={
+                'db_table': 'course_registration_count_deltas',
+            },
+        ),
+    ]
@@ -1,22 +1,38 @@
+from io import StringIO
 from datetime import timedelta
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.test import AsyncRequestFactory, override_settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.serializers import ValidationError
 
-from courses.models import Course, CourseRegistration
-from payments.models import Payment
+from courses.models import (
+    Course, CourseRegistration, CourseRegistrationCountShard, CourseRegistrationCountDelta, course_registration_counter,
+)
+from payments.models import Payment, IdempotencyKey
+from assignment.common.idempotency import local_responses
+from assignment.common.list_cache import invalidate_item_counts
+from assignment.common.metrics import REGISTRY
 from unittest.mock import patch
 from django.db import IntegrityError
 from courses.serializers.course_enroll_serializer import CourseEnrollSerializer
+from courses.views.course_viewset import CourseViewSet
 
 
 class CourseViewSetTests(APITestCase):
     base_url = "/courses"
 
     def setUp(self):
+        # 목록 캐시는 사용자 간에 공유되므로 테스트마다 비운다.
+        caches["list"].clear()
         self.User = get_user_model()
         self.user = self.User.objects.create_user(email="u1@example.com", password="Str0ngP@ss!")
         token_res = self.client.post("/login", {"email": "u1@example.com", "password": "Str0ngP@ss!"}, format="json")
@@ -81,6 +97,20 @@ class CourseViewSetTests(APITestCase):
         self.assertNotIn(inactive.id, ids)
 
 
+    @override_settings(AVAILABLE_PERIOD_FILTER="gist")
+    def test_available_follows_period_after_update(self):
+        """
+        AVAILABLE_PERIOD_FILTER=gist 에서 start_at/end_at 을 update 로 바꿔도 period(generated column)가 함께 갱신되어 available 결과에 반영된다.
+        """
+        course = self._make_course(title="Period")
+        res = self.client.get(f"{self.base_url}?status=available")
+        self.assertEqual([item["id"] for item in res.data["results"]], [course.id])
+
+        Course.objects.filter(pk=course.pk).update(end_at=timezone.now() - timedelta(hours=1))
+        caches["list"].clear()
+        res = self.client.get(f"{self.base_url}?status=available")
+        self.assertEqual(res.data["results"], [])
+
     def test_sort_popular(self):
         """
         sort=popular 시 registrations_count 내림차순(동률 시 created_at 내림차순)으로 정렬된다.
@@ -101,6 +131,336 @@ class CourseViewSetTests(APITestCase):
 
         self.assertTrue(ids.index(c2.id) < ids.index(c1.id))
 
+    def test_cursor_pagination_created(self):
+        """
+        pagination=cursor 이면 count 없이 next 링크를 따라 중복/누락 없이 created 역순으로 조회된다.
+        """
+        courses = [self._make_course(title=f"Cursor-{i}") for i in range(5)]
+        expected = [c.id for c in reversed(courses)]
+
+        res = self.client.get(f"{self.base_url}?pagination=cursor&limit=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertIsNone(res.data["previous"])
+
+        ids = [item["id"] for item in res.data["results"]]
+        next_url = res.data["next"]
+        while next_url:
+            res = self.client.get(next_url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            next_url = res.data["next"]
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_previous_link(self):
+        """
+        cursor 모드 두 번째 페이지의 previous 링크는 첫 페이지를 그대로 돌려준다.
+        """
+        for i in range(4):
+            self._make_course(title=f"Prev-{i}")
+        first = self.client.get(f"{self.base_url}?pagination=cursor&limit=2")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in back.data["results"]],
+            [item["id"] for item in first.data["results"]],
+        )
+
+    def test_cursor_pagination_popular(self):
+        """
+        sort=popular + cursor 모드는 (registrations_count, created_at, id) 순서로 이어서 조회된다.
+        """
+        c1 = self._make_course(title="Pop-1")
+        c2 = self._make_course(title="Pop-2")
+        c3 = self._make_course(title="Pop-3")
+        u2 = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        CourseRegistration.objects.create(user=self.user, course=c1)
+        CourseRegistration.objects.create(user=u2, course=c1)
+        CourseRegistration.objects.create(user=self.user, course=c2)
+
+        res = self.client.get(f"{self.base_url}?sort=popular&pagination=cursor&limit=1")
+        ids = [item["id"] for item in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids.extend(item["id"] for item in res.data["results"])
+        self.assertEqual(ids[:3], [c1.id, c2.id, c3.id])
+
+    @override_settings(LIST_CACHE_ENABLED=False)
+    def test_values_mode_matches_serializer_output(self):
+        """
+        LIST_VALUES_MODE 의 values_list + RowEncoder 응답은 serializer 경로와 바이트 단위로 같다.
+        """
+        c1 = self._make_course(title="Values-1")
+        self._make_course(title="Values-2", start_delta=1, end_delta=2)
+        self._make_course(title="값-3", is_active=False)
+        CourseRegistration.objects.create(user=self.user, course=c1)
+
+        urls = [
+            self.base_url,
+            f"{self.base_url}?sort=popular&limit=2",
+            f"{self.base_url}?status=available",
+            f"{self.base_url}?pagination=cursor&limit=2",
+            f"{self.base_url}?sort=popular&pagination=cursor&limit=1",
+        ]
+        for url in urls:
+            with override_settings(LIST_VALUES_MODE=True):
+                values_res = self.client.get(url)
+            with override_settings(LIST_VALUES_MODE=False):
+                serializer_res = self.client.get(url)
+            self.assertEqual(values_res.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(values_res.content, serializer_res.content, url)
+
+    @override_settings(LIST_CACHE_ENABLED=False)
+    def test_json_backend_renders_same_bytes(self):
+        """
+        JSON_BACKEND=orjson 과 stdlib 응답은 바이트 단위로 같다. (datetime 'Z' 표기, 한글, U+2028 이스케이프 포함)
+        """
+        self._make_course(title="줄\u2028바꿈\u2029수업")
+        self._make_course(title="Backend-2")
+
+        with override_settings(JSON_BACKEND="orjson"):
+            fast_res = self.client.get(f"{self.base_url}?limit=100")
+        with override_settings(JSON_BACKEND="stdlib"):
+            stdlib_res = self.client.get(f"{self.base_url}?limit=100")
+        self.assertEqual(fast_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast_res.content, stdlib_res.content)
+        self.assertIn(b"\\u2028", fast_res.content)
+        self.assertNotIn("\u2028".encode(), fast_res.content)
+
+    def test_json_backend_parses_request_body(self):
+        """
+        orjson parser 로도 신청 본문을 파싱하고, 잘못된 JSON 은 400을 반환한다.
+        """
+        course = self._make_course(title="Parse")
+        with override_settings(JSON_BACKEND="orjson"):
+            res = self.client.post(f"{self.base_url}/{course.id}/enroll", '{"amount": 1000, "payment_method": "card"}', content_type="application/json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+            res = self.client.post(f"{self.base_url}/{course.id}/enroll", '{"amount": ', content_type="application/json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_list_matches_sync_list(self):
+        """
+        ASYNC_LIST_VIEWS 의 async view 는 동기 list 와 같은 본문/상태 코드를 반환한다. (캐시 hit 포함)
+        """
+        c1 = self._make_course(title="Async-1")
+        self._make_course(title="Async-2", start_delta=1, end_delta=2)
+        self._make_course(title="Async-3")
+        CourseRegistration.objects.create(user=self.user, course=c1)
+        view = async_to_sync(CourseViewSet.as_async_list_view(basename="course", detail=False))
+
+        def async_get(url, **headers):
+            return view(AsyncRequestFactory().get(url, headers=headers)).render()
+
+        auth = {"Authorization": f"Bearer {self.access}"}
+        urls = [
+            self.base_url,
+            f"{self.base_url}?sort=popular&limit=2&offset=1",
+            f"{self.base_url}?status=available",
+            f"{self.base_url}?count=none&limit=1",
+            f"{self.base_url}?count=cached",
+            f"{self.base_url}?pagination=cursor&limit=2",
+            f"{self.base_url}?count=fast",
+        ]
+        for url in urls:
+            for _ in range(2):
+                async_res = async_get(url, **auth)
+                sync_res = self.client.get(url)
+                self.assertEqual(async_res.status_code, sync_res.status_code, url)
+                self.assertEqual(async_res.content, sync_res.content, url)
+
+        with override_settings(LIST_CACHE_ENABLED=False, LIST_VALUES_MODE=False):
+            self.assertEqual(async_get(self.base_url, **auth).content, self.client.get(self.base_url).content)
+
+        res = async_get(self.base_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res.headers)
+
+    def test_cursor_pagination_invalid_cursor(self):
+        """
+        변조된 cursor 나 허용되지 않은 pagination 값은 400을 반환한다.
+        """
+        res = self.client.get(f"{self.base_url}?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", res.data)
+
+        res = self.client.get(f"{self.base_url}?pagination=page")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_count_mode_none_omits_count(self):
+        """
+        count=none 이면 count 필드 없이 limit + 1 조회 결과로 next 링크만 만든다.
+        """
+        for i in range(3):
+            self._make_course(title=f"NoCount-{i}")
+        res = self.client.get(f"{self.base_url}?count=none&limit=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertIsNone(res.data["next"])
+
+    def test_count_mode_cached(self):
+        """
+        count=cached 는 같은 필터의 count 를 캐시에서 재사용한다.
+        """
+        cache.clear()
+        self._make_course(title="Cached-1")
+        res = self.client.get(f"{self.base_url}?count=cached")
+        self.assertEqual(res.data["count"], 1)
+
+        self._make_course(title="Cached-2")
+        res = self.client.get(f"{self.base_url}?count=cached")
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(self.client.get(self.base_url).data["count"], 2)
+
+    def test_count_mode_estimate_and_invalid(self):
+        """
+        count=estimate 는 정수 count 를 반환하고, 허용되지 않은 count 값은 400을 반환한다.
+        """
+        cache.clear()
+        self._make_course(title="Estimate-1")
+        res = self.client.get(f"{self.base_url}?count=estimate")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data["count"], int)
+
+        res = self.client.get(f"{self.base_url}?count=fast")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("count", res.data)
+
+    def test_list_response_cache_and_enroll_invalidation(self):
+        """
+        같은 쿼리의 목록은 캐시에서 응답하고, 수강 신청이 커밋되면 해당 수업이 포함된 페이지가 무효화된다.
+        """
+        course = self._make_course(title="Cache-1")
+        res = self.client.get(f"{self.base_url}?sort=popular")
+        self.assertEqual(res.data["count"], 1)
+
+        self._make_course(title="Cache-2")
+        res = self.client.get(f"{self.base_url}?sort=popular")
+        self.assertEqual(res.data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        res = self.client.get(f"{self.base_url}?sort=popular")
+        self.assertEqual(res.data["count"], 2)
+        d_by_id = {item["id"]: item for item in res.data["results"]}
+        self.assertTrue(d_by_id[course.id]["is_registered"])
+        self.assertEqual(d_by_id[course.id]["registrations_count"], 1)
+
+    def test_list_response_cache_item_invalidation_across_users(self):
+        """
+        다른 사용자의 신청으로 registrations_count 가 바뀐 항목이 있으면 내 캐시 페이지도 무효화된다.
+        """
+        course = self._make_course(title="Shared")
+        self.client.get(self.base_url)
+
+        other = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            other_client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+
+        res = self.client.get(self.base_url)
+        item = next(i for i in res.data["results"] if i["id"] == course.id)
+        self.assertEqual(item["registrations_count"], 1)
+        self.assertFalse(item["is_registered"])
+
+    def test_popular_page_invalidated_when_item_moves_onto_it(self):
+        """
+        sort=popular 는 신청 수가 바뀐 항목이 캐시된 다른 페이지로 옮겨 가도 그 페이지가 무효화된다.
+        """
+        first = self._make_course(title="Popular-1")
+        second = self._make_course(title="Popular-2")
+        CourseRegistration.objects.create(user=self.User.objects.create_user(email="p1@example.com", password="Str0ngP@ss!"), course=first)
+        res = self.client.get(f"{self.base_url}?sort=popular&limit=1")
+        self.assertEqual([item["id"] for item in res.data["results"]], [first.id])
+
+        other = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        for user_client in (self.client, other_client):
+            with self.captureOnCommitCallbacks(execute=True):
+                user_client.post(f"{self.base_url}/{second.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+
+        # first 페이지에 없던 second 의 신청 수만 바뀌었지만 1페이지가 second 로 바뀐다.
+        res = self.client.get(f"{self.base_url}?sort=popular&limit=1")
+        self.assertEqual([item["id"] for item in res.data["results"]], [second.id])
+
+    def test_page_not_cached_when_counts_change_during_query(self):
+        """
+        페이지 조회와 캐시 저장 사이에 신청 수 무효화가 커밋되면 조회한(이전) 페이지를 저장하지 않는다.
+        """
+        course = self._make_course(title="Race")
+        encode = CourseViewSet.encode_catalog_page
+
+        def encode_then_invalidate(view, items, paginated):
+            data = encode(view, items, paginated)
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_item_counts("course", course.id)
+            return data
+
+        with patch.object(CourseViewSet, "encode_catalog_page", encode_then_invalidate):
+            self.client.get(self.base_url)
+
+        # 다음 조회는 캐시 miss 라 카탈로그 페이지를 다시 조회한다. (COUNT + 페이지 + overlay)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.base_url)
+        self.assertTrue(any('FROM "courses"' in q["sql"] for q in ctx.captured_queries))
+
+    def test_catalog_page_shared_with_per_user_overlay(self):
+        """
+        카탈로그 페이지는 사용자 간에 공유되고, is_registered 는 요청마다 현재 사용자 기준으로 덧씌운다.
+        """
+        course = self._make_course(title="Overlay")
+        other = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        CourseRegistration.objects.create(user=other, course=course)
+
+        res = self.client.get(self.base_url)
+        self.assertFalse(res.data["results"][0]["is_registered"])
+
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        # 캐시 hit: 카탈로그 조회 없이 신청 여부 IN 조회 1번만 실행된다.
+        with self.assertNumQueries(1):
+            res = other_client.get(self.base_url)
+        self.assertTrue(res.data["results"][0]["is_registered"])
+
+    def test_available_excludes_registered_in_sql(self):
+        """
+        status=available 은 사용자별 신청 항목을 NOT EXISTS 로 제외하고, 다른 사용자와 캐시 페이지를 공유하지 않는다.
+        """
+        course = self._make_course(title="Avail-Shared")
+        res = self.client.get(f"{self.base_url}?status=available")
+        self.assertEqual([item["id"] for item in res.data["results"]], [course.id])
+
+        other = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        CourseRegistration.objects.create(user=other, course=course)
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        # 신청 항목 id 를 따로 가져오지 않고 목록 쿼리 안에서 제외한다.
+        with CaptureQueriesContext(connection) as ctx:
+            res = other_client.get(f"{self.base_url}?status=available")
+        self.assertEqual(res.data["results"], [])
+        self.assertTrue(all("NOT EXISTS" in q["sql"] for q in ctx.captured_queries))
+
+        # 같은 사용자의 이전 available 페이지도 캐시되지 않는다.
+        CourseRegistration.objects.create(user=self.user, course=course)
+        res = self.client.get(f"{self.base_url}?status=available")
+        self.assertEqual(res.data["results"], [])
+
+    @override_settings(LIST_CACHE_ENABLED=False)
+    def test_list_response_cache_disabled(self):
+        """
+        LIST_CACHE_ENABLED=False 이면 매 요청 DB 에서 조회한다.
+        """
+        self._make_course(title="NoCache-1")
+        self.assertEqual(self.client.get(self.base_url).data["count"], 1)
+        self._make_course(title="NoCache-2")
+        self.assertEqual(self.client.get(self.base_url).data["count"], 2)
+
     def test_enroll_success(self):
         """
         정상 신청 시 registration/payment가 생성되고 상태가 'paid'로 응답된다.
@@ -118,12 +478,249 @@ class CourseViewSetTests(APITestCase):
 
         pay = Payment.objects.get(id=res.data["payment_id"])
         self.assertEqual(pay.course_registration_id, reg.id)
+        self.assertEqual((pay.user_id, pay.item_kind), (self.user.id, "course"))
         self.assertIsNone(pay.test_registration_id)
         self.assertEqual(pay.status, "paid")
 
         course.refresh_from_db()
         self.assertEqual(course.registrations_count, 1)
 
+    @override_settings(REGISTRATION_COUNTER_MODE="sharded")
+    def test_enroll_sharded_counter_rollup(self):
+        """
+        sharded 모드에서는 신청 시 샤드에만 기록되고, rollup 커맨드 실행 후 registrations_count 에 반영된다.
+        """
+        course = self._make_course(title="Sharded")
+        res = self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 0)
+        self.assertEqual(CourseRegistrationCountShard.objects.get(course=course).delta, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("rollup_registration_counts", stdout=StringIO())
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 1)
+        self.assertFalse(CourseRegistrationCountShard.objects.filter(course=course).exists())
+        self.assertEqual(self.client.get(self.base_url).data["results"][0]["registrations_count"], 1)
+
+    @override_settings(REGISTRATION_COUNTER_MODE="outbox")
+    def test_enroll_outbox_counter_drain(self):
+        """
+        outbox 모드에서는 신청 시 delta 행만 쌓이고, drain 이 배치 단위로 항목별 합계를 반영한다.
+        """
+        hot = self._make_course(title="Hot")
+        cold = self._make_course(title="Cold")
+        res = self.client.post(f"{self.base_url}/{hot.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        other = self.User.objects.create_user(email="u2@example.com", password="Str0ngP@ss!")
+        CourseRegistration.objects.create(user=other, course=hot)
+        CourseRegistration.objects.create(user=other, course=cold)
+
+        hot.refresh_from_db()
+        self.assertEqual(hot.registrations_count, 0)
+        self.assertEqual(CourseRegistrationCountDelta.objects.count(), 3)
+
+        self.assertEqual(course_registration_counter.drain(batch_size=2), ([hot.id], 2))
+        self.assertEqual(course_registration_counter.drain(batch_size=2), ([cold.id], 1))
+        self.assertEqual(course_registration_counter.drain(batch_size=2), ([], 0))
+        hot.refresh_from_db()
+        cold.refresh_from_db()
+        self.assertEqual((hot.registrations_count, cold.registrations_count), (2, 1))
+
+    @override_settings(REGISTRATION_COUNTER_MODE="outbox")
+    def test_enroll_outbox_rolled_back_with_payment_conflict(self):
+        """
+        결제 생성이 실패해 신청이 롤백되면 같은 트랜잭션의 delta 행도 남지 않는다.
+        """
+        course = self._make_course(title="Outbox Rollback")
+        with patch("payments.models.Payment.objects.create", side_effect=IntegrityError("dup")):
+            res = self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(CourseRegistrationCountDelta.objects.exists())
+
+    @override_settings(REGISTRATION_APPLY_FAST_PATH=True)
+    def test_enroll_fast_path_success(self):
+        """
+        fast path 는 기존과 같은 응답/데이터를 만들면서 신청 관련 쿼리를 한 번만 실행한다.
+        """
+        course = self._make_course(title="Fast")
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        self.assertEqual(res.data["status"], "paid")
+        # SAVEPOINT / CTE / RELEASE SAVEPOINT
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+        reg = CourseRegistration.objects.get(id=res.data["registration_id"])
+        self.assertEqual((reg.user_id, reg.course_id, reg.status), (self.user.id, course.id, "registered"))
+        pay = Payment.objects.get(id=res.data["payment_id"])
+        self.assertEqual((pay.course_registration_id, pay.amount, pay.status), (reg.id, 10000, "paid"))
+        self.assertEqual((pay.user_id, pay.item_kind), (self.user.id, "course"))
+        self.assertIsNotNone(pay.paid_at)
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 1)
+
+    def test_enroll_fast_path_fewer_queries_than_default(self):
+        """
+        같은 신청을 기본 경로와 fast path 로 처리했을 때 fast path 의 쿼리 수가 더 적다.
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        counts = {}
+        for fast in (False, True):
+            course = self._make_course(title=f"Compare-{fast}")
+            with override_settings(REGISTRATION_APPLY_FAST_PATH=fast), CaptureQueriesContext(connection) as ctx:
+                res = client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+            counts[fast] = len(ctx.captured_queries)
+        self.assertLess(counts[True], counts[False])
+
+    @override_settings(REGISTRATION_APPLY_FAST_PATH=True)
+    def test_enroll_fast_path_errors(self):
+        """
+        fast path 도 존재하지 않음 404, 신청 불가 400, 중복 신청 409 를 기존 메시지로 응답한다.
+        """
+        body = {"amount": 10000, "payment_method": "card"}
+        res = self.client.post(f"{self.base_url}/999999/enroll", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.data["detail"], "존재하지 않는 수업입니다.")
+
+        future = self._make_course(title="Fast Future", start_delta=1, end_delta=2)
+        res = self.client.post(f"{self.base_url}/{future.id}/enroll", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["detail"], "수업 수강 가능한 수업이 아닙니다.")
+
+        course = self._make_course(title="Fast Dup")
+        self.assertEqual(self.client.post(f"{self.base_url}/{course.id}/enroll", body, format="json").status_code, status.HTTP_201_CREATED)
+        res = self.client.post(f"{self.base_url}/{course.id}/enroll", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"], "이미 수업 수강 신청된 수업입니다.")
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 1)
+        self.assertEqual(CourseRegistration.objects.filter(course=course).count(), 1)
+
+        # 취소된 신청은 부분 unique 인덱스 대상이 아니므로 다시 신청할 수 있다.
+        CourseRegistration.objects.filter(course=course).update(status="cancelled")
+        res = self.client.post(f"{self.base_url}/{course.id}/enroll", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+
+    @override_settings(REGISTRATION_APPLY_FAST_PATH=True, REGISTRATION_COUNTER_MODE="outbox")
+    def test_enroll_fast_path_outbox_counter(self):
+        """
+        fast path 의 카운터 증가도 설정된 카운터 모드를 따른다.
+        """
+        course = self._make_course(title="Fast Outbox")
+        res = self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 0)
+        self.assertEqual(CourseRegistrationCountDelta.objects.get(course=course).delta, 1)
+
+    def test_enroll_idempotency_key_replay(self):
+        """
+        같은 Idempotency-Key 로 재요청하면 신청/결제 행을 조회하지 않고 처음 응답을 그대로 돌려준다.
+        """
+        local_responses.clear()
+        course = self._make_course(title="Idempotent")
+        body = {"amount": 10000, "payment_method": "card"}
+        first = self.client.post(f"{self.base_url}/{course.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="cart-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED, first.data)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(0):
+            again = client.post(f"{self.base_url}/{course.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="cart-1")
+        self.assertEqual(again.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(again.data, first.data)
+        self.assertEqual(again["Idempotent-Replayed"], "true")
+
+        # 다른 워커(LRU 미스)에서는 저장된 테이블 응답을 돌려준다.
+        local_responses.clear()
+        with self.assertNumQueries(1):
+            again = client.post(f"{self.base_url}/{course.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="cart-1")
+        self.assertEqual(again.data, first.data)
+        self.assertEqual(CourseRegistration.objects.filter(course=course).count(), 1)
+
+    def test_enroll_idempotency_key_other_request(self):
+        """
+        다른 요청에 쓴 Idempotency-Key 를 재사용하면 422, 실패 응답은 저장하지 않아 같은 키로 다시 시도할 수 있다.
+        """
+        local_responses.clear()
+        body = {"amount": 10000, "payment_method": "card"}
+        future = self._make_course(title="Idem Future", start_delta=1, end_delta=2)
+        res = self.client.post(f"{self.base_url}/{future.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        course = self._make_course(title="Idem Open")
+        res = self.client.post(f"{self.base_url}/{course.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+
+        other = self._make_course(title="Idem Other")
+        res = self.client.post(f"{self.base_url}/{other.id}/enroll", body, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(res.status_code, 422)
+        self.assertFalse(CourseRegistration.objects.filter(course=other).exists())
+
+    def test_enroll_idempotency_key_other_body(self):
+        """
+        같은 경로라도 본문이 다르면 다른 요청으로 보고 422 를 반환한다.
+        """
+        local_responses.clear()
+        course = self._make_course(title="Idem Body")
+        url = f"{self.base_url}/{course.id}/enroll"
+        res = self.client.post(url, {"amount": 10000, "payment_method": "card"}, format="json", HTTP_IDEMPOTENCY_KEY="b-1")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+
+        res = self.client.post(url, {"amount": 20000, "payment_method": "card"}, format="json", HTTP_IDEMPOTENCY_KEY="b-1")
+        self.assertEqual(res.status_code, 422)
+
+    def test_enroll_idempotency_key_in_flight(self):
+        """
+        처리 중(예약)인 키로 들어온 요청은 신청/결제 행을 건드리지 않고 409, 오래된 예약은 다시 예약해 처리한다.
+        """
+        local_responses.clear()
+        course = self._make_course(title="Idem Pending")
+        url = f"{self.base_url}/{course.id}/enroll"
+        body = {"amount": 10000, "payment_method": "card"}
+        probe = self.client.post(url, body, format="json", HTTP_IDEMPOTENCY_KEY="probe")
+        self.assertEqual(probe.status_code, status.HTTP_201_CREATED, probe.data)
+        fingerprint = IdempotencyKey.objects.get(key="probe").fingerprint
+        Payment.objects.all().delete()
+        CourseRegistration.objects.all().delete()
+
+        pending = IdempotencyKey.objects.create(user=self.user, key="p-1", fingerprint=fingerprint)
+        with self.assertNumQueries(1):
+            res = self.client.post(url, body, format="json", HTTP_IDEMPOTENCY_KEY="p-1")
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(CourseRegistration.objects.exists())
+
+        IdempotencyKey.objects.filter(pk=pending.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+        res = self.client.post(url, body, format="json", HTTP_IDEMPOTENCY_KEY="p-1")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        self.assertEqual(IdempotencyKey.objects.get(pk=pending.pk).status_code, 201)
+
+    def test_idempotency_lru_expires_with_stored_key(self):
+        """
+        테이블에서 읽어 LRU 에 채운 응답은 키의 남은 보관 기간까지만 LRU 에 남는다.
+        """
+        local_responses.clear()
+        course = self._make_course(title="Idem TTL")
+        url = f"{self.base_url}/{course.id}/enroll"
+        body = {"amount": 10000, "payment_method": "card"}
+        self.client.post(url, body, format="json", HTTP_IDEMPOTENCY_KEY="t-1")
+        local_responses.clear()
+        IdempotencyKey.objects.filter(key="t-1").update(
+            created_at=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL - 30)
+        )
+        with patch("assignment.common.idempotency.local_responses.set") as lru_set:
+            res = self.client.post(url, body, format="json", HTTP_IDEMPOTENCY_KEY="t-1")
+        self.assertEqual(res["Idempotent-Replayed"], "true")
+        self.assertLessEqual(lru_set.call_args.args[2], 30)
+
     def test_enroll_course_not_found(self):
         """
         존재하지 않는 코스에 신청하면 404를 반환한다.
@@ -152,6 +749,28 @@ class CourseViewSetTests(APITestCase):
         res = self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
         self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
 
+    def test_enroll_conflict_metrics(self):
+        """
+        신청 409 는 kind 별 conflict 카운터와 course-enroll route 지표에 함께 잡힌다. (fast path 포함)
+        """
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        course = self._make_course(title="Dup")
+        CourseRegistration.objects.create(user=self.user, course=course)
+        conflicts = sample("registration_conflicts_total", kind="course")
+        requests = sample("http_request_duration_seconds_count", route="course-enroll", method="POST", status="409")
+
+        for fast_path in (False, True):
+            with override_settings(REGISTRATION_APPLY_FAST_PATH=fast_path):
+                res = self.client.post(f"{self.base_url}/{course.id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        self.assertEqual(sample("registration_conflicts_total", kind="course") - conflicts, 2)
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", route="course-enroll", method="POST", status="409") - requests, 2,
+        )
+
     def test_enroll_invalid_payment_method(self):
         """
         잘못된 결제수단으로 신청 시 400을 반환한다.
@@ -200,6 +819,20 @@ class CourseViewSetTests(APITestCase):
         res = self.client.post(f"{self.base_url}/{course.id}/complete", {}, format="json")
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_complete_after_cancel_and_reenroll(self):
+        """
+        취소 후 다시 신청한 수업은 가장 최근 신청이 완료 처리된다.
+        """
+        course = self._make_course(title="Re-enroll", start_delta=-1, end_delta=1, is_active=True)
+        CourseRegistration.objects.create(user=self.user, course=course, status="cancelled")
+        reg = CourseRegistration.objects.create(user=self.user, course=course, status="registered")
+
+        res = self.client.post(f"{self.base_url}/{course.id}/complete", {}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.assertEqual(res.data["registration_id"], reg.id)
+        reg.refresh_from_db()
+        self.assertEqual(reg.status, "completed")
+
     def test_complete_not_active_or_time(self):
         """
         비활성 또는 기간 외 코스에 대해 완료 요청 시 400을 반환한다.
@@ -1,12 +1,13 @@
-from django.db.models import Exists, OuterRef
-from courses.models import Course, CourseRegistration
+from courses.models import Course, CourseRegistration, course_registration_counter
 from courses.serializers.course_list_serializer import CourseListSerializer
+from django.conf import settings
 from django.utils import timezone
 from rest_framework.decorators import action
 from courses.serializers.course_enroll_serializer import CourseEnrollSerializer
 from payments.models import Payment
 from assignment.common.api_errors import api_error
 from assignment.common.base_registrable_viewset import BaseRegistrableViewSet
+from assignment.common.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes, extend_schema_view
 
 
@@ -19,17 +20,21 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes,
             OpenApiParameter(name='sort',   type=OpenApiTypes.STR, required=False, description='정렬: created(기본) | popular', enum=['created', 'popular']),
             OpenApiParameter(name='limit',  type=OpenApiTypes.INT, required=False, description='페이지 크기'),
             OpenApiParameter(name='offset', type=OpenApiTypes.INT, required=False, description='페이지 오프셋'),
+            OpenApiParameter(name='count',  type=OpenApiTypes.STR, required=False, description='count 계산 방식: exact(기본) | none | estimate | cached', enum=['exact', 'none', 'estimate', 'cached']),
+            OpenApiParameter(name='pagination', type=OpenApiTypes.STR, required=False, description='페이지네이션 방식: offset(기본) | cursor', enum=['offset', 'cursor']),
+            OpenApiParameter(name='cursor', type=OpenApiTypes.STR, required=False, description='cursor 모드의 next/previous 링크에 포함된 cursor 값'),
         ]
     )
 )
 class CourseViewSet(BaseRegistrableViewSet):
     serializer_class = CourseListSerializer
+    registration_model = CourseRegistration
+    registration_item_field = 'course_id'
+    registration_counter = course_registration_counter
     apply_serializer_class = CourseEnrollSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self._base_queryset_with_registration_flag(user)
-        return self.apply_status_and_sort(queryset)
+        return self.apply_status_and_sort(Course.objects.all())
 
     @extend_schema(request=None, summary='수업 완료')
     @action(detail=True, methods=['post'], url_path='complete')
@@ -44,9 +49,20 @@ class CourseViewSet(BaseRegistrableViewSet):
             mark_registration_completed=self.mark_registration_completed_default,
         )
     
-    @extend_schema(request=CourseEnrollSerializer, summary='수업 수강 신청')
+    @extend_schema(request=CourseEnrollSerializer, summary='수업 수강 신청', parameters=[IDEMPOTENCY_KEY_PARAMETER])
     @action(detail=True, methods=['post'], url_path='enroll')
+    @idempotent
     def enroll(self, request, pk=None):
+        if settings.REGISTRATION_APPLY_FAST_PATH:
+            return self.do_apply_fast(
+                request,
+                pk,
+                serializer_class=self.apply_serializer_class,
+                not_found_message='존재하지 않는 수업입니다.',
+                not_applicable_message='수업 수강 가능한 수업이 아닙니다.',
+                registration_conflict_message='이미 수업 수강 신청된 수업입니다.',
+                payment_conflict_message='결제 정보가 이미 생성되었습니다.',
+            )
         return self.do_apply(
             request,
             pk,
@@ -60,15 +76,6 @@ class CourseViewSet(BaseRegistrableViewSet):
             payment_conflict_message='결제 정보가 이미 생성되었습니다.',
         )
 
-    def _base_queryset_with_registration_flag(self, user):
-        return Course.objects.all().annotate(
-            is_registered=Exists(
-                CourseRegistration.objects
-                    .filter(user=user, course_id=OuterRef('pk'))
-                    .exclude(status='cancelled')
-            ),
-        )
-
     def _get_course_or_404(self, pk):
         try:
             return Course.objects.get(pk=pk)
@@ -81,15 +88,19 @@ class CourseViewSet(BaseRegistrableViewSet):
             raise api_error(400, '수업 수강 가능한 수업이 아닙니다.')
 
     def _ensure_not_already_registered(self, user, course):
-        if CourseRegistration.objects.filter(user=user, course=course).exclude(status='cancelled').exists():
+        if CourseRegistration.objects.filter(user_id=user.id, course=course).exclude(status='cancelled').exists():
             raise api_error(409, '이미 수업 수강 신청된 수업입니다.')
 
     def _create_registration(self, user, course):
-        return CourseRegistration.objects.create(user=user, course=course)
+        return CourseRegistration.objects.create(user_id=user.id, course=course)
 
     def _create_payment(self, course_registration, data):
         return Payment.objects.create(
             course_registration=course_registration,
+            user_id=course_registration.user_id,
+            item_kind='course',
+            item_title=course_registration.course.title,
+            registration_status=course_registration.status,
             amount=data['amount'],
             payment_method=data['payment_method'],
             status='paid',
@@ -101,7 +112,8 @@ class CourseViewSet(BaseRegistrableViewSet):
             raise api_error(400, '완료 처리 가능한 수업이 아닙니다.')
 
     def _get_registration_or_404(self, user, course):
-        try:
-            return CourseRegistration.objects.get(user=user, course=course)
-        except CourseRegistration.DoesNotExist:
+        # 취소 후 재신청하면 이력이 여러 개다. 유효한 신청은 항상 가장 최근 것이다.
+        registration = CourseRegistration.objects.filter(user_id=user.id, course=course).order_by('-id').first()
+        if registration is None:
             raise api_error(404, '수강 신청 이력이 없습니다.')
+        return registration
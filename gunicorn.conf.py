@@ -0,0 +1,20 @@
+import glob
+import os
+
+# gunicorn 은 실행 디렉터리의 gunicorn.conf.py 를 자동으로 읽는다. 서버 옵션은 Dockerfile / docker-compose 명령줄에 둔다.
+
+
+def on_starting(server):
+    # 이전 실행에서 남은 워커 지표 파일을 지워 재시작 후 카운터가 이어 붙지 않게 한다.
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(multiproc_dir, '*.db')):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 live gauge 파일을 정리한다. (counter / histogram 값은 합계에 남는다)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
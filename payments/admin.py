@@ -5,6 +5,8 @@ from payments.models import Payment
 class PaymentAdmin(admin.ModelAdmin):
     list_display = (
         "id",
+        "user",
+        "item_kind",
         "amount",
         "payment_method",
         "status",
@@ -14,7 +16,7 @@ class PaymentAdmin(admin.ModelAdmin):
         "canceled_at",
         "created_at",
     )
-    list_filter = ("status", "payment_method")
+    list_filter = ("status", "payment_method", "item_kind")
     search_fields = (
         "course_registration__user__email",
         "course_registration__course__title",
@@ -0,0 +1,41 @@
+from django.db import connection, transaction
+
+
+def backfill_payment_owner(batch_size=10_000):
+    """user_id/item_kind 와 신청 스냅샷(item_title 등)이 비어 있는 결제 행을 연결된 신청 정보로 id 구간 단위로 채운다.
+
+    마이그레이션(0007)과 backfill_payment_owner 커맨드가 함께 쓰므로 현재 모델 대신 SQL 로만 접근한다. 채운 행 수를 반환.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM payments WHERE user_id IS NULL OR item_title IS NULL")
+        low, high = cursor.fetchone()
+    if low is None:
+        return 0
+
+    total = 0
+    for start in range(low, high + 1, batch_size):
+        end = start + batch_size - 1
+        # 구간마다 커밋해서 락을 오래 잡지 않고, 중간에 멈춰도 이어서 실행할 수 있게 한다.
+        with transaction.atomic(), connection.cursor() as cursor:
+            for kind, registration_table, item_table in (
+                ('course', 'course_registrations', 'courses'),
+                ('test', 'test_registrations', 'tests'),
+            ):
+                cursor.execute(
+                    f"""
+                    UPDATE payments AS p
+                    SET user_id = r.user_id,
+                        item_kind = %s,
+                        item_title = i.title,
+                        registration_status = r.status,
+                        attempted_at = r.attempted_at
+                    FROM {registration_table} AS r
+                    JOIN {item_table} AS i ON i.id = r.{kind}_id
+                    WHERE p.{kind}_registration_id = r.id
+                      AND (p.user_id IS NULL OR p.item_title IS NULL)
+                      AND p.id BETWEEN %s AND %s
+                    """,
+                    [kind, start, end],
+                )
+                total += cursor.rowcount
+    return total
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from payments.backfill import backfill_payment_owner
+
+
+class Command(BaseCommand):
+    help = "user_id/item_kind 와 신청 스냅샷(item_title 등)이 비어 있는 기존 결제 행을 연결된 신청 정보로 id 구간 단위로 채웁니다. (0007 마이그레이션 이후 다시 채울 때)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000, help='한 트랜잭션에서 처리할 id 구간 크기')
+
+    def handle(self, *args, **options):
+        total = backfill_payment_owner(options['batch_size'])
+        if total == 0:
+            self.stdout.write("채울 결제 행이 없습니다.")
+            return
+        self.stdout.write(f"결제 {total}건 backfill 완료")
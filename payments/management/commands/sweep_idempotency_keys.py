@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from payments.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "보관 기간(IDEMPOTENCY_KEY_TTL)이 지난 Idempotency-Key 응답을 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='한 번에 삭제할 행 수 (락 유지 시간 제한)')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        expired = IdempotencyKey.objects.filter(created_at__lt=cutoff)
+        total = 0
+        while True:
+            batch_ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not batch_ids:
+                break
+            deleted, _ = IdempotencyKey.objects.filter(id__in=batch_ids).delete()
+            total += deleted
+        self.stdout.write(f"만료된 Idempotency-Key {total}건 삭제")
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_courseregistrationcountdelta'),
+        ('payments', '0003_idempotencykey'),
+        ('tests', '0012_testregistrationcountdelta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='item_kind',
+            field=models.CharField(blank=True, choices=[('course', 'course'), ('test', 'test')], max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='payments_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'paid')), fields=['user', 'paid_at'], name='payments_user_paid_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status__in', ['cancelled', 'refunded'])), fields=['user', 'canceled_at'], name='payments_user_canceled_at_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_payment_item_kind_payment_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='attempted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='item_title',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='registration_status',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_payment_attempted_at_payment_item_title_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='response_body',
+            field=models.JSONField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from payments.backfill import backfill_payment_owner
+
+
+def forwards(apps, schema_editor):
+    backfill_payment_owner()
+
+
+class Migration(migrations.Migration):
+    # id 구간마다 커밋하도록 마이그레이션 전체를 한 트랜잭션으로 묶지 않는다.
+    atomic = False
+
+    dependencies = [
+        ('payments', '0006_idempotencykey_pending'),
+        ('courses', '0011_courseregistrationcountdelta'),
+        ('tests', '0012_testregistrationcountdelta'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
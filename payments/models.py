@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
@@ -33,6 +34,25 @@ class Payment(models.Model):
         null=True,
         blank=True,
     )
+    # 결제내역 조회용 비정규화 컬럼 (신청의 user / 대상 종류). 기존 행은 backfill_payment_owner 로 채운다.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="payments",
+        null=True,
+        blank=True,
+        # (user, created_at) 복합 인덱스가 user_id 단독 조회도 처리한다.
+        db_index=False,
+    )
+    ITEM_KIND_CHOICES = [
+        ("course", "course"),
+        ("test", "test"),
+    ]
+    item_kind = models.CharField(max_length=10, choices=ITEM_KIND_CHOICES, null=True, blank=True)
+    # 결제내역 목록을 JOIN 없이 만들기 위한 신청/대상 스냅샷. 완료/취소 시 함께 갱신한다.
+    item_title = models.CharField(max_length=200, null=True, blank=True)
+    registration_status = models.CharField(max_length=20, null=True, blank=True)
+    attempted_at = models.DateTimeField(null=True, blank=True)
 
     amount = models.PositiveIntegerField()
     payment_method = models.CharField(max_length=30, choices=PAYMENT_METHOD_CHOICES)
@@ -50,7 +70,11 @@ class Payment(models.Model):
             models.Index(fields=["created_at"]),
             models.Index(fields=["status"]),
             models.Index(fields=["paid_at"], name="payments_paid_at_idx", condition=models.Q(status="paid")),
-            models.Index(fields=["canceled_at"], name="payments_canceled_at_idx", condition=models.Q(status__in=["cancelled", "refunded"]))
+            models.Index(fields=["canceled_at"], name="payments_canceled_at_idx", condition=models.Q(status__in=["cancelled", "refunded"])),
+            # GET /me/payments: 사용자별 최신순 + status/기간 필터
+            models.Index(fields=["user", "-created_at", "-id"], name="payments_user_created_idx"),
+            models.Index(fields=["user", "paid_at"], name="payments_user_paid_at_idx", condition=models.Q(status="paid")),
+            models.Index(fields=["user", "canceled_at"], name="payments_user_canceled_at_idx", condition=models.Q(status__in=["cancelled", "refunded"])),
         ]
         constraints = [
             # 대상은 반드시 하나만 설정 (XOR)
@@ -69,13 +93,51 @@ class Payment(models.Model):
         ]
 
     def save(self, *args, **kwargs):
+        if self.user_id is None or self.item_kind is None or self.item_title is None:
+            registration = self.course_registration or self.test_registration
+            if registration is not None:
+                self.fill_registration_snapshot(registration)
         if self.status == "paid" and self.paid_at is None:
             self.paid_at = timezone.now()
         if self.status in {"cancelled", "refunded"} and self.canceled_at is None:
             self.canceled_at = timezone.now()
         super().save(*args, **kwargs)
 
+    def fill_registration_snapshot(self, registration):
+        """신청(과 대상)에서 user/item_kind/item_title/registration_status/attempted_at 을 복사한다."""
+        self.user_id = registration.user_id
+        self.item_kind = "course" if self.course_registration_id else "test"
+        item = registration.course if self.item_kind == "course" else registration.test
+        self.item_title = item.title
+        self.registration_status = registration.status
+        self.attempted_at = registration.attempted_at
+
     def __str__(self):
         target = "course" if self.course_registration_id else "test"
         target_id = self.course_registration_id or self.test_registration_id
         return f"Payment<{self.id}> {target}:{target_id} {self.amount}KRW {self.status}"
+
+
+
+class IdempotencyKey(models.Model):
+    """Idempotency-Key 헤더로 처리한 요청의 응답. 같은 키로 재요청하면 저장된 응답을 그대로 돌려준다."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    # 같은 키를 다른 요청에 재사용하는 것을 막기 위한 "METHOD path sha256(본문)"
+    fingerprint = models.CharField(max_length=255)
+    # 처리 중(예약)인 키는 응답이 없다.
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="uniq_idempotency_key_per_user"),
+        ]
+
+    def __str__(self):
+        return f"IdempotencyKey<{self.user_id}:{self.key}> {self.fingerprint} {self.status_code}"
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from payments.serializers.base_apply_serializer import BaseApplySerializer
+
+BATCH_APPLY_MAX_ITEMS = 50
+
+
+class BatchApplyItemSerializer(BaseApplySerializer):
+    kind = serializers.ChoiceField(choices=['course', 'test'])
+    id = serializers.IntegerField(min_value=1)
+
+
+class BatchApplySerializer(serializers.Serializer):
+    items = BatchApplyItemSerializer(many=True, allow_empty=False, max_length=BATCH_APPLY_MAX_ITEMS)
@@ -1,40 +1,20 @@
-from rest_framework.serializers import ModelSerializer, SerializerMethodField
-from payments.models import Payment
+from rest_framework import serializers
 
-class PaymentListSerializer(ModelSerializer):
-    item_title = SerializerMethodField()
-    attempted_at = SerializerMethodField()
-    can_refund = SerializerMethodField()
 
-    class Meta:
-        model = Payment
-        fields = (
-            'id',
-            'amount',
-            'payment_method',
-            'item_title',
-            'status',
-            'can_refund',
-            'attempted_at',
-        )
+class PaymentListSerializer(serializers.Serializer):
+    """결제내역 목록 행(Payment.values_list(named=True) 행)을 직렬화한다.
 
-    def get_item_title(self, obj: Payment):
-        course_title = getattr(getattr(obj.course_registration, 'course', None), 'title', None) if obj.course_registration_id else None
-        if course_title is not None:
-            return course_title
-        test_title = getattr(getattr(obj.test_registration, 'test', None), 'title', None) if obj.test_registration_id else None
-        return test_title
+    item_title/attempted_at/신청 상태는 Payment 의 스냅샷 컬럼을 그대로 쓰므로 신청/대상 JOIN 이 필요 없다.
+    """
+    list_fields = ('id', 'amount', 'payment_method', 'item_title', 'status', 'registration_status', 'attempted_at', 'created_at')
 
-    def get_attempted_at(self, obj: Payment):
-        course_attempted = getattr(obj.course_registration, 'attempted_at', None) if obj.course_registration_id else None
-        if course_attempted is not None:
-            return course_attempted
-        test_attempted = getattr(obj.test_registration, 'attempted_at', None) if obj.test_registration_id else None
-        return test_attempted
+    id = serializers.IntegerField(read_only=True)
+    amount = serializers.IntegerField(read_only=True)
+    payment_method = serializers.CharField(read_only=True)
+    item_title = serializers.CharField(read_only=True, allow_null=True)
+    status = serializers.CharField(read_only=True)
+    can_refund = serializers.SerializerMethodField()
+    attempted_at = serializers.DateTimeField(read_only=True, allow_null=True)
 
-    def get_can_refund(self, obj: Payment):
-        registration = obj.course_registration if obj.course_registration_id else obj.test_registration if obj.test_registration_id else None
-        if registration is None:
-            return False
-        status_value = getattr(registration, 'status', None)
-        return status_value in {'registered', 'in_progress'}
\ No newline at end of file
+    def get_can_refund(self, obj):
+        return obj.registration_status in {'registered', 'in_progress'}
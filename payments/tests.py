@@ -1,18 +1,29 @@
+import json
 from datetime import timedelta
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
-from django.test import SimpleTestCase
+from django.test import AsyncRequestFactory, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, IntegrityError
 from unittest.mock import patch
 from types import SimpleNamespace
 from django.http import Http404
 from rest_framework.exceptions import APIException
 
 from payments.views.post_viewset import PaymentViewSet
-from courses.models import Course, CourseRegistration
+from payments.views.get_viewset import MePaymentsViewSet
+from courses.models import Course, CourseRegistration, CourseRegistrationCountShard, course_registration_counter
 from tests.models import Test, TestRegistration
-from payments.models import Payment
+from payments.models import Payment, IdempotencyKey
+from assignment.common.idempotency import local_responses
+from assignment.common.metrics import REGISTRY
+from django.core.management import call_command
+from io import StringIO
 from payments.serializers.payment_list_serializer import PaymentListSerializer
 
 
@@ -20,6 +31,8 @@ class MePaymentsViewSetTests(APITestCase):
     base_url = "/me/payments"
 
     def setUp(self):
+        # 목록 캐시는 사용자 간에 공유되므로 테스트마다 비운다.
+        caches["list"].clear()
         self.User = get_user_model()
         self.user = self.User.objects.create_user(email="p1@example.com", password="Str0ngP@ss!")
         token_res = self.client.post("/login", {"email": "p1@example.com", "password": "Str0ngP@ss!"}, format="json")
@@ -107,10 +120,178 @@ class MePaymentsViewSetTests(APITestCase):
 
         res = self.client.get(self.base_url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        amounts = [item["amount"] for item in res.data]
+        amounts = [item["amount"] for item in res.data["results"]]
         self.assertIn(1111, amounts)
         self.assertIn(2222, amounts)
-        self.assertEqual(res.data[0]["amount"], 2222)
+        self.assertEqual(res.data["results"][0]["amount"], 2222)
+
+    def test_list_paginated_by_default(self):
+        """
+        파라미터가 없어도 keyset 페이지네이션(limit 기본 20)으로 응답하고, 전체 배열은 stream=true 로만 받는다.
+        """
+        payments = [self._make_course_payment(self.user, self._make_course(title=f"Default-{i}"), amount=1000 + i) for i in range(3)]
+
+        with patch("assignment.config.pagination_config.KeysetPagination.default_limit", 2):
+            res = self.client.get(self.base_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data["results"]], [payments[2].id, payments[1].id])
+        self.assertIsNotNone(res.data["next"])
+        self.assertEqual(res.data["results"], self.client.get(f"{self.base_url}?pagination=cursor&limit=2").data["results"])
+
+        res = self.client.get(f"{self.base_url}?stream=true")
+        self.assertEqual(len(json.loads(b"".join(res.streaming_content))), 3)
+
+    def test_list_cursor_pagination(self):
+        """
+        pagination=cursor 면 (created_at, id) 내림차순으로 limit 개씩 next 링크를 따라 조회된다.
+        """
+        same_time = timezone.now()
+        payments = [self._make_course_payment(self.user, self._make_course(title=f"Cursor-{i}"), amount=1000 + i) for i in range(3)]
+        # created_at 이 같아도 id 로 순서가 정해진다.
+        Payment.objects.filter(pk__in=[p.pk for p in payments]).update(created_at=same_time)
+
+        res = self.client.get(f"{self.base_url}?pagination=cursor&limit=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.assertEqual([item["id"] for item in res.data["results"]], [payments[2].id, payments[1].id])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([item["id"] for item in res.data["results"]], [payments[0].id])
+        self.assertIsNone(res.data["next"])
+
+    def test_list_stream(self):
+        """
+        stream=true 면 필터가 적용된 전체 내역을 일반 응답과 같은 JSON 배열로 스트리밍한다.
+        """
+        course = self._make_course(title="Stream C")
+        test = self._make_test(title="Stream T")
+        self._make_course_payment(self.user, course, amount=1111)
+        self._make_test_payment(self.user, test, amount=2222, status_value="cancelled")
+
+        with patch("payments.views.get_viewset.MePaymentsViewSet.stream_chunk_size", 1):
+            res = self.client.get(f"{self.base_url}?stream=true")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/json")
+        streamed = json.loads(b"".join(res.streaming_content))
+        self.assertEqual(streamed, json.loads(json.dumps(self.client.get(self.base_url).data["results"])))
+
+        res = self.client.get(f"{self.base_url}?stream=true&status=paid")
+        self.assertEqual([item["amount"] for item in json.loads(b"".join(res.streaming_content))], [1111])
+
+        self.assertEqual(self.client.get(f"{self.base_url}?stream=yes").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_values_mode_matches_serializer_output(self):
+        """
+        LIST_VALUES_MODE 의 목록/스트리밍 응답은 serializer 경로와 바이트 단위로 같다.
+        """
+        course = self._make_course(title="Values C")
+        test = self._make_test(title="값 T")
+        self._make_course_payment(self.user, course, amount=1111)
+        self._make_test_payment(self.user, test, amount=2222, status_value="cancelled")
+
+        for url in (self.base_url, f"{self.base_url}?pagination=cursor&limit=1", f"{self.base_url}?stream=true"):
+            with override_settings(LIST_VALUES_MODE=True):
+                values_res = self.client.get(url)
+            with override_settings(LIST_VALUES_MODE=False):
+                serializer_res = self.client.get(url)
+            self.assertEqual(values_res.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(values_res.getvalue(), serializer_res.getvalue(), url)
+
+    def test_async_list_matches_sync_list(self):
+        """
+        ASYNC_LIST_VIEWS 의 async view 는 목록/cursor/스트리밍 모두 동기 list 와 같은 본문을 반환한다.
+        """
+        course = self._make_course(title="Async C")
+        test = self._make_test(title="Async T")
+        self._make_course_payment(self.user, course, amount=1111)
+        self._make_test_payment(self.user, test, amount=2222, status_value="cancelled")
+        view = MePaymentsViewSet.as_async_list_view(basename="me_payment", detail=False)
+
+        async def async_get(url):
+            res = await view(AsyncRequestFactory().get(url, headers={"Authorization": f"Bearer {self.access}"}))
+            if res.streaming:
+                return res.status_code, b"".join([chunk async for chunk in res.streaming_content])
+            return res.status_code, res.render().content
+
+        urls = [
+            self.base_url,
+            f"{self.base_url}?status=paid",
+            f"{self.base_url}?pagination=cursor&limit=1",
+            f"{self.base_url}?stream=true",
+            f"{self.base_url}?from=2024-13-01",
+        ]
+        for url in urls:
+            with patch("payments.views.get_viewset.MePaymentsViewSet.stream_chunk_size", 1):
+                status_code, body = async_to_sync(async_get)(url)
+                sync_res = self.client.get(url)
+            self.assertEqual(status_code, sync_res.status_code, url)
+            self.assertEqual(body, sync_res.getvalue(), url)
+
+    def test_payment_owner_denormalized(self):
+        """
+        결제 생성 시 신청의 user/대상 종류가 Payment.user/item_kind 로 채워지고, 목록은 user_id 조건 하나로 조회한다.
+        """
+        course_payment = self._make_course_payment(self.user, self._make_course(title="Owner C"))
+        test_payment = self._make_test_payment(self.user, self._make_test(title="Owner T"))
+        self.assertEqual((course_payment.user_id, course_payment.item_kind), (self.user.id, "course"))
+        self.assertEqual((test_payment.user_id, test_payment.item_kind), (self.user.id, "test"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.base_url)
+        self.assertEqual(len(res.data["results"]), 2)
+        list_sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "payments"' in q["sql"])
+        self.assertIn('"payments"."user_id" =', list_sql)
+        self.assertNotIn(" OR ", list_sql)
+
+    def test_list_reads_payment_snapshot_only(self):
+        """
+        목록은 payments 테이블 한 번만 조회하고, 완료/취소 시 갱신된 스냅샷으로 item_title/attempted_at/can_refund 를 채운다.
+        """
+        course = self._make_course(title="Snapshot C")
+        test = self._make_test(title="Snapshot T")
+        res = self.client.post(f"/courses/{course.id}/enroll", {"amount": 1000, "payment_method": "card"}, format="json")
+        course_payment_id = res.data["payment_id"]
+        res = self.client.post(f"/tests/{test.id}/apply", {"amount": 2000, "payment_method": "card"}, format="json")
+        test_payment_id = res.data["payment_id"]
+
+        self.assertEqual(self.client.post(f"/courses/{course.id}/complete", {}, format="json").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(f"/payments/{test_payment_id}/cancel", {}, format="json").status_code, status.HTTP_200_OK)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.get(self.base_url)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("JOIN", ctx.captured_queries[0]["sql"])
+
+        by_id = {item["id"]: item for item in res.data["results"]}
+        self.assertEqual(by_id[course_payment_id]["item_title"], "Snapshot C")
+        self.assertIsNotNone(by_id[course_payment_id]["attempted_at"])
+        self.assertFalse(by_id[course_payment_id]["can_refund"])
+        self.assertEqual(by_id[test_payment_id]["item_title"], "Snapshot T")
+        self.assertEqual(by_id[test_payment_id]["status"], "cancelled")
+        self.assertFalse(by_id[test_payment_id]["can_refund"])
+
+    def test_backfill_payment_owner(self):
+        """
+        backfill_payment_owner 는 user_id/스냅샷이 비어 있는 기존 결제를 id 구간 단위로 채운다.
+        """
+        payments = [
+            self._make_course_payment(self.user, self._make_course(title="Backfill C")),
+            self._make_test_payment(self.user, self._make_test(title="Backfill T")),
+        ]
+        Payment.objects.filter(pk__in=[p.pk for p in payments]).update(
+            user=None, item_kind=None, item_title=None, registration_status=None,
+        )
+        self.assertEqual(self.client.get(self.base_url).data["results"], [])
+
+        call_command("backfill_payment_owner", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(
+            sorted(Payment.objects.filter(pk__in=[p.pk for p in payments]).values_list("user_id", "item_kind", "item_title", "registration_status")),
+            [(self.user.id, "course", "Backfill C", "registered"), (self.user.id, "test", "Backfill T", "registered")],
+        )
+        self.assertEqual(len(self.client.get(self.base_url).data["results"]), 2)
 
     def test_serializer_fields_item_title_attempted_at(self):
         """
@@ -124,7 +305,7 @@ class MePaymentsViewSetTests(APITestCase):
 
         res = self.client.get(self.base_url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        by_amount = {item["amount"]: item for item in res.data}
+        by_amount = {item["amount"]: item for item in res.data["results"]}
         self.assertEqual(by_amount[1111]["item_title"], "Django 강의")
         self.assertIsNotNone(by_amount[1111]["attempted_at"])
         self.assertEqual(by_amount[2222]["item_title"], "모의고사 A")
@@ -155,7 +336,7 @@ class MePaymentsViewSetTests(APITestCase):
 
         res = self.client.get(f"{self.base_url}?status=paid&from={frm}&to={to}")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        amounts = [item["amount"] for item in res.data]
+        amounts = [item["amount"] for item in res.data["results"]]
         self.assertIn(2222, amounts)
         self.assertNotIn(1111, amounts)
 
@@ -176,7 +357,7 @@ class MePaymentsViewSetTests(APITestCase):
 
         res = self.client.get(f"{self.base_url}?status=cancelled&from={frm}&to={to}")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        amounts = [item["amount"] for item in res.data]
+        amounts = [item["amount"] for item in res.data["results"]]
         self.assertIn(2222, amounts)
         self.assertNotIn(1111, amounts)
 
@@ -198,7 +379,7 @@ class MePaymentsViewSetTests(APITestCase):
 
         res = self.client.get(f"{self.base_url}?from={frm}&to={to}")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        amounts = [item["amount"] for item in res.data]
+        amounts = [item["amount"] for item in res.data["results"]]
         self.assertIn(2222, amounts)
         self.assertNotIn(1111, amounts)
 
@@ -215,6 +396,8 @@ class PaymentCancelViewSetTests(APITestCase):
     base_url = "/payments"
 
     def setUp(self):
+        # 목록 캐시는 사용자 간에 공유되므로 테스트마다 비운다.
+        caches["list"].clear()
         self.User = get_user_model()
         self.user = self.User.objects.create_user(email="owner@example.com", password="Str0ngP@ss!")
         token_res = self.client.post("/login", {"email": "owner@example.com", "password": "Str0ngP@ss!"}, format="json")
@@ -280,6 +463,73 @@ class PaymentCancelViewSetTests(APITestCase):
         self.assertEqual(reg.status, "cancelled")
         self.assertEqual(pay.status, "cancelled")
 
+    def test_cancel_invalidates_list_cache(self):
+        """
+        결제 취소가 커밋되면 캐시된 수업 목록의 is_registered/registrations_count 가 갱신된다.
+        """
+        course = self._make_course()
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(f"/courses/{course.id}/enroll", {"amount": 1000, "payment_method": "card"}, format="json")
+        payment_id = res.data["payment_id"]
+        item = self.client.get("/courses").data["results"][0]
+        self.assertTrue(item["is_registered"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{self.base_url}/{payment_id}/cancel", {}, format="json")
+        item = self.client.get("/courses").data["results"][0]
+        self.assertFalse(item["is_registered"])
+        self.assertEqual(item["registrations_count"], 0)
+
+    @override_settings(REGISTRATION_COUNTER_MODE="sharded")
+    def test_cancel_sharded_counter(self):
+        """
+        sharded 모드의 취소는 부모 행 대신 샤드에 -1 을 기록하고, rollup 후 registrations_count 가 줄어든다.
+        """
+        course = self._make_course()
+        res = self.client.post(f"/courses/{course.id}/enroll", {"amount": 1000, "payment_method": "card"}, format="json")
+        course_registration_counter.rollup()
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 1)
+
+        self.client.post(f"{self.base_url}/{res.data['payment_id']}/cancel", {}, format="json")
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 1)
+        self.assertEqual(CourseRegistrationCountShard.objects.get(course=course).delta, -1)
+
+        self.assertEqual(course_registration_counter.rollup([course.id]), [course.id])
+        course.refresh_from_db()
+        self.assertEqual(course.registrations_count, 0)
+
+    def test_cancel_idempotency_key_replay(self):
+        """
+        같은 Idempotency-Key 로 취소를 재시도하면 409 대신 처음 200 응답을 돌려주고 행을 다시 잠그지 않는다.
+        """
+        local_responses.clear()
+        course = self._make_course()
+        res = self.client.post(f"/courses/{course.id}/enroll", {"amount": 1000, "payment_method": "card"}, format="json")
+        url = f"{self.base_url}/{res.data['payment_id']}/cancel"
+        first = self.client.post(url, {}, format="json", HTTP_IDEMPOTENCY_KEY="cancel-1")
+        self.assertEqual(first.status_code, status.HTTP_200_OK, first.data)
+
+        with patch.object(PaymentViewSet, "_lock_payment_or_404") as lock:
+            again = self.client.post(url, {}, format="json", HTTP_IDEMPOTENCY_KEY="cancel-1")
+        lock.assert_not_called()
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data, first.data)
+
+        self.assertEqual(self.client.post(url, {}, format="json").status_code, status.HTTP_409_CONFLICT)
+
+    def test_sweep_idempotency_keys(self):
+        """
+        sweep_idempotency_keys 는 보관 기간이 지난 키만 삭제한다.
+        """
+        old = IdempotencyKey.objects.create(user=self.user, key="old", fingerprint="POST /x", status_code=200, response_body={})
+        fresh = IdempotencyKey.objects.create(user=self.user, key="fresh", fingerprint="POST /x", status_code=200, response_body={})
+        IdempotencyKey.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+
+        call_command("sweep_idempotency_keys", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(list(IdempotencyKey.objects.values_list("id", flat=True)), [fresh.id])
+
     def test_cancel_not_found(self):
         """
         존재하지 않는 결제 → 404
@@ -316,6 +566,29 @@ class PaymentCancelViewSetTests(APITestCase):
         self.assertTrue(CourseRegistration.objects.filter(id=reg.id).exists())
         self.assertTrue(Payment.objects.filter(id=pay.id).exists())
 
+    def test_cancel_outcome_and_select_for_update_metrics(self):
+        """
+        결제 취소 결과별 카운터와 select_for_update 조회 시간 histogram 이 갱신된다. (404 로 실패한 조회는 제외)
+        """
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        course = self._make_course()
+        reg = CourseRegistration.objects.create(user=self.user, course=course)
+        pay = Payment.objects.create(course_registration=reg, amount=1000, payment_method="card", status="paid")
+        before = {
+            outcome: sample("payment_cancels_total", outcome=outcome) for outcome in ("cancelled", "conflict", "not_found")
+        }
+        lookups = sample("select_for_update_seconds_count", site="payment_cancel")
+
+        self.assertEqual(self.client.post(f"{self.base_url}/{pay.id}/cancel").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(f"{self.base_url}/{pay.id}/cancel").status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.post(f"{self.base_url}/999999/cancel").status_code, status.HTTP_404_NOT_FOUND)
+
+        for outcome, count in before.items():
+            self.assertEqual(sample("payment_cancels_total", outcome=outcome) - count, 1, outcome)
+        self.assertEqual(sample("select_for_update_seconds_count", site="payment_cancel") - lookups, 2)
+
     def test_cancel_conflict_already_cancelled_registration(self):
         """
         이미 취소된 신청이면 409 반환
@@ -384,12 +657,136 @@ class PaymentCancelViewSetTests(APITestCase):
         self.assertEqual(got.id, reg.id)
 
 
+class PaymentBatchApplyViewSetTests(APITestCase):
+    base_url = "/payments/batch"
+
+    def setUp(self):
+        # 목록 캐시는 사용자 간에 공유되므로 테스트마다 비운다.
+        caches["list"].clear()
+        self.User = get_user_model()
+        self.user = self.User.objects.create_user(email="cart@example.com", password="Str0ngP@ss!")
+        self.client.force_authenticate(self.user)
+
+    def _make_course(self, title="Course", start_delta=-1, end_delta=1, is_active=True):
+        now = timezone.now()
+        return Course.objects.create(
+            title=title,
+            start_at=now + timedelta(days=start_delta),
+            end_at=now + timedelta(days=end_delta),
+            is_active=is_active,
+        )
+
+    def _make_test(self, title="Test", start_delta=-1, end_delta=1, is_active=True):
+        now = timezone.now()
+        return Test.objects.create(
+            title=title,
+            start_at=now + timedelta(days=start_delta),
+            end_at=now + timedelta(days=end_delta),
+            is_active=is_active,
+        )
+
+    def _item(self, kind, item_id, amount=1000):
+        return {"kind": kind, "id": item_id, "amount": amount, "payment_method": "card"}
+
+    def test_batch_requires_auth(self):
+        """
+        인증 없이 일괄 신청 시 401
+        """
+        self.client.force_authenticate(None)
+        res = self.client.post(self.base_url, {"items": []}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_batch_per_item_results(self):
+        """
+        항목별로 201/404/400/409 결과를 요청 순서대로 돌려주고, 성공한 항목만 신청/결제/신청 수가 반영된다.
+        """
+        course = self._make_course(title="Cart Course")
+        test = self._make_test(title="Cart Test")
+        closed = self._make_course(title="Closed", is_active=False)
+        registered = self._make_test(title="Registered")
+        TestRegistration.objects.create(user=self.user, test=registered)
+
+        res = self.client.post(self.base_url, {"items": [
+            self._item("course", course.id, amount=3000),
+            self._item("test", test.id),
+            self._item("course", 999999),
+            self._item("course", closed.id),
+            self._item("test", registered.id),
+            self._item("course", course.id),
+        ]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        results = res.data["results"]
+        self.assertEqual([r["status"] for r in results], [201, 201, 404, 400, 409, 409])
+        self.assertEqual(results[2]["detail"], "존재하지 않는 수업입니다.")
+        self.assertEqual(results[3]["detail"], "수업 수강 가능한 수업이 아닙니다.")
+        self.assertEqual(results[4]["detail"], "이미 응시 신청된 시험입니다.")
+        self.assertEqual(results[5]["detail"], "이미 수업 수강 신청된 수업입니다.")
+
+        reg = CourseRegistration.objects.get(id=results[0]["registration_id"])
+        self.assertEqual((reg.user_id, reg.course_id), (self.user.id, course.id))
+        pay = Payment.objects.get(id=results[0]["payment_id"])
+        self.assertEqual((pay.course_registration_id, pay.amount, pay.status), (reg.id, 3000, "paid"))
+        self.assertEqual((pay.user_id, pay.item_kind), (self.user.id, "course"))
+        self.assertIsNotNone(pay.paid_at)
+        self.assertEqual(Payment.objects.get(id=results[1]["payment_id"]).test_registration.test_id, test.id)
+
+        course.refresh_from_db()
+        test.refresh_from_db()
+        self.assertEqual((course.registrations_count, test.registrations_count), (1, 1))
+
+    def test_batch_query_count_independent_of_item_count(self):
+        """
+        항목 수가 늘어나도 kind 별 쿼리 수는 그대로다. (검증 2회 + bulk insert 2회 + 카운터 1회)
+        """
+        counts = []
+        for n in (1, 5):
+            courses = [self._make_course(title=f"Bulk-{n}-{i}") for i in range(n)]
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(self.base_url, {"items": [self._item("course", c.id) for c in courses]}, format="json")
+            self.assertEqual([r["status"] for r in res.data["results"]], [201] * n)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_batch_retries_per_item_on_concurrent_conflict(self):
+        """
+        bulk insert 가 동시 신청과 충돌하면 항목별로 다시 시도해 충돌한 항목만 409 로 응답한다.
+        """
+        first = self._make_course(title="Race-1")
+        second = self._make_course(title="Race-2")
+        original = PaymentViewSet._bulk_insert_registrations
+        calls = []
+
+        def flaky(view, user, target, items, titles, now):
+            calls.append([item["id"] for item in items])
+            if len(items) > 1 or items[0]["id"] == second.id:
+                raise IntegrityError("uniq_active_course_registration")
+            return original(view, user, target, items, titles, now)
+
+        with patch.object(PaymentViewSet, "_bulk_insert_registrations", flaky):
+            res = self.client.post(self.base_url, {"items": [self._item("course", first.id), self._item("course", second.id)]}, format="json")
+        self.assertEqual([r["status"] for r in res.data["results"]], [201, 409])
+        self.assertEqual(calls, [[first.id, second.id], [first.id], [second.id]])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.registrations_count, second.registrations_count), (1, 0))
+
+    def test_batch_validation_error(self):
+        """
+        빈 목록, 잘못된 kind/결제수단은 요청 전체를 400 으로 거절한다.
+        """
+        self.assertEqual(self.client.post(self.base_url, {"items": []}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        bad_kind = {"kind": "book", "id": 1, "amount": 1000, "payment_method": "card"}
+        self.assertEqual(self.client.post(self.base_url, {"items": [bad_kind]}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        bad_method = {"kind": "course", "id": 1, "amount": 1000, "payment_method": "cash"}
+        self.assertEqual(self.client.post(self.base_url, {"items": [bad_method]}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class PaymentListSerializerUnitTests(SimpleTestCase):
     def test_get_can_refund_returns_false_when_no_registration_links(self):
         """
-        course_registration_id/test_registration_id가 모두 없으면 False를 반환한다
-        (모델 제약상 실서비스에선 없음. 그냥 커버리지를 위해..)
+        신청 상태 스냅샷이 없으면(backfill 전 행) False를 반환한다
         """
-        dummy = SimpleNamespace(course_registration_id=None, test_registration_id=None)
         serializer = PaymentListSerializer()
-        self.assertFalse(serializer.get_can_refund(dummy))
\ No newline at end of file
+        self.assertFalse(serializer.get_can_refund(SimpleNamespace(registration_status=None)))
+        self.assertTrue(serializer.get_can_refund(SimpleNamespace(registration_status="in_progress")))
+        self.assertFalse(serializer.get_can_refund(SimpleNamespace(registration_status="completed")))
\ No newline at end of file
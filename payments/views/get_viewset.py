@@ -1,20 +1,124 @@
 from datetime import date, datetime, time as dtime
-from django.db.models import Q
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.timezone import make_aware
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.mixins import ListModelMixin
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from assignment.common.api_errors import api_error
+from assignment.common.async_list_mixin import AsyncListMixin
+from assignment.common.json_renderers import dumps
+from assignment.common.pagination_mode_mixin import PaginationModeMixin
+from assignment.common.query_budget import query_budget
+from assignment.common.row_encoder import RowEncoder
+from assignment.config.pagination_config import KeysetPagination
 
 from payments.models import Payment
 from payments.serializers.payment_list_serializer import PaymentListSerializer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
-@extend_schema(tags=['결제'], summary='결제내역 조회')
-class MePaymentsViewSet(ListModelMixin, GenericViewSet):
+@extend_schema(
+    tags=['결제'],
+    summary='결제내역 조회',
+    parameters=[
+        OpenApiParameter(name='pagination', type=OpenApiTypes.STR, required=False, description='(created_at, id) 기준 cursor 페이지네이션 (기본값)', enum=['cursor']),
+        OpenApiParameter(name='cursor', type=OpenApiTypes.STR, required=False, description='cursor 모드의 next/previous 링크에 포함된 cursor 값'),
+        OpenApiParameter(name='limit', type=OpenApiTypes.INT, required=False, description='페이지 크기'),
+        OpenApiParameter(name='stream', type=OpenApiTypes.BOOL, required=False, description='true 면 페이지네이션 없이 전체 내역을 JSON 배열로 스트리밍 (내보내기용)'),
+    ],
+)
+class MePaymentsViewSet(AsyncListMixin, PaginationModeMixin, ListModelMixin, GenericViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = PaymentListSerializer
+    # 내역 길이와 무관하게 응답 크기가 일정하도록 기본 응답도 keyset 페이지네이션한다.
+    # 전체 배열은 ?stream=true 로 명시했을 때만 (chunk 단위 스트리밍으로) 내보낸다.
+    pagination_class = KeysetPagination
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+    row_encoder = RowEncoder(PaymentListSerializer, PaymentListSerializer.list_fields)
+
+    @query_budget(1)
+    def list(self, request, *args, **kwargs):
+        if self.is_stream_requested():
+            return self.stream_list()
+        if not settings.LIST_VALUES_MODE:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.row_encoder.encode_many(page))
+        return Response(self.row_encoder.encode_many(queryset))
+
+    @query_budget(1)
+    async def alist(self, request, *args, **kwargs):
+        if self.is_stream_requested():
+            return self.astream_list()
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        items = page if page is not None else [row async for row in queryset]
+        if settings.LIST_VALUES_MODE:
+            data = self.row_encoder.encode_many(items)
+        else:
+            data = self.get_serializer(items, many=True).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def encode_row(self):
+        """스트리밍 응답에서 행 하나를 dict 로 바꾸는 함수."""
+        if settings.LIST_VALUES_MODE:
+            return self.row_encoder.encode
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return lambda payment: serializer_class(payment, context=context).data
+
+    def is_stream_requested(self):
+        value = self.request.query_params.get(self.stream_query_param, '')
+        if value not in ('', 'true', 'false'):
+            raise api_error(HTTP_400_BAD_REQUEST, '허용값: true, false')
+        return value == 'true'
+
+    def stream_list(self):
+        # 서버 사이드 cursor 로 chunk 단위만 읽고 바로 내보내므로 내역 길이와 무관하게 메모리가 일정하다.
+        queryset = self.filter_queryset(self.get_queryset())
+        encode = self.encode_row()
+        chunk_size = self.stream_chunk_size
+
+        def rows():
+            yield b'['
+            buffer = []
+            for index, payment in enumerate(queryset.iterator(chunk_size=chunk_size)):
+                item = dumps(encode(payment))
+                buffer.append(item if index == 0 else b',' + item)
+                if len(buffer) >= chunk_size:
+                    yield b''.join(buffer)
+                    buffer = []
+            yield b''.join(buffer) + b']'
+
+        return StreamingHttpResponse(rows(), content_type='application/json')
+
+    def astream_list(self):
+        # stream_list 와 같은 본문을 aiterator 로 만든다. chunk 를 기다리는 동안 이벤트 루프를 막지 않는다.
+        queryset = self.filter_queryset(self.get_queryset())
+        encode = self.encode_row()
+        chunk_size = self.stream_chunk_size
+
+        async def rows():
+            yield b'['
+            buffer = []
+            index = 0
+            async for payment in queryset.aiterator(chunk_size=chunk_size):
+                item = dumps(encode(payment))
+                buffer.append(item if index == 0 else b',' + item)
+                index += 1
+                if len(buffer) >= chunk_size:
+                    yield b''.join(buffer)
+                    buffer = []
+            yield b''.join(buffer) + b']'
+
+        return StreamingHttpResponse(rows(), content_type='application/json')
 
     def get_queryset(self):
         user = self.request.user
@@ -25,12 +129,13 @@ class MePaymentsViewSet(ListModelMixin, GenericViewSet):
         return queryset
 
     def _base_queryset(self, user):
-        return Payment.objects.select_related(
-            'course_registration__course',
-            'test_registration__test',
-        ).filter(
-            Q(course_registration__user=user) | Q(test_registration__user=user)
-        ).order_by('-created_at')
+        # 비정규화한 user_id/스냅샷 컬럼만 읽으므로 (user_id, created_at, id) 인덱스 + payments 단일 테이블로 끝난다.
+        return (
+            Payment.objects
+            .filter(user_id=user.id)
+            .order_by('-created_at', '-id')
+            .values_list(*PaymentListSerializer.list_fields, named=True)
+        )
 
     def _apply_status_filter(self, queryset, status_param):
         if not status_param:
@@ -1,33 +1,68 @@
-from django.db import transaction
-from django.db.models import F
+from collections import Counter
+
+from django.db import transaction, IntegrityError
+from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 from django.http import Http404
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
 
 from payments.models import Payment
-from courses.models import CourseRegistration, Course
-from tests.models import TestRegistration, Test
+from courses.models import Course, CourseRegistration, course_registration_counter
+from tests.models import Test, TestRegistration, test_registration_counter
 from assignment.common.api_errors import api_error
+from assignment.common.list_cache import invalidate_item_counts
+from assignment.common.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from assignment.common.metrics import count_cancel_outcomes, observe_select_for_update
+from assignment.common.query_budget import query_budget
+from payments.serializers.batch_apply_serializer import BatchApplySerializer
 from drf_spectacular.utils import extend_schema
 
+# 일괄 신청 kind 별 대상 모델/카운터/응답 메시지 (메시지는 개별 신청 API 와 동일)
+BATCH_APPLY_TARGETS = {
+    'course': {
+        'item_model': Course,
+        'registration_model': CourseRegistration,
+        'item_field': 'course',
+        'payment_field': 'course_registration',
+        'counter': course_registration_counter,
+        'not_found_message': '존재하지 않는 수업입니다.',
+        'not_applicable_message': '수업 수강 가능한 수업이 아닙니다.',
+        'conflict_message': '이미 수업 수강 신청된 수업입니다.',
+    },
+    'test': {
+        'item_model': Test,
+        'registration_model': TestRegistration,
+        'item_field': 'test',
+        'payment_field': 'test_registration',
+        'counter': test_registration_counter,
+        'not_found_message': '존재하지 않는 시험입니다.',
+        'not_applicable_message': '응시 가능한 시험이 아닙니다.',
+        'conflict_message': '이미 응시 신청된 시험입니다.',
+    },
+}
+
 
 class PaymentViewSet(GenericViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Payment.objects.all()
 
-    @extend_schema(tags=['결제'], request=None, summary='결제 취소')
+    @extend_schema(tags=['결제'], request=None, summary='결제 취소', parameters=[IDEMPOTENCY_KEY_PARAMETER])
     @action(detail=True, methods=["post"], url_path="cancel")
+    @idempotent
+    @count_cancel_outcomes
+    @query_budget(5)
     def cancel(self, request, pk):
         with transaction.atomic():
-            payment = self._lock_payment_or_404(pk)
-            registration = self._lock_registration_or_400(payment)
+            with observe_select_for_update('payment_cancel'):
+                payment = self._lock_payment_or_404(pk)
+                registration = self._lock_registration_or_400(payment)
             self._ensure_ownership_with_registration_or_403(registration, request.user)
             self._validate_not_completed_or_409(registration)
             self._cancel_registration_if_needed(registration)
-            self._cancel_payment_if_needed(payment)
+            self._cancel_payment_if_needed(payment, registration)
 
         return Response(
             {
@@ -39,12 +74,119 @@ class PaymentViewSet(GenericViewSet):
             status=HTTP_200_OK,
         )
         
+    @extend_schema(tags=['결제'], request=BatchApplySerializer, summary='수업/시험 일괄 신청', parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @action(detail=False, methods=["post"], url_path="batch")
+    @idempotent
+    @query_budget(10)
+    def batch(self, request):
+        serializer = BatchApplySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['items']
+
+        results = [None] * len(items)
+        with transaction.atomic():
+            for kind, target in BATCH_APPLY_TARGETS.items():
+                indexes = [i for i, item in enumerate(items) if item['kind'] == kind]
+                if indexes:
+                    self._apply_batch_kind(request.user, kind, target, items, indexes, results)
+
+        return Response({"results": results}, status=HTTP_200_OK)
+
+    def _apply_batch_kind(self, user, kind, target, items, indexes, results) -> None:
+        now = timezone.now()
+        item_ids = {items[i]['id'] for i in indexes}
+        item_column = f"{target['item_field']}_id"
+        # 대상 모델/신청 모델마다 한 번씩만 조회해서 모든 항목을 검증한다.
+        found = {
+            row['id']: row
+            for row in target['item_model'].objects.filter(pk__in=item_ids).values('id', 'title', 'is_active', 'start_at', 'end_at')
+        }
+        registered = set(
+            target['registration_model'].objects
+            .filter(user_id=user.id, **{f'{item_column}__in': item_ids})
+            .exclude(status='cancelled')
+            .values_list(item_column, flat=True)
+        )
+
+        accepted = []
+        for i in indexes:
+            item_id = items[i]['id']
+            row = found.get(item_id)
+            if row is None:
+                results[i] = self._batch_error(items[i], HTTP_404_NOT_FOUND, target['not_found_message'])
+            elif not (row['is_active'] and row['start_at'] <= now <= row['end_at']):
+                results[i] = self._batch_error(items[i], HTTP_400_BAD_REQUEST, target['not_applicable_message'])
+            elif item_id in registered:
+                results[i] = self._batch_error(items[i], HTTP_409_CONFLICT, target['conflict_message'])
+            else:
+                # 같은 요청 안의 중복 항목도 두 번째부터 409 로 처리한다.
+                registered.add(item_id)
+                accepted.append(i)
+        if not accepted:
+            return
+
+        titles = {item_id: row['title'] for item_id, row in found.items()}
+        try:
+            with transaction.atomic():
+                created = dict(zip(accepted, self._bulk_insert_registrations(user, target, [items[i] for i in accepted], titles, now)))
+        except IntegrityError:
+            # 다른 요청과 같은 항목을 동시에 신청한 경우에만 항목별 savepoint 로 다시 시도한다.
+            created = {}
+            for i in accepted:
+                try:
+                    with transaction.atomic():
+                        created[i] = self._bulk_insert_registrations(user, target, [items[i]], titles, now)[0]
+                except IntegrityError:
+                    results[i] = self._batch_error(items[i], HTTP_409_CONFLICT, target['conflict_message'])
+
+        target['counter'].add_many(Counter(items[i]['id'] for i in created))
+        for i, (registration, payment) in created.items():
+            results[i] = {
+                "kind": kind,
+                "id": items[i]['id'],
+                "status": HTTP_201_CREATED,
+                "registration_id": registration.id,
+                "payment_id": payment.id,
+            }
+        for item_id in {items[i]['id'] for i in created}:
+            invalidate_item_counts(kind, item_id)
+
+    def _bulk_insert_registrations(self, user, target, items, titles, now):
+        # bulk_create 는 post_save 시그널을 보내지 않으므로 카운터는 호출한 쪽에서 한 번에 반영한다.
+        registration_model = target['registration_model']
+        registrations = registration_model.objects.bulk_create([
+            registration_model(user_id=user.id, **{f"{target['item_field']}_id": item['id']})
+            for item in items
+        ])
+        payments = Payment.objects.bulk_create([
+            Payment(
+                **{target['payment_field']: registration},
+                user_id=user.id,
+                item_kind=target['item_field'],
+                item_title=titles[item['id']],
+                registration_status=registration.status,
+                amount=item['amount'],
+                payment_method=item['payment_method'],
+                status='paid',
+                paid_at=now,
+            )
+            for registration, item in zip(registrations, items)
+        ])
+        return list(zip(registrations, payments))
+
+    def _batch_error(self, item, status_code, message):
+        return {"kind": item['kind'], "id": item['id'], "status": status_code, "detail": message}
+
     def _lock_payment_or_404(self, pk) -> Payment:
         try:
             return (
                 Payment.objects
                 .select_for_update()
-                .only('id', 'course_registration_id', 'test_registration_id', 'status')
+                # Payment.save 가 확인하는 스냅샷/취소 시각 컬럼까지 읽어야 저장 시 deferred 필드를 다시 조회하지 않는다.
+                .only(
+                    'id', 'course_registration_id', 'test_registration_id', 'status',
+                    'user_id', 'item_kind', 'item_title', 'canceled_at',
+                )
                 .get(pk=pk)
             )
         except Payment.DoesNotExist:
@@ -66,15 +208,18 @@ class PaymentViewSet(GenericViewSet):
             test_id = getattr(registration, "test_id", None)
 
             if course_id is not None:
-                Course.objects.filter(pk=course_id).update(registrations_count=F('registrations_count') - 1)
+                course_registration_counter.add(course_id, -1)
+                invalidate_item_counts('course', course_id)
             if test_id is not None:
-                Test.objects.filter(pk=test_id).update(registrations_count=F('registrations_count') - 1)
+                test_registration_counter.add(test_id, -1)
+                invalidate_item_counts('test', test_id)
 
 
-    def _cancel_payment_if_needed(self, payment: Payment) -> None:
+    def _cancel_payment_if_needed(self, payment: Payment, registration) -> None:
         if payment.status != "cancelled":
             payment.status = "cancelled"
-        payment.save(update_fields=["status","canceled_at"]) 
+        payment.registration_status = registration.status
+        payment.save(update_fields=["status", "canceled_at", "registration_status"])
 
     def _ensure_ownership_with_registration_or_403(self, registration, user) -> None:
         user_id = getattr(registration, 'user_id', None)
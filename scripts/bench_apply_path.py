@@ -0,0 +1,82 @@
+"""수업 신청(POST /courses/{id}/enroll) 기본 경로 vs 단일 CTE fast path 비교 벤치마크.
+
+각 요청은 트랜잭션 안에서 실행 후 롤백하므로 데이터가 남지 않는다.
+사용법: python scripts/bench_apply_path.py --iterations 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 측정 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from assignment.benchmarks.report import percentile
+from courses.models import Course
+
+
+class Rollback(Exception):
+    pass
+
+
+def run_once(client, course_id):
+    started = time.perf_counter()
+    try:
+        with transaction.atomic(), CaptureQueriesContext(connection) as ctx:
+            res = client.post(f"/courses/{course_id}/enroll", {"amount": 10000, "payment_method": "card"}, format="json")
+            elapsed = (time.perf_counter() - started) * 1000
+            raise Rollback
+    except Rollback:
+        pass
+    assert res.status_code == 201, res.data
+    return elapsed, len(ctx.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    user = get_user_model().objects.order_by('id').first()
+    if user is None:
+        sys.exit("사용자가 없습니다. scripts/seed_dummy_data.py 로 데이터를 먼저 생성하세요.")
+    now = timezone.now()
+    course_ids = list(
+        Course.objects.filter(is_active=True, period__contains=now)
+        .exclude(registrations__user=user)
+        .values_list('id', flat=True)[:args.iterations]
+    )
+    client = APIClient(HTTP_HOST='localhost')
+    client.force_authenticate(user)
+
+    print(f"courses: {len(course_ids)} targets, user={user.id}")
+    for name, fast in (('default', False), ('fast', True)):
+        with override_settings(REGISTRATION_APPLY_FAST_PATH=fast):
+            for course_id in course_ids[:5]:
+                run_once(client, course_id)
+            results = [run_once(client, course_id) for course_id in course_ids]
+        samples = [elapsed for elapsed, _ in results]
+        print(
+            f"  {name:<8} queries={results[0][1]:2d} p50={statistics.median(samples):7.2f}ms "
+            f"p95={percentile(samples, 95):7.2f}ms max={max(samples):7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""같은 워커 수(CPU 예산)에서 WSGI(gthread) / ASGI(uvicorn worker) 목록 처리량 비교.
+
+각 프로필로 gunicorn 을 띄우고 scripts/locustfile.py 의 APIUser 목록 task 를 headless 로 돌린 뒤
+req/s 와 p50/p95/max 를 출력한다. DB/Redis 설정은 현재 환경 변수를 그대로 쓴다.
+
+wsgi: gunicorn assignment.wsgi -w N --worker-class gthread --threads 2
+asgi: gunicorn assignment.asgi -w N -k uvicorn_worker.UvicornWorker
+      (ASYNC_LIST_VIEWS=true, POSTGRES_CONN_MAX_AGE=0)
+
+사용법: python scripts/bench_asgi_wsgi.py --users 40 --duration 60 --workers 4
+"""
+import argparse
+import csv
+import os
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+LIST_TAGS = ['courses_list', 'courses_popular', 'courses_paged', 'courses_available']
+
+
+def server_command(profile, workers, bind):
+    if profile == 'asgi':
+        return [
+            'gunicorn', 'assignment.asgi:application', '-b', bind, '-w', str(workers),
+            '-k', 'uvicorn_worker.UvicornWorker', '--timeout', '60',
+        ]
+    return [
+        'gunicorn', 'assignment.wsgi:application', '-b', bind, '-w', str(workers),
+        '--worker-class', 'gthread', '--threads', '2', '--timeout', '60',
+    ]
+
+
+def server_env(profile):
+    env = dict(os.environ)
+    if profile == 'asgi':
+        env['ASYNC_LIST_VIEWS'] = 'true'
+        # ASGI 는 요청마다 다른 스레드에서 DB 연결을 열기 때문에 영구 연결을 쓰면 연결이 쌓인다.
+        env['POSTGRES_CONN_MAX_AGE'] = '0'
+    else:
+        env['ASYNC_LIST_VIEWS'] = 'false'
+    return env
+
+
+def wait_until_ready(host, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'{host}/courses', timeout=2)
+        except urllib.error.HTTPError:
+            return  # 401 이면 서버는 떠 있다.
+        except OSError:
+            time.sleep(0.5)
+            continue
+        return
+    raise RuntimeError(f'{host} 가 {timeout}초 안에 응답하지 않습니다.')
+
+
+def run_profile(profile, args):
+    bind = f'127.0.0.1:{args.port}'
+    host = f'http://localhost:{args.port}'
+    server = subprocess.Popen(
+        server_command(profile, args.workers, bind), cwd=BASE_DIR, env=server_env(profile),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(host)
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, profile)
+            subprocess.run(
+                [
+                    'locust', '-f', str(BASE_DIR / 'scripts' / 'locustfile.py'), '--headless',
+                    '-u', str(args.users), '-r', str(args.spawn_rate), '-t', f'{args.duration}s',
+                    '--host', host, '--csv', prefix, '--only-summary', 'APIUser', '--tags', *args.tags,
+                ],
+                cwd=BASE_DIR, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            with open(f'{prefix}_stats.csv', newline='') as f:
+                return next(row for row in csv.DictReader(f) if row['Name'] == 'Aggregated')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profiles', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--users', type=int, default=40)
+    parser.add_argument('--spawn-rate', type=int, default=10)
+    parser.add_argument('--duration', type=int, default=60)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--tags', nargs='+', default=LIST_TAGS)
+    args = parser.parse_args()
+
+    print(f'workers={args.workers}, users={args.users}, duration={args.duration}s, cpus={os.cpu_count()}')
+    for profile in args.profiles:
+        stats = run_profile(profile, args)
+        print(
+            f"  {profile:<4} req/s={float(stats['Requests/s']):7.2f} "
+            f"fails={stats['Failure Count']:>4} "
+            f"p50={stats['50%']:>6}ms p95={stats['95%']:>6}ms max={float(stats['Max Response Time']):8.0f}ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
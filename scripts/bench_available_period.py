@@ -0,0 +1,71 @@
+"""status=available&sort=popular 목록 쿼리의 기간 조건 비교 벤치마크.
+
+before: is_active AND start_at <= now AND end_at >= now  (btree 인덱스 한쪽 경계만 사용)
+after : is_active AND period @> now                      (부분 GiST 인덱스)
+
+사용법: python scripts/bench_available_period.py --iterations 200 --resource courses
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 측정 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from django.utils import timezone
+from courses.models import Course
+from tests.models import Test
+from assignment.benchmarks.report import percentile
+
+MODELS = {'courses': Course, 'tests': Test}
+ORDERING = ('-registrations_count', '-created_at', '-id')
+
+
+def before_filter(queryset, now):
+    return queryset.filter(is_active=True, start_at__lte=now, end_at__gte=now)
+
+
+def after_filter(queryset, now):
+    return queryset.filter(is_active=True, period__contains=now)
+
+
+def run_once(model, apply_filter, limit):
+    # 목록 API 와 같은 형태: 페이지 조회 + COUNT(*)
+    started = time.perf_counter()
+    queryset = apply_filter(model.objects.all(), timezone.now())
+    list(queryset.order_by(*ORDERING)[:limit])
+    queryset.count()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--resource', choices=sorted(MODELS), default='courses')
+    args = parser.parse_args()
+
+    model = MODELS[args.resource]
+    print(f"{args.resource}: rows={model.objects.count()}, iterations={args.iterations}")
+    for name, apply_filter in (('before', before_filter), ('after', after_filter)):
+        for _ in range(5):
+            run_once(model, apply_filter, args.limit)
+        samples = [run_once(model, apply_filter, args.limit) for _ in range(args.iterations)]
+        print(
+            f"  {name:<6} p50={statistics.median(samples):8.2f}ms "
+            f"p95={percentile(samples, 95):8.2f}ms max={max(samples):8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""JSON renderer backend 비교 벤치마크. (응답 데이터 → 바이트 렌더링 시간만 측정)
+
+/courses?limit=100 과 /me/payments?limit=100 응답 데이터를 한 번 만들어 두고
+JSON_BACKEND=stdlib / orjson 으로 각각 렌더링한다. 두 결과가 바이트 단위로 같은지도 확인한다.
+
+사용법: python scripts/bench_json_renderer.py --iterations 500 [--email bench@example.com]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 측정 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from assignment.benchmarks.report import percentile
+from assignment.common.json_renderers import FastJSONRenderer, orjson
+from courses.views.course_viewset import CourseViewSet
+from payments.models import Payment
+from payments.views.get_viewset import MePaymentsViewSet
+
+BACKENDS = ('stdlib', 'orjson')
+
+
+def pick_user(email):
+    User = get_user_model()
+    if email:
+        return User.objects.get(email=email)
+    # 결제내역이 있는 사용자를 우선 사용한다.
+    user_id = Payment.objects.order_by('-id').values_list('user_id', flat=True).first()
+    return User.objects.get(pk=user_id) if user_id else User.objects.order_by('id').first()
+
+
+def fetch_data(view, path, user):
+    request = APIRequestFactory().get(path, HTTP_HOST='localhost')
+    force_authenticate(request, user=user)
+    with override_settings(LIST_CACHE_ENABLED=False):
+        return view(request).data
+
+
+def run_once(renderer, data):
+    started = time.perf_counter()
+    renderer.render(data)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--email')
+    args = parser.parse_args()
+
+    if orjson is None:
+        print('orjson 이 설치되어 있지 않아 stdlib 만 측정합니다.')
+    user = pick_user(args.email)
+    targets = {
+        '/courses?limit=100': fetch_data(CourseViewSet.as_view({'get': 'list'}), '/courses?limit=100', user),
+        '/me/payments?limit=100': fetch_data(MePaymentsViewSet.as_view({'get': 'list'}), '/me/payments?limit=100', user),
+    }
+    renderer = FastJSONRenderer()
+    for path, data in targets.items():
+        rows = data['results'] if isinstance(data, dict) else data
+        rendered = {}
+        print(f"{path}: rows={len(rows)}, iterations={args.iterations}")
+        for backend in BACKENDS:
+            with override_settings(JSON_BACKEND=backend):
+                rendered[backend] = renderer.render(data)
+                for _ in range(5):
+                    run_once(renderer, data)
+                samples = [run_once(renderer, data) for _ in range(args.iterations)]
+            print(
+                f"  {backend:<6} p50={statistics.median(samples):8.3f}ms "
+                f"p95={percentile(samples, 95):8.3f}ms max={max(samples):8.3f}ms bytes={len(rendered[backend])}"
+            )
+        if rendered['stdlib'] != rendered['orjson']:
+            raise SystemExit(f'{path}: stdlib / orjson 출력이 다릅니다.')
+
+
+if __name__ == "__main__":
+    main()
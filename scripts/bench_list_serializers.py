@@ -0,0 +1,93 @@
+"""목록 직렬화 방식 비교 마이크로벤치마크. (DB 조회 시간 제외, 행당 직렬화 비용)
+
+serializer: 모델 인스턴스 + ModelSerializer(many=True).data  (LIST_VALUES_MODE=false)
+values    : values_list(named=True) 행 + RowEncoder.encode_many (LIST_VALUES_MODE=true)
+
+두 방식의 JSONRenderer 출력이 바이트 단위로 같은지도 확인한다.
+
+사용법: python scripts/bench_list_serializers.py --iterations 200 --limit 100 --resource courses
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 측정 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from courses.views.course_viewset import CourseViewSet
+from payments.serializers.payment_list_serializer import PaymentListSerializer
+from payments.views.get_viewset import MePaymentsViewSet
+from payments.models import Payment
+from tests.views.test_viewset import TestViewSet
+from assignment.benchmarks.report import percentile
+
+VIEWSETS = {'courses': CourseViewSet, 'tests': TestViewSet}
+
+
+def load_rows(resource, limit):
+    """(모델 인스턴스 목록, values_list 행 목록, serializer 경로 함수, values 경로 함수)"""
+    if resource == 'payments':
+        queryset = Payment.objects.order_by('-created_at', '-id')[:limit]
+        instances = list(queryset.values_list(*PaymentListSerializer.list_fields, named=True))
+        encoder = MePaymentsViewSet.row_encoder
+        return (
+            instances, instances,
+            lambda rows: PaymentListSerializer(rows, many=True).data,
+            encoder.encode_many,
+        )
+    viewset = VIEWSETS[resource]
+    model = viewset.serializer_class.Meta.model
+    queryset = model.objects.order_by('-created_at', '-id')[:limit]
+    return (
+        list(queryset),
+        list(queryset.values_list(*viewset.list_row_fields, named=True)),
+        lambda rows: viewset.serializer_class(rows, many=True).data,
+        viewset.get_row_encoder().encode_many,
+    )
+
+
+def run_once(encode, rows):
+    started = time.perf_counter()
+    encode(rows)
+    return (time.perf_counter() - started) * 1_000_000 / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--resource', choices=sorted([*VIEWSETS, 'payments']), default='courses')
+    args = parser.parse_args()
+
+    instances, value_rows, serialize, encode = load_rows(args.resource, args.limit)
+    if not instances:
+        print(f"{args.resource}: 데이터가 없습니다. scripts/seed_dummy_data.py 를 먼저 실행하세요.")
+        return
+    renderer = JSONRenderer()
+    if renderer.render(serialize(instances)) != renderer.render(encode(value_rows)):
+        raise SystemExit('serializer / values 출력이 다릅니다.')
+
+    print(f"{args.resource}: rows/page={len(instances)}, iterations={args.iterations} (µs/row)")
+    for name, fn, rows in (('serializer', serialize, instances), ('values', encode, value_rows)):
+        for _ in range(5):
+            run_once(fn, rows)
+        samples = [run_once(fn, rows) for _ in range(args.iterations)]
+        print(
+            f"  {name:<10} p50={statistics.median(samples):8.2f}µs "
+            f"p95={percentile(samples, 95):8.2f}µs max={max(samples):8.2f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
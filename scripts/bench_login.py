@@ -0,0 +1,114 @@
+"""비밀번호 해시 알고리즘별 로그인 처리량 벤치마크.
+
+알고리즘마다 벤치 사용자의 비밀번호를 다시 해시한 뒤, --concurrency 개 스레드로 POST /login 을
+--requests 번 보내 처리량(건/초)과 503(해시 풀 한도 초과) 수를 측정한다.
+같은 시간 동안 GET /courses 를 보내는 스레드를 하나 두어 로그인이 몰릴 때 목록 지연(p50/p95)도 함께 출력한다.
+
+사용법: python scripts/bench_login.py --requests 40 --concurrency 4 [--hashers pbkdf2,scrypt,argon2]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 측정 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, override_settings
+from assignment.benchmarks.report import percentile
+
+HASHERS = {
+    'pbkdf2': 'accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'accounts.hashers.Argon2PasswordHasher',
+}
+EMAIL = 'bench-login@example.com'
+PASSWORD = 'Bench-Login-1234!'
+
+
+def make_client():
+    return Client(HTTP_HOST='localhost')
+
+
+def login(client):
+    return client.post('/login', {'email': EMAIL, 'password': PASSWORD}, content_type='application/json')
+
+
+def run_burst(requests, concurrency):
+    """(처리량, 503 수, 목록 지연 ms 목록)"""
+    remaining = iter(range(requests))
+    remaining_lock = threading.Lock()
+    statuses = []
+    done = threading.Event()
+    list_samples = []
+
+    def login_worker():
+        client = make_client()
+        while True:
+            with remaining_lock:
+                if next(remaining, None) is None:
+                    break
+            statuses.append(login(client).status_code)
+        connection.close()
+
+    def list_worker(access):
+        client = make_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            client.get('/courses?limit=20', HTTP_AUTHORIZATION=f'Bearer {access}')
+            list_samples.append((time.perf_counter() - started) * 1000)
+        connection.close()
+
+    access = login(make_client()).json()['access']
+    lister = threading.Thread(target=list_worker, args=(access,))
+    workers = [threading.Thread(target=login_worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    lister.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    lister.join()
+    ok = statuses.count(200)
+    return ok / elapsed, statuses.count(503), list_samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--hashers', default=','.join(HASHERS))
+    args = parser.parse_args()
+
+    User = get_user_model()
+    user, _ = User.objects.get_or_create(email=EMAIL)
+    print(f"requests={args.requests}, concurrency={args.concurrency}")
+    for name in args.hashers.split(','):
+        preferred = HASHERS[name]
+        hashers = [preferred] + [path for path in HASHERS.values() if path != preferred]
+        with override_settings(PASSWORD_HASHERS=hashers, LIST_CACHE_ENABLED=False):
+            user.set_password(PASSWORD)
+            user.save(update_fields=['password'])
+            throughput, rejected, list_samples = run_burst(args.requests, args.concurrency)
+        print(
+            f"  {name:<6} login={throughput:7.1f}/s rejected(503)={rejected:3d} "
+            f"list p50={statistics.median(list_samples):7.2f}ms p95={percentile(list_samples, 95):7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
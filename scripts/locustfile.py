@@ -1,34 +1,132 @@
+"""수업/시험 API 부하 테스트.
+
+사용자 클래스
+- APIUser: 목록 조회 (tag 로 개별 목록만 선택 가능, scripts/bench_asgi_wsgi.py 가 사용)
+- WriteUser: hot 수업/시험 신청·응시 → 완료 / 결제 취소, 내 결제내역 (registrations_count 행 갱신,
+  select_for_update 잠금 경합 재현)
+- LaunchSpikeUser: 오픈 직후처럼 수업 하나(spike_course)에 신청/취소를 몰아서 보냄
+
+계정은 scripts/provision_load_users.py 로 미리 만든 LOCUST_ACCOUNTS_FILE(기본 locust_accounts.json) 에서
+가상 사용자마다 하나씩 꺼내 쓴다. 파일이 없거나 계정이 모자라면 signup/login 한 계정 하나를 나눠 쓴다.
+
+LOCUST_SHAPE=launch_spike 면 LaunchSpikeShape(워밍업 → 급증 → 유지 → 감소)로 LaunchSpikeUser 만 실행한다.
+실행이 끝나면 409 비율과 pg_stat_database 의 deadlock 증가분, pg_locks/pg_stat_activity 로 샘플링한
+잠금 대기를 출력한다. (DB 접속: LOCUST_PG_DSN 또는 POSTGRES_* 환경 변수, 단일 프로세스 실행 기준)
+"""
+import json
+import os
 import random
 import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import gevent
+import gevent.lock
 import requests
-from locust import HttpUser, task, between, tag, events
+from locust import HttpUser, LoadTestShape, task, between, constant_pacing, tag, events
+from locust.runners import MasterRunner, WorkerRunner
 
+BASE_DIR = Path(__file__).resolve().parents[1]
 PAYMENT_METHODS = ["card", "kakaopay", "naverpay", "tosspay", "bank_transfer"]
 
-class APIUser(HttpUser):
+ACCOUNTS_FILE = os.environ.get("LOCUST_ACCOUNTS_FILE", str(BASE_DIR / "locust_accounts.json"))
+SHAPE = os.environ.get("LOCUST_SHAPE", "").lower()
+LOCK_SAMPLE_INTERVAL = float(os.environ.get("LOCUST_LOCK_SAMPLE_INTERVAL", "1"))
+CONTENTION_REPORT_FILE = os.environ.get("LOCUST_CONTENTION_REPORT")
+
+
+def load_accounts(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"[locust] {path} 없음: 계정은 scripts/provision_load_users.py 로 준비합니다.")
+        return {"accounts": [], "hot_courses": None, "hot_tests": None, "spike_course": None}
+
+
+PROVISIONED = load_accounts(ACCOUNTS_FILE)
+_accounts = iter(PROVISIONED["accounts"])
+
+
+def auth_headers(token, idempotent=False):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    if idempotent:
+        headers["Idempotency-Key"] = uuid.uuid4().hex
+    return headers
+
+
+def payment_body():
+    return {"amount": random.choice([10_000, 30_000, 50_000]), "payment_method": random.choice(PAYMENT_METHODS)}
+
+
+class AccountUser(HttpUser):
+    """가상 사용자마다 자기 계정(access 토큰)을 갖는다.
+
+    계정 파일이 없거나 계정이 모자라면 signup/login 한 계정 하나를 나눠 쓴다. (가상 사용자마다 로그인하면
+    비밀번호 해시 풀이 포화돼 부하 대상이 로그인으로 바뀐다)
+    """
+    abstract = True
     host = "http://localhost:8000"
-    wait_time = between(0.3, 1.0)
     shared_token = None
+    _shared_token_lock = gevent.lock.Semaphore()
 
     def on_start(self):
-        for _ in range(100):
-            if APIUser.shared_token:
-                break
-            time.sleep(0.05)
-        self.token = APIUser.shared_token
-
-    def _auth(self):
-        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
-
-    def _extract_results(self, data):
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            results = data.get("results")
-            if isinstance(results, list):
-                return results
+        account = next(_accounts, None)
+        self.token = account["access"] if account else self._get_shared_token()
+
+    def _get_shared_token(self):
+        with AccountUser._shared_token_lock:
+            if AccountUser.shared_token is None:
+                print("[locust] 준비된 계정이 없어 signup/login 한 계정 하나를 나눠 씁니다.")
+                AccountUser.shared_token = self._signup_and_login()
+        return AccountUser.shared_token
+
+    def _signup_and_login(self):
+        email = f"lo_{uuid.uuid4().hex[:12]}@example.com"
+        password = "Passw0rd!1"
+        base_url = self.host.rstrip("/")
+        try:
+            requests.post(f"{base_url}/signup", json={"email": email, "password": password}, timeout=10)
+            for _ in range(10):
+                r = requests.post(f"{base_url}/login", json={"email": email, "password": password}, timeout=10)
+                if r.status_code == 200:
+                    return r.json().get("access")
+                time.sleep(0.2)
+            print(f"[locust] login failed: status={r.status_code}")
+        except Exception as e:
+            print(f"[locust] signup/login error: {e}")
+        return None
+
+    def _auth(self, idempotent=False):
+        return auth_headers(self.token, idempotent)
+
+    def _hot_ids(self, kind):
+        """준비된 hot 항목, 없으면(None) 처음 한 번 인기순 신청 가능 목록 첫 페이지에서 고른다."""
+        ids = PROVISIONED[f"hot_{kind}"]
+        if ids is None:
+            ids = self._fetch_hot_ids(kind)
+            PROVISIONED[f"hot_{kind}"] = ids
+        return ids
+
+    def _fetch_hot_ids(self, kind):
+        r = self.client.get(f"/{kind}?status=available&sort=popular&limit=5", headers=self._auth(), name=f"{kind}:list:hot")
+        try:
+            return [row["id"] for row in r.json()["results"]]
+        except Exception:
             return []
-        return []
+
+    def _post_allowing_conflict(self, url, name, json=None, idempotent=True):
+        """409(이미 신청/완료, 잠금 경합 결과)는 실패로 세지 않고 종료 리포트의 409 비율로 본다."""
+        with self.client.post(url, json=json, headers=self._auth(idempotent), name=name, catch_response=True) as r:
+            if r.status_code == 409:
+                r.success()
+            return r
+
+
+class APIUser(AccountUser):
+    wait_time = between(0.3, 1.0)
+    weight = 0 if SHAPE == "launch_spike" else 3
 
     def _rand_limit(self):
         return random.randint(1, 100)
@@ -72,7 +170,7 @@ class APIUser(HttpUser):
         limit = self._rand_limit()
         offset = self._rand_offset(limit)
         self.client.get(f"/courses?limit={limit}&offset={offset}", headers=self._auth(), name="courses:list:paged")
-        
+
     @tag("tests_list")
     @task
     def tests_list_default(self):
@@ -110,44 +208,306 @@ class APIUser(HttpUser):
         offset = self._rand_offset(limit)
         self.client.get(f"/tests?limit={limit}&offset={offset}", headers=self._auth(), name="tests:list:paged")
 
-    @events.test_start.add_listener
-    def _get_shared_token(environment, **kwargs):
-        base_url = getattr(environment, "host", None) or getattr(getattr(environment, "runner", None), "host", None)
-        if not base_url:
-            base_url = "http://localhost:8000"
-        base_url = base_url.rstrip("/")
 
-        if APIUser.shared_token:
+class WriteUser(AccountUser):
+    """hot 수업/시험에 신청한 뒤 일부는 완료, 일부는 결제 취소한다. 취소한 항목은 다시 신청할 수 있다.
+
+    아직 신청하지 않은 hot 항목을 고르므로 409 는 가진 항목이 없을 때(모두 신청/완료)와 경합에서만 생긴다.
+    """
+    wait_time = between(0.5, 1.5)
+    weight = 0 if SHAPE == "launch_spike" else 1
+
+    # 항목 경로별 신청 action
+    KINDS = {"courses": "enroll", "tests": "apply"}
+
+    def on_start(self):
+        super().on_start()
+        self.registered = []  # (kind, item_id, payment_id)
+        self.completed = set()  # (kind, item_id), 완료한 항목은 다시 신청할 수 없다.
+
+    def _apply(self, kind):
+        if not self.token:
             return
+        ids = self._hot_ids(kind)
+        if not ids:
+            return
+        taken = self.completed | {(k, item_id) for k, item_id, _ in self.registered}
+        item_id = random.choice([i for i in ids if (kind, i) not in taken] or ids)
+        action = self.KINDS[kind]
+        r = self._post_allowing_conflict(f"/{kind}/{item_id}/{action}", f"{kind}:{action}:hot", json=payment_body())
+        if r.status_code == 201:
+            self.registered.append((kind, item_id, r.json()["payment_id"]))
 
-        email = f"lo_{random.randint(10_000_000,99_999_999)}@example.com"
-        password = "Passw0rd!1"
+    @tag("write", "write_enroll")
+    @task(4)
+    def enroll_hot_course(self):
+        self._apply("courses")
 
-        try:
-            sr = requests.post(f"{base_url}/signup", json={"email": email, "password": password}, timeout=5)
-            if sr.status_code >= 400 and sr.status_code not in (400, 409):
-                print(f"[locust] signup failed {sr.status_code}: {sr.text}")
-        except Exception as e:
-            print(f"[locust] signup error: {e}")
+    @tag("write", "write_apply")
+    @task(3)
+    def apply_hot_test(self):
+        self._apply("tests")
 
+    @tag("write", "write_complete")
+    @task(2)
+    def complete_registration(self):
+        if not self.registered:
+            return
+        kind, item_id, _ = self.registered.pop(random.randrange(len(self.registered)))
+        r = self._post_allowing_conflict(f"/{kind}/{item_id}/complete", f"{kind}:complete", idempotent=False)
+        if r.status_code in (200, 409):
+            self.completed.add((kind, item_id))
+
+    @tag("write", "write_cancel")
+    @task(2)
+    def cancel_payment(self):
+        if not self.registered:
+            return
+        _, _, payment_id = self.registered.pop(random.randrange(len(self.registered)))
+        self._post_allowing_conflict(f"/payments/{payment_id}/cancel", "payments:cancel")
+
+    @tag("write", "write_me_payments")
+    @task(1)
+    def me_payments(self):
+        if not self.token:
+            return
+        self.client.get("/me/payments?limit=20", headers=self._auth(), name="me:payments:list")
+
+
+class LaunchSpikeUser(AccountUser):
+    """오픈 직후처럼 모두가 같은 수업을 신청한다. 신청 중복 클릭(409)과 바로 취소 후 재신청을 섞는다."""
+    wait_time = constant_pacing(0.5)
+    weight = 1 if SHAPE == "launch_spike" else 0
+
+    def on_start(self):
+        super().on_start()
+        self.payment_id = None
+
+    @property
+    def course_id(self):
+        course_id = PROVISIONED["spike_course"]
+        if course_id is None:
+            hot = self._hot_ids("courses")
+            course_id = PROVISIONED["spike_course"] = hot[0] if hot else None
+        return course_id
+
+    @tag("spike")
+    @task(3)
+    def enroll(self):
+        if not self.token or self.course_id is None:
+            return
+        r = self._post_allowing_conflict(f"/courses/{self.course_id}/enroll", "spike:courses:enroll", json=payment_body())
+        if r.status_code == 201:
+            self.payment_id = r.json()["payment_id"]
+
+    @tag("spike")
+    @task(1)
+    def cancel(self):
+        if not self.payment_id:
+            return
+        r = self._post_allowing_conflict(f"/payments/{self.payment_id}/cancel", "spike:payments:cancel")
+        if r.status_code in (200, 409):
+            self.payment_id = None
+
+
+if SHAPE == "launch_spike":
+    class LaunchSpikeShape(LoadTestShape):
+        """워밍업 → 급증 → 유지 → 감소. LOCUST_SPIKE_USERS / LOCUST_SPIKE_SECONDS 로 조정."""
+        base_users = int(os.environ.get("LOCUST_SPIKE_BASE_USERS", "5"))
+        spike_users = int(os.environ.get("LOCUST_SPIKE_USERS", "200"))
+        spike_seconds = int(os.environ.get("LOCUST_SPIKE_SECONDS", "30"))
+        stages = [
+            (10, base_users, base_users),          # (종료 시각, 사용자 수, spawn rate)
+            (10 + spike_seconds, spike_users, spike_users),
+            (20 + spike_seconds, base_users, spike_users),
+        ]
+
+        def tick(self):
+            run_time = self.get_run_time()
+            for end, users, rate in self.stages:
+                if run_time < end:
+                    return users, rate
+            return None
+
+
+class ContentionReport:
+    """응답 코드별 집계와 DB 잠금 지표를 모아 실행 종료 시 출력한다."""
+
+    DEADLOCKS_SQL = "SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()"
+    # 대기 중인 잠금(granted=false)과 그 backend 의 쿼리. waitstart 는 PostgreSQL 14+
+    LOCK_WAITS_SQL = """
+        SELECT l.locktype, l.mode, COALESCE(l.relation::regclass::text, l.locktype),
+               EXTRACT(EPOCH FROM now() - COALESCE(l.waitstart, a.query_start)),
+               left(regexp_replace(a.query, '\\s+', ' ', 'g'), 120)
+        FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid
+        WHERE NOT l.granted AND a.datname = current_database()
+    """
+    LOCK_WAIT_EVENTS_SQL = """
+        SELECT count(*) FROM pg_stat_activity
+        WHERE datname = current_database() AND wait_event_type = 'Lock'
+    """
+
+    def __init__(self):
+        self.requests = Counter()
+        self.conflicts = Counter()
+        self.statuses = Counter()
+        self.connection = None
+        self.deadlocks_start = None
+        self.greenlet = None
+        self.samples = 0
+        self.samples_waiting = 0
+        self.peak_waiters = 0
+        self.max_wait = 0.0
+        self.waits_by_relation = defaultdict(lambda: {"samples": 0, "max_wait": 0.0, "mode": ""})
+        self.waiting_queries = Counter()
+
+    def reset(self):
+        self.__init__()
+
+    def on_request(self, name, response, **kwargs):
+        status = getattr(response, "status_code", None) or 0
+        self.requests[name] += 1
+        self.statuses[status] += 1
+        if status == 409:
+            self.conflicts[name] += 1
+
+    def connect(self):
         try:
-            token = None
-            for _ in range(10):
-                r = requests.post(f"{base_url}/login", json={"email": email, "password": password}, timeout=5)
-                if r.status_code == 200:
-                    token = r.json().get("access")
-                    break
-                time.sleep(0.2)
-            if token:
-                APIUser.shared_token = token
-                print("[locust] shared token acquired")
-                try:
-                    headers = {"Authorization": f"Bearer {token}"}
-                    requests.get(f"{base_url}/courses", headers=headers, timeout=5)
-                    requests.get(f"{base_url}/tests", headers=headers, timeout=5)
-                except Exception:
-                    pass
-            else:
-                print(f"[locust] login failed: status={r.status_code}")
+            import psycopg
+            dsn = os.environ.get("LOCUST_PG_DSN") or (
+                f"host={os.environ.get('POSTGRES_HOST', 'localhost')} "
+                f"port={os.environ.get('POSTGRES_PORT', '5432')} "
+                f"dbname={os.environ.get('POSTGRES_DB', 'assignment_db')} "
+                f"user={os.environ.get('POSTGRES_USER', 'master')} "
+                f"password={os.environ.get('POSTGRES_PASSWORD', '1234')}"
+            )
+            self.connection = psycopg.connect(dsn, autocommit=True, connect_timeout=3)
         except Exception as e:
-            print(f"[locust] login error: {e}")
+            print(f"[locust] DB 잠금 지표 수집 안 함: {e}")
+            self.connection = None
+        return self.connection
+
+    def start(self):
+        if self.connect() is None:
+            return
+        self.deadlocks_start = self._scalar(self.DEADLOCKS_SQL)
+        self.greenlet = gevent.spawn(self._sample_forever)
+
+    def _scalar(self, sql):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+
+    def _sample_forever(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"[locust] 잠금 샘플링 실패: {e}")
+                return
+            gevent.sleep(LOCK_SAMPLE_INTERVAL)
+
+    def sample(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(self.LOCK_WAITS_SQL)
+            rows = cursor.fetchall()
+        waiters = max(len(rows), self._scalar(self.LOCK_WAIT_EVENTS_SQL))
+        self.samples += 1
+        if waiters:
+            self.samples_waiting += 1
+        self.peak_waiters = max(self.peak_waiters, waiters)
+        for locktype, mode, relation, wait, query in rows:
+            # 서버 인코딩이 SQL_ASCII 면 psycopg 가 text 를 bytes 로 돌려준다.
+            mode, relation, query = (v.decode(errors="replace") if isinstance(v, bytes) else v for v in (mode, relation, query))
+            wait = float(wait or 0)
+            self.max_wait = max(self.max_wait, wait)
+            entry = self.waits_by_relation[relation]
+            entry["samples"] += 1
+            entry["max_wait"] = max(entry["max_wait"], wait)
+            entry["mode"] = mode
+            self.waiting_queries[query] += 1
+
+    def stop(self):
+        if self.greenlet is not None:
+            self.greenlet.kill()
+            self.greenlet = None
+        deadlocks = None
+        if self.connection is not None:
+            try:
+                deadlocks = self._scalar(self.DEADLOCKS_SQL) - self.deadlocks_start
+            except Exception as e:
+                print(f"[locust] deadlock 조회 실패: {e}")
+            self.connection.close()
+            self.connection = None
+        return deadlocks
+
+    def summary(self, deadlocks):
+        total = sum(self.requests.values())
+        return {
+            "requests": total,
+            "conflicts": sum(self.conflicts.values()),
+            "conflict_rate": round(sum(self.conflicts.values()) / total, 4) if total else 0.0,
+            "conflicts_by_name": {
+                name: {"requests": self.requests[name], "conflicts": n, "rate": round(n / self.requests[name], 4)}
+                for name, n in self.conflicts.most_common()
+            },
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "deadlocks": deadlocks,
+            "lock_samples": self.samples,
+            "lock_samples_waiting": self.samples_waiting,
+            "lock_peak_waiters": self.peak_waiters,
+            "lock_max_wait_seconds": round(self.max_wait, 3),
+            "lock_waits_by_relation": {
+                relation: {**entry, "max_wait": round(entry["max_wait"], 3)}
+                for relation, entry in sorted(self.waits_by_relation.items(), key=lambda kv: -kv[1]["samples"])
+            },
+            "lock_waiting_queries": dict(self.waiting_queries.most_common(5)),
+        }
+
+    def print_summary(self, data):
+        print("\n===== 경합 리포트 =====")
+        print(f"요청 {data['requests']}건, 409 {data['conflicts']}건 ({data['conflict_rate']:.1%})")
+        for name, row in data["conflicts_by_name"].items():
+            print(f"  {name:<28} 409 {row['conflicts']:>6} / {row['requests']:<6} ({row['rate']:.1%})")
+        print(f"응답 코드: {data['statuses']}")
+        print(f"deadlock: {'수집 안 함' if data['deadlocks'] is None else data['deadlocks']}")
+        if data["lock_samples"]:
+            print(
+                f"잠금 대기: 샘플 {data['lock_samples']}회 중 {data['lock_samples_waiting']}회 대기 발생, "
+                f"최대 동시 대기 {data['lock_peak_waiters']}, 최장 대기 {data['lock_max_wait_seconds']:.3f}s"
+            )
+            for relation, entry in data["lock_waits_by_relation"].items():
+                print(f"  {relation:<40} {entry['mode']:<20} 샘플 {entry['samples']:>4} 최장 {entry['max_wait']:.3f}s")
+            for query, n in data["lock_waiting_queries"].items():
+                print(f"  [{n}] {query}")
+        print("======================\n")
+
+
+contention = ContentionReport()
+
+
+@events.init.add_listener
+def _init_contention_report(environment, **kwargs):
+    # 분산 실행에서는 워커마다 집계가 따로라 단일 프로세스(local runner) 실행에서만 리포트한다.
+    if isinstance(environment.runner, (MasterRunner, WorkerRunner)):
+        return
+    environment.events.request.add_listener(contention.on_request)
+
+
+@events.test_start.add_listener
+def _start_contention_report(environment, **kwargs):
+    if isinstance(environment.runner, (MasterRunner, WorkerRunner)):
+        return
+    contention.reset()
+    contention.start()
+
+
+@events.test_stop.add_listener
+def _print_contention_report(environment, **kwargs):
+    if isinstance(environment.runner, (MasterRunner, WorkerRunner)):
+        return
+    data = contention.summary(contention.stop())
+    contention.print_summary(data)
+    if CONTENTION_REPORT_FILE:
+        with open(CONTENTION_REPORT_FILE, "w") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
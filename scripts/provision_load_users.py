@@ -0,0 +1,107 @@
+"""locust 쓰기/경합 시나리오용 계정과 인기(hot) 수업/시험을 미리 준비한다.
+
+가상 사용자마다 자기 계정을 쓰도록 --users 개 계정을 bulk_create 로 한 번에 만들고(비밀번호 해시는 1번만 계산),
+로그인 없이 access 토큰을 발급해 JSON 파일로 남긴다. locustfile 은 LOCUST_ACCOUNTS_FILE(기본 locust_accounts.json)
+을 읽어 가상 사용자마다 계정 하나씩 꺼내 쓴다. 이메일 prefix 가 실행마다 달라서 다시 돌려도 이전 실행의
+신청 내역 때문에 409 가 섞이지 않는다.
+
+hot 항목은 지금 신청 가능한 수업/시험 중 신청 수가 많은 순서로 고르고, launch spike 는 그중 첫 수업에 몰린다.
+
+사용법: python scripts/provision_load_users.py --users 500 --hot 5 [--output locust_accounts.json]
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
+# 대량 INSERT 중 쿼리마다 SQL 콘솔 로그를 쓰지 않도록 끈다. (development 프로필 기본값은 켜짐)
+os.environ.setdefault("SQL_CONSOLE_LOG", "false")
+
+import django
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from courses.models import Course
+from tests.models import Test
+
+PASSWORD = 'Load-Test-1234!'
+
+
+def create_accounts(prefix, n, batch_size=5_000):
+    User = get_user_model()
+    password_hash = make_password(PASSWORD)
+    emails = [f'{prefix}-{i:05d}@example.com' for i in range(n)]
+    User.objects.bulk_create(
+        [User(email=email, password=password_hash) for email in emails],
+        ignore_conflicts=True, batch_size=batch_size,
+    )
+    users = User.objects.filter(email__in=emails).order_by('id')
+    return list(users.only('id', 'email', 'is_active', 'is_staff'))
+
+
+def issue_access_token(user, lifetime):
+    """로그인(CustomTokenObtainPairSerializer)과 같은 클레임의 access 토큰. 발급 기록 등 DB 쓰기가 없다."""
+    token = AccessToken.for_user(user)
+    token['is_active'] = user.is_active
+    token['is_staff'] = user.is_staff
+    token.set_exp(lifetime=lifetime)
+    return str(token)
+
+
+def pick_hot_items(model, n):
+    now = timezone.now()
+    return list(
+        model.objects
+        .filter(is_active=True, start_at__lte=now, end_at__gte=now)
+        .order_by('-registrations_count', 'id')
+        .values_list('id', flat=True)[:n]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--hot', type=int, default=5, help='쓰기 시나리오가 몰릴 수업/시험 수')
+    parser.add_argument('--spike-course', type=int, help='launch spike 대상 수업 (기본: hot 수업 중 첫 번째)')
+    parser.add_argument('--token-minutes', type=int, default=120, help='access 토큰 유효 시간(분), 부하 테스트 길이보다 길게')
+    parser.add_argument('--prefix', default=f"load{timezone.now():%Y%m%d%H%M%S}", help='계정 이메일 prefix')
+    parser.add_argument('--output', default=str(BASE_DIR / 'locust_accounts.json'))
+    args = parser.parse_args()
+
+    hot_courses = pick_hot_items(Course, args.hot)
+    hot_tests = pick_hot_items(Test, args.hot)
+    if not hot_courses and not hot_tests:
+        sys.exit('신청 가능한 수업/시험이 없습니다. scripts/seed_dummy_data.py 로 데이터를 먼저 만드세요.')
+
+    users = create_accounts(args.prefix, args.users)
+    lifetime = timedelta(minutes=args.token_minutes)
+    payload = {
+        'accounts': [
+            {'id': user.id, 'email': user.email, 'access': issue_access_token(user, lifetime)}
+            for user in users
+        ],
+        'password': PASSWORD,
+        'hot_courses': hot_courses,
+        'hot_tests': hot_tests,
+        'spike_course': args.spike_course or next(iter(hot_courses), None),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(payload, f)
+
+    print(f"계정 {len(users)}개 ({args.prefix}-*), 토큰 유효 {args.token_minutes}분")
+    print(f"hot 수업 {hot_courses}, hot 시험 {hot_tests}, spike 수업 {payload['spike_course']}")
+    print(f"저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,10 @@ if str(BASE_DIR) not in sys.path:
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assignment.settings")
 
 import django
-django.setup()
+from django.apps import apps
+# run_benchmarks 처럼 이미 설정된 Django 안에서 import 되면 setup(로깅 재설정 포함)을 다시 하지 않는다.
+if not apps.ready:
+    django.setup()
 
 import logging
 _db_logger = logging.getLogger('django.db.backends')
@@ -198,7 +201,7 @@ def seed_course_registrations_and_payments(users_limit=50_000, registrations_per
             user_id__in=batch_user_ids,
             course_id__in=set(pair_course_ids),
             payment__isnull=True,
-        ).values('id', 'status')
+        ).values('id', 'user_id', 'status', 'attempted_at', 'course__title')
 
         payment_objs = []
         methods = [m[0] for m in Payment.PAYMENT_METHOD_CHOICES]
@@ -223,6 +226,11 @@ def seed_course_registrations_and_payments(users_limit=50_000, registrations_per
                     canceled_at = min(timezone.now(), created_at_ts + timedelta(hours=random.randint(0, 72)))
             payment_objs.append(Payment(
                 course_registration_id=reg_id,
+                user_id=row['user_id'],
+                item_kind='course',
+                item_title=row['course__title'],
+                registration_status=r_status,
+                attempted_at=row['attempted_at'],
                 amount=random.randint(10_000, 200_000),
                 payment_method=random.choice(methods),
                 status=p_status,
@@ -309,7 +317,7 @@ def seed_test_registrations_and_payments(users_limit=50_000, registrations_per_u
             user_id__in=batch_user_ids,
             test_id__in=set(pair_test_ids),
             payment__isnull=True,
-        ).values('id', 'status')
+        ).values('id', 'user_id', 'status', 'attempted_at', 'test__title')
 
         payment_objs = []
         methods = [m[0] for m in Payment.PAYMENT_METHOD_CHOICES]
@@ -333,6 +341,11 @@ def seed_test_registrations_and_payments(users_limit=50_000, registrations_per_u
                     canceled_at = min(timezone.now(), created_at_ts + timedelta(hours=random.randint(0, 72)))
             payment_objs.append(Payment(
                 test_registration_id=reg_id,
+                user_id=row['user_id'],
+                item_kind='test',
+                item_title=row['test__title'],
+                registration_status=r_status,
+                attempted_at=row['attempted_at'],
                 amount=random.randint(10_000, 200_000),
                 payment_method=random.choice(methods),
                 status=p_status,
@@ -353,6 +366,9 @@ def seed_test_registrations_and_payments(users_limit=50_000, registrations_per_u
 
 def rebuild_course_registration_counts():
     with connection.cursor() as cursor:
+        # 재계산 값에 이미 포함되므로 아직 반영되지 않은 샤드/outbox 증감은 버린다.
+        cursor.execute("DELETE FROM course_registration_count_shards;")
+        cursor.execute("DELETE FROM course_registration_count_deltas;")
         cursor.execute("UPDATE courses SET registrations_count = 0;")
         cursor.execute(
             """
@@ -371,6 +387,9 @@ def rebuild_course_registration_counts():
 
 def rebuild_test_registration_counts():
     with connection.cursor() as cursor:
+        # 재계산 값에 이미 포함되므로 아직 반영되지 않은 샤드/outbox 증감은 버린다.
+        cursor.execute("DELETE FROM test_registration_count_shards;")
+        cursor.execute("DELETE FROM test_registration_count_deltas;")
         cursor.execute("UPDATE tests SET registrations_count = 0;")
         cursor.execute(
             """
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:08
+
+import assignment.common.db_functions
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # GiST 인덱스를 CONCURRENTLY 로 만들기 위해 트랜잭션 밖에서 실행한다.
+    # period 는 stored generated column 이라 AddField 는 ACCESS EXCLUSIVE 잠금으로 테이블을 다시 쓴다. (README 참고)
+    atomic = False
+
+    dependencies = [
+        ('tests', '0001_squashed_0009_remove_test_tests_is_acti_8a1432_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='period',
+            field=models.GeneratedField(db_persist=True, expression=assignment.common.db_functions.TsTzRange(models.F('start_at'), models.F('end_at'), models.Value('[]')), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        AddIndexConcurrently(
+            model_name='test',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('is_active', True)), fields=['period'], name='tests_active_period_gist'),
+        ),
+    ]
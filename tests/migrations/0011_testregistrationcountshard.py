@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0010_test_period_test_tests_active_period_gist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRegistrationCountShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('delta', models.IntegerField(default=0)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_count_shards', to='tests.test')),
+            ],
+            options={
+                'db_table': 'test_registration_count_shards',
+                'constraints': [models.UniqueConstraint(fields=('test', 'shard'), name='uniq_test_registration_count_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0011_testregistrationcountshard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRegistrationCountDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.SmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_count_deltas', to='tests.test')),
+            ],
+            options={
+                'db_table': 'test_registration_count_deltas',
+            },
+        ),
+    ]
@@ -3,7 +3,12 @@ from django.conf import settings
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db.models import Q, F, Value
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+
+from assignment.common.db_functions import TsTzRange
+from assignment.common.registration_counters import RegistrationCounter
 
 class Test(models.Model):
     title = models.CharField(max_length=200, unique=True)
@@ -13,6 +18,12 @@ class Test(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     registrations_count = models.PositiveIntegerField(default=0)
+    # [start_at, end_at] 기간. start_at/end_at 이 바뀌면 DB 가 함께 갱신한다(bulk_create/update 포함).
+    period = models.GeneratedField(
+        expression=TsTzRange(F('start_at'), F('end_at'), Value('[]')),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
 
     class Meta:
         db_table = 'tests'
@@ -20,7 +31,9 @@ class Test(models.Model):
             models.Index(fields=['registrations_count']),
             models.Index(fields=['is_active', 'start_at'], name='tests_active_start_idx'),
             models.Index(fields=['is_active', 'end_at'], name='tests_active_end_idx'),
-            models.Index(fields=['created_at'])
+            models.Index(fields=['created_at']),
+            # status=available 의 기간 조건(period @> now)을 한 번의 GiST 탐색으로 처리한다.
+            GistIndex(fields=['period'], name='tests_active_period_gist', condition=Q(is_active=True)),
         ]
 
     def clean(self):
@@ -60,11 +73,40 @@ class TestRegistration(models.Model):
             ),
         ]
 
+
+class TestRegistrationCountShard(models.Model):
+    # registrations_count 증감 샤드. REGISTRATION_COUNTER_MODE=sharded 일 때만 쓰인다.
+    test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name='registration_count_shards')
+    shard = models.PositiveSmallIntegerField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'test_registration_count_shards'
+        constraints = [
+            models.UniqueConstraint(fields=['test', 'shard'], name='uniq_test_registration_count_shard'),
+        ]
+
+
+
+class TestRegistrationCountDelta(models.Model):
+    # registrations_count 증감 outbox. REGISTRATION_COUNTER_MODE=outbox 일 때만 쓰인다.
+    test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name='registration_count_deltas')
+    delta = models.SmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'test_registration_count_deltas'
+
+
+test_registration_counter = RegistrationCounter(
+    'test', Test, TestRegistrationCountShard, TestRegistrationCountDelta, 'test',
+)
+
 @receiver(post_save, sender=TestRegistration)
 def inc_test_registration_count(sender, instance, created, **kwargs):
     if created:
-        Test.objects.filter(pk=instance.test_id).update(registrations_count=models.F('registrations_count') + 1)
+        test_registration_counter.add(instance.test_id, 1)
 
 @receiver(post_delete, sender=TestRegistration)
 def dec_test_registration_count(sender, instance, **kwargs):
-    Test.objects.filter(pk=instance.test_id).update(registrations_count=models.F('registrations_count') - 1)
\ No newline at end of file
+    test_registration_counter.add(instance.test_id, -1)
\ No newline at end of file
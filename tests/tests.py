@@ -1,6 +1,8 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
@@ -17,6 +19,8 @@ class TestViewSetTests(APITestCase):
     base_url = "/tests"
 
     def setUp(self):
+        # 목록 캐시는 사용자 간에 공유되므로 테스트마다 비운다.
+        caches["list"].clear()
         self.User = get_user_model()
         self.user = self.User.objects.create_user(email="t1@example.com", password="Str0ngP@ss!")
         token_res = self.client.post("/login", {"email": "t1@example.com", "password": "Str0ngP@ss!"}, format="json")
@@ -98,6 +102,38 @@ class TestViewSetTests(APITestCase):
         ids = [item["id"] for item in items]
         self.assertTrue(ids.index(t2.id) < ids.index(t1.id))
 
+    def test_cursor_pagination_created(self):
+        """
+        pagination=cursor 이면 next 링크를 따라 created 역순으로 끝까지 조회된다.
+        """
+        tests = [self._make_test(title=f"Cursor-{i}") for i in range(3)]
+
+        res = self.client.get(f"{self.base_url}?pagination=cursor&limit=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        ids = [item["id"] for item in res.data["results"]]
+        res = self.client.get(res.data["next"])
+        ids.extend(item["id"] for item in res.data["results"])
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(ids, [t.id for t in reversed(tests)])
+
+    @override_settings(LIST_CACHE_ENABLED=False)
+    def test_values_mode_matches_serializer_output(self):
+        """
+        LIST_VALUES_MODE 응답은 serializer 경로와 바이트 단위로 같다.
+        """
+        t1 = self._make_test(title="Values-1")
+        self._make_test(title="시험-2", start_delta=1, end_delta=2)
+        TestRegistration.objects.create(user=self.user, test=t1)
+
+        for url in (self.base_url, f"{self.base_url}?sort=popular&pagination=cursor&limit=1"):
+            with override_settings(LIST_VALUES_MODE=True):
+                values_res = self.client.get(url)
+            with override_settings(LIST_VALUES_MODE=False):
+                serializer_res = self.client.get(url)
+            self.assertEqual(values_res.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(values_res.content, serializer_res.content, url)
+
     def test_apply_success(self):
         """
         정상 신청 시 registration/payment 생성 및 상태 확인
@@ -121,6 +157,26 @@ class TestViewSetTests(APITestCase):
         test.refresh_from_db()
         self.assertEqual(test.registrations_count, 1)
 
+    @override_settings(REGISTRATION_APPLY_FAST_PATH=True)
+    def test_apply_fast_path(self):
+        """
+        fast path 로 응시 신청 시 신청/결제가 생성되고, 재신청은 409를 반환한다.
+        """
+        test = self._make_test(title="Fast Apply")
+        body = {"amount": 45000, "payment_method": "kakaopay"}
+        res = self.client.post(f"{self.base_url}/{test.id}/apply", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        reg = TestRegistration.objects.get(id=res.data["registration_id"])
+        self.assertEqual((reg.user_id, reg.test_id), (self.user.id, test.id))
+        pay = Payment.objects.get(id=res.data["payment_id"])
+        self.assertEqual((pay.test_registration_id, pay.payment_method), (reg.id, "kakaopay"))
+        test.refresh_from_db()
+        self.assertEqual(test.registrations_count, 1)
+
+        res = self.client.post(f"{self.base_url}/{test.id}/apply", body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["detail"], "이미 응시 신청된 시험입니다.")
+
     def test_apply_test_not_found(self):
         """
         존재하지 않는 시험 신청 시 404
@@ -196,6 +252,19 @@ class TestViewSetTests(APITestCase):
         res = self.client.post(f"{self.base_url}/{test.id}/complete", {}, format="json")
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_complete_after_cancel_and_reapply(self):
+        """
+        취소 후 재신청한 시험은 최근 신청이 완료 처리
+        """
+        test = self._make_test(title="Re-apply", start_delta=-1, end_delta=1, is_active=True)
+        TestRegistration.objects.create(user=self.user, test=test, status="cancelled")
+        reg = TestRegistration.objects.create(user=self.user, test=test, status="registered")
+        res = self.client.post(f"{self.base_url}/{test.id}/complete", {}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        self.assertEqual(res.data["registration_id"], reg.id)
+        reg.refresh_from_db()
+        self.assertEqual(reg.status, "completed")
+
     def test_complete_not_active_or_time(self):
         """
         비활성/기간 외 완료 불가 400
@@ -1,12 +1,13 @@
-from django.db.models import Exists, OuterRef
-from tests.models import Test, TestRegistration
+from tests.models import Test, TestRegistration, test_registration_counter
 from tests.serializers.test_list_serializer import TestListSerializer
+from django.conf import settings
 from django.utils import timezone
 from rest_framework.decorators import action
 from tests.serializers.test_apply_serializer import TestApplySerializer
 from payments.models import Payment
 from assignment.common.api_errors import api_error
 from assignment.common.base_registrable_viewset import BaseRegistrableViewSet
+from assignment.common.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes, extend_schema_view
 
 
@@ -19,21 +20,36 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes,
             OpenApiParameter(name='sort',   type=OpenApiTypes.STR, required=False, description='정렬: created(기본) | popular', enum=['created', 'popular']),
             OpenApiParameter(name='limit',  type=OpenApiTypes.INT, required=False, description='페이지 크기'),
             OpenApiParameter(name='offset', type=OpenApiTypes.INT, required=False, description='페이지 오프셋'),
+            OpenApiParameter(name='count',  type=OpenApiTypes.STR, required=False, description='count 계산 방식: exact(기본) | none | estimate | cached', enum=['exact', 'none', 'estimate', 'cached']),
+            OpenApiParameter(name='pagination', type=OpenApiTypes.STR, required=False, description='페이지네이션 방식: offset(기본) | cursor', enum=['offset', 'cursor']),
+            OpenApiParameter(name='cursor', type=OpenApiTypes.STR, required=False, description='cursor 모드의 next/previous 링크에 포함된 cursor 값'),
         ]
     )
 )
 class TestViewSet(BaseRegistrableViewSet):
     serializer_class = TestListSerializer
+    registration_model = TestRegistration
+    registration_item_field = 'test_id'
+    registration_counter = test_registration_counter
     apply_serializer_class = TestApplySerializer
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self._base_queryset_with_registration_flag(user)
-        return self.apply_status_and_sort(queryset)
+        return self.apply_status_and_sort(Test.objects.all())
 
-    @extend_schema(request=TestApplySerializer, summary='시험 응시 신청')
+    @extend_schema(request=TestApplySerializer, summary='시험 응시 신청', parameters=[IDEMPOTENCY_KEY_PARAMETER])
     @action(detail=True, methods=['post'], url_path='apply')
+    @idempotent
     def apply(self, request, pk=None):
+        if settings.REGISTRATION_APPLY_FAST_PATH:
+            return self.do_apply_fast(
+                request,
+                pk,
+                serializer_class=self.apply_serializer_class,
+                not_found_message='존재하지 않는 시험입니다.',
+                not_applicable_message='응시 가능한 시험이 아닙니다.',
+                registration_conflict_message='이미 응시 신청된 시험입니다.',
+                payment_conflict_message='결제 정보가 이미 생성되었습니다.',
+            )
         return self.do_apply(
             request,
             pk,
@@ -60,15 +76,6 @@ class TestViewSet(BaseRegistrableViewSet):
             mark_registration_completed=self.mark_registration_completed_default,
         )
 
-    def _base_queryset_with_registration_flag(self, user):
-        return Test.objects.all().annotate(
-            is_registered=Exists(
-                TestRegistration.objects
-                    .filter(user=user, test_id=OuterRef('pk'))
-                    .exclude(status='cancelled')
-            ),
-        )
-
     def _get_test_or_404(self, pk):
         try:
             return Test.objects.get(pk=pk)
@@ -81,15 +88,19 @@ class TestViewSet(BaseRegistrableViewSet):
             raise api_error(400, '응시 가능한 시험이 아닙니다.')
 
     def _ensure_not_already_applied(self, user, test):
-        if TestRegistration.objects.filter(user=user, test=test).exclude(status='cancelled').exists():
+        if TestRegistration.objects.filter(user_id=user.id, test=test).exclude(status='cancelled').exists():
             raise api_error(409, '이미 응시 신청된 시험입니다.')
 
     def _create_registration(self, user, test):
-        return TestRegistration.objects.create(user=user, test=test)
+        return TestRegistration.objects.create(user_id=user.id, test=test)
 
     def _create_payment(self, test_registration, data):
         return Payment.objects.create(
             test_registration=test_registration,
+            user_id=test_registration.user_id,
+            item_kind='test',
+            item_title=test_registration.test.title,
+            registration_status=test_registration.status,
             amount=data['amount'],
             payment_method=data['payment_method'],
             status='paid',
@@ -101,7 +112,8 @@ class TestViewSet(BaseRegistrableViewSet):
             raise api_error(400, '응시 완료 가능한 시험이 아닙니다.')
 
     def _get_registration_or_404(self, user, test):
-        try:
-            return TestRegistration.objects.get(user=user, test=test)
-        except TestRegistration.DoesNotExist:
-            raise api_error(404, '응시 신청 이력이 없습니다.')
\ No newline at end of file
+        # 취소 후 재신청하면 이력이 여러 개다. 유효한 신청은 항상 가장 최근 것이다.
+        registration = TestRegistration.objects.filter(user_id=user.id, test=test).order_by('-id').first()
+        if registration is None:
+            raise api_error(404, '응시 신청 이력이 없습니다.')
+        return registration
\ No newline at end of file